@@ -382,7 +382,7 @@ Company Context:
 
 Please analyze and respond with valid JSON only."""
             
-            response = self.call_ai(analysis_prompt, self.system_prompt, temperature=0.0)
+            response = await self.acall_ai(analysis_prompt, self.system_prompt, temperature=0.0)
             
             # Parse AI response
             analysis_data = self._parse_analysis_response(response)
@@ -690,7 +690,7 @@ Return insights as a JSON array of strings."""
             
             system_prompt = """You are a senior VC due diligence analyst. Analyze multiple documents to identify patterns, inconsistencies, and comprehensive insights that individual document analysis might miss."""
             
-            response = self.dd_agent.call_ai(cross_analysis_prompt, system_prompt, temperature=0.0)
+            response = await self.dd_agent.acall_ai(cross_analysis_prompt, system_prompt, temperature=0.0)
             
             # Parse response
             try:
@@ -6,16 +6,18 @@ import os
 import json
 import hashlib
 import asyncio
+import functools
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass, asdict
 import uuid
-import statistics
-import random
 import math
 
+import numpy as np
+
 from ai_agents import VERSSAIAIAgent
 from rag_service import rag_service, add_company_document
 
@@ -95,12 +97,143 @@ class AllocationReport:
     rebalancing_suggestions: List[Dict[str, Any]]
     overall_allocation_score: float
 
+# Quantile sketch resolution returned by each Monte Carlo shard
+QUANTILE_SKETCH_POINTS = 1001
+_QUANTILE_GRID = np.linspace(0.0, 1.0, QUANTILE_SKETCH_POINTS)
+
+# Shared process pool for sharded Monte Carlo runs (created lazily)
+_shard_executor: Optional[ProcessPoolExecutor] = None
+
+def _get_shard_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return the shared process pool used for Monte Carlo shards"""
+    global _shard_executor
+    if _shard_executor is None:
+        workers = max_workers or int(os.environ.get('MONTE_CARLO_WORKERS', '0')) or os.cpu_count() or 1
+        _shard_executor = ProcessPoolExecutor(max_workers=workers)
+    return _shard_executor
+
+def _fund_seed_sequence(fund_id: str) -> np.random.SeedSequence:
+    """Derive a stable seed stream from the fund ID"""
+    return np.random.SeedSequence(int(hashlib.sha256(fund_id.encode()).hexdigest(), 16))
+
+def _portfolio_volatility(returns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Calculate per-path portfolio volatility based on allocations"""
+    # Simple approach - weighted average of a simplified per-allocation volatility estimate
+    total_weight = weights.sum()
+    if total_weight <= 0:
+        return np.full(returns.shape[0], 0.2)
+    return (np.abs(returns) * 0.3) @ weights / total_weight
+
+def _draw_simulation_paths(rng: np.random.Generator, num_simulations: int, fund_size: float,
+                           tables: Dict[str, Any], period: int) -> Dict[str, np.ndarray]:
+    """Draw all simulation paths in one batch and compute per-path metrics"""
+    weights = tables['weights']
+    
+    # Vectorized categorical draw of one market scenario per simulation
+    scenario_idx = rng.choice(len(tables['probabilities']), size=num_simulations, p=tables['probabilities'])
+    
+    # Normal returns around each scenario's expectation: (simulations x targets)
+    returns = rng.standard_normal((num_simulations, len(weights)))
+    returns *= tables['volatilities'][scenario_idx]
+    returns += tables['expected_returns'][scenario_idx]
+    
+    final_values = (fund_size * weights * (1 + returns) ** period).sum(axis=1)
+    if fund_size > 0:
+        multiples = final_values / fund_size
+        # A total loss (or worse) maps to -100% IRR instead of a complex root
+        irrs = np.maximum(multiples, 0.0) ** (1 / period) - 1
+    else:
+        multiples = np.zeros(num_simulations)
+        irrs = np.zeros(num_simulations)
+    
+    portfolio_volatility = _portfolio_volatility(returns, weights)
+    risk_adjusted = np.divide(
+        irrs, portfolio_volatility, out=np.zeros_like(irrs), where=portfolio_volatility > 0
+    )
+    
+    return {
+        'scenario_idx': scenario_idx,
+        'returns': returns,
+        'final_values': final_values,
+        'multiples': multiples,
+        'irrs': irrs,
+        'risk_adjusted_returns': risk_adjusted
+    }
+
+def _run_simulation_shard(seed: np.random.SeedSequence, num_simulations: int, index_offset: int,
+                          fund_size: float, tables: Dict[str, Any], period: int) -> Dict[str, Any]:
+    """
+    Run one Monte Carlo shard and reduce it to mergeable partial aggregates
+    
+    Executed in a worker process, so it only takes and returns plain arrays.
+    """
+    paths = _draw_simulation_paths(np.random.default_rng(seed), num_simulations, fund_size, tables, period)
+    multiples = paths['multiples']
+    irrs = paths['irrs']
+    scenario_idx = paths['scenario_idx']
+    num_scenarios = len(tables['probabilities'])
+    
+    downside = irrs[irrs < 0.0]
+    peaks = np.maximum.accumulate(multiples)
+    drawdowns = np.divide(peaks - multiples, peaks, out=np.zeros_like(multiples), where=peaks > 0)
+    best = int(np.argmax(paths['risk_adjusted_returns']))
+    
+    return {
+        'count': num_simulations,
+        'multiple_mean': float(multiples.mean()),
+        'multiple_m2': float(((multiples - multiples.mean()) ** 2).sum()),
+        'irr_mean': float(irrs.mean()),
+        'irr_m2': float(((irrs - irrs.mean()) ** 2).sum()),
+        'risk_adj_sum': float(paths['risk_adjusted_returns'].sum()),
+        'positive_count': int(np.count_nonzero(multiples > 1.0)),
+        'target_count': int(np.count_nonzero(multiples > 2.0)),
+        'loss_count': int(np.count_nonzero(multiples < 1.0)),
+        'irr_downside_sq_sum': float((downside ** 2).sum()),
+        'irr_downside_count': int(downside.size),
+        'multiple_sketch': np.quantile(multiples, _QUANTILE_GRID),
+        'irr_sketch': np.quantile(irrs, _QUANTILE_GRID),
+        'peak': float(peaks[-1]),
+        'min_multiple': float(multiples.min()),
+        'max_drawdown': float(drawdowns.max()),
+        'scenario_counts': np.bincount(scenario_idx, minlength=num_scenarios),
+        'scenario_multiple_sums': np.bincount(scenario_idx, weights=multiples, minlength=num_scenarios),
+        'scenario_irr_sums': np.bincount(scenario_idx, weights=irrs, minlength=num_scenarios),
+        'scenario_irr_sq_sums': np.bincount(scenario_idx, weights=irrs ** 2, minlength=num_scenarios),
+        'scenario_positive_counts': np.bincount(scenario_idx, weights=multiples > 1.0, minlength=num_scenarios),
+        'best_index': index_offset + best,
+        'best_risk_adj': float(paths['risk_adjusted_returns'][best]),
+        'best_returns': paths['returns'][best].copy(),
+        'best_irr': float(irrs[best]),
+        'best_multiple': float(multiples[best])
+    }
+
+def _sketch_weights(sketches: List[np.ndarray], counts: List[int]) -> np.ndarray:
+    """Trapezoidal weight of each sketch point (endpoints cover half an interval)"""
+    weights = []
+    for sketch, count in zip(sketches, counts):
+        w = np.full(len(sketch), count / (len(sketch) - 1))
+        w[[0, -1]] /= 2
+        weights.append(w)
+    return np.concatenate(weights)
+
+def _sketch_quantile(sketches: List[np.ndarray], counts: List[int], q: float) -> float:
+    """Read quantile q from merged per-shard quantile sketches"""
+    values = np.concatenate(sketches)
+    weights = _sketch_weights(sketches, counts)
+    order = np.argsort(values, kind='stable')
+    cumulative = np.cumsum(weights[order])
+    position = min(int(np.searchsorted(cumulative, q * cumulative[-1])), len(values) - 1)
+    return float(values[order][position])
+
 class MonteCarloEngine:
-    """Monte Carlo simulation engine for fund allocation optimization"""
+    """Vectorized Monte Carlo simulation engine for fund allocation optimization"""
     
-    def __init__(self, num_simulations: int = 500):  # REDUCED for investor demo performance (was 10000)
+    def __init__(self, num_simulations: int = 100000, shard_size: int = 50000,
+                 max_workers: Optional[int] = None):
         self.num_simulations = num_simulations
         self.random_seed = 42  # For reproducible results
+        self.shard_size = shard_size  # Fixed shard size keeps sharded runs worker-count independent
+        self.max_workers = max_workers
         
     def run_allocation_simulation(self, fund_size: float, 
                                 allocation_targets: List[AllocationTarget],
@@ -109,6 +242,9 @@ class MonteCarloEngine:
         """
         Run Monte Carlo simulation for optimal fund allocation
         
+        All paths are drawn at once as a (simulations x targets) return matrix,
+        so every metric below is an array reduction rather than a Python loop.
+        
         Args:
             fund_size: Total fund size
             allocation_targets: Target allocation percentages
@@ -119,167 +255,280 @@ class MonteCarloEngine:
             Simulation results with optimal allocations
         """
         try:
-            random.seed(self.random_seed)
+            if not allocation_targets or not market_scenarios:
+                return self._create_fallback_simulation_results()
             
-            simulation_results = []
-            
-            for sim in range(self.num_simulations):
-                # Select random market scenario
-                scenario = random.choices(market_scenarios, weights=[s.probability for s in market_scenarios])[0]
-                
-                # Run single simulation
-                sim_result = self._run_single_simulation(
-                    fund_size, allocation_targets, scenario, investment_period, sim
-                )
-                
-                simulation_results.append(sim_result)
-            
-            # Aggregate results
-            aggregated_results = self._aggregate_simulation_results(simulation_results)
+            tables = self._build_parameter_tables(allocation_targets, market_scenarios)
+            rng = np.random.default_rng(self.random_seed)
+            paths = _draw_simulation_paths(rng, self.num_simulations, fund_size, tables, investment_period)
+            paths['category_keys'] = tables['category_keys']
+            paths['target_percentages'] = tables['weights'] * 100
             
             return {
                 'total_simulations': self.num_simulations,
-                'aggregated_results': aggregated_results,
-                'confidence_intervals': self._calculate_confidence_intervals(simulation_results),
-                'risk_metrics': self._calculate_risk_metrics(simulation_results),
-                'optimal_allocations': self._find_optimal_allocations(simulation_results),
-                'scenario_analysis': self._analyze_scenario_performance(simulation_results, market_scenarios)
+                'aggregated_results': self._aggregate_simulation_results(paths),
+                'confidence_intervals': self._calculate_confidence_intervals(paths),
+                'risk_metrics': self._calculate_risk_metrics(paths),
+                'optimal_allocations': self._find_optimal_allocations(paths),
+                'scenario_analysis': self._analyze_scenario_performance(paths, market_scenarios)
             }
             
         except Exception as e:
             logger.error(f"Error running Monte Carlo simulation: {e}")
             return self._create_fallback_simulation_results()
     
-    def _run_single_simulation(self, fund_size: float, targets: List[AllocationTarget], 
-                             scenario: MonteCarloScenario, period: int, sim_id: int) -> Dict[str, Any]:
-        """Run a single Monte Carlo simulation"""
+    def run_sharded_simulation(self, fund_id: str, fund_size: float,
+                               allocation_targets: List[AllocationTarget],
+                               market_scenarios: List[MonteCarloScenario],
+                               investment_period: int = 5) -> Dict[str, Any]:
+        """
+        Run the simulation split into fixed-size shards across the process pool
+        
+        Shard boundaries and seeds depend only on the fund ID and simulation
+        count, so results are identical for any number of workers.
+        """
         try:
-            results = {
-                'simulation_id': sim_id,
-                'scenario_id': scenario.scenario_id,
-                'allocations': {},
-                'returns': {},
-                'final_value': 0,
-                'irr': 0,
-                'multiple': 0,
-                'risk_adjusted_return': 0
-            }
-            
-            total_return = 0
-            
-            for target in targets:
-                # Calculate allocation amount
-                allocation_amount = fund_size * (target.target_percentage / 100)
-                
-                # Get expected return for this category from scenario
-                category_key = f"{target.category}_{target.subcategory}"
-                expected_return = scenario.expected_returns.get(category_key, 0.15)  # Default 15%
-                
-                # Add randomness (normal distribution around expected return)
-                volatility = scenario.risk_factors.get(category_key, 0.3)  # Default 30% volatility
-                actual_return = random.normalvariate(expected_return, volatility)
-                
-                # Calculate final value for this allocation
-                final_allocation_value = allocation_amount * (1 + actual_return) ** period
-                
-                results['allocations'][category_key] = {
-                    'target_percentage': target.target_percentage,
-                    'allocated_amount': allocation_amount,
-                    'actual_return': actual_return,
-                    'final_value': final_allocation_value
-                }
-                
-                total_return += final_allocation_value
-            
-            # Calculate overall metrics
-            results['final_value'] = total_return
-            results['multiple'] = total_return / fund_size if fund_size > 0 else 0
-            results['irr'] = ((total_return / fund_size) ** (1/period)) - 1 if fund_size > 0 else 0
+            if not allocation_targets or not market_scenarios:
+                return self._create_fallback_simulation_results()
             
-            # Risk-adjusted return (Sharpe-like ratio)
-            portfolio_volatility = self._calculate_portfolio_volatility(results['allocations'])
-            results['risk_adjusted_return'] = results['irr'] / portfolio_volatility if portfolio_volatility > 0 else 0
+            tables = self._build_parameter_tables(allocation_targets, market_scenarios)
+            shard_calls = self._plan_shards(fund_id, fund_size, tables, investment_period)
+            executor = _get_shard_executor(self.max_workers)
+            partials = [f.result() for f in [executor.submit(call) for call in shard_calls]]
             
-            return results
+            return self._merge_shard_results(partials, tables, market_scenarios)
             
         except Exception as e:
-            logger.error(f"Error in single simulation: {e}")
-            return self._create_empty_simulation_result(sim_id)
+            logger.error(f"Error running sharded Monte Carlo simulation: {e}")
+            return self._create_fallback_simulation_results()
     
-    def _calculate_portfolio_volatility(self, allocations: Dict[str, Any]) -> float:
-        """Calculate portfolio volatility based on allocations"""
+    async def arun_sharded_simulation(self, fund_id: str, fund_size: float,
+                                      allocation_targets: List[AllocationTarget],
+                                      market_scenarios: List[MonteCarloScenario],
+                                      investment_period: int = 5) -> Dict[str, Any]:
+        """Async variant of run_sharded_simulation that never blocks the event loop"""
         try:
-            # Simple approach - weighted average volatility
-            total_vol = 0
-            total_weight = 0
+            if not allocation_targets or not market_scenarios:
+                return self._create_fallback_simulation_results()
             
-            for allocation in allocations.values():
-                weight = allocation['target_percentage'] / 100
-                vol = abs(allocation['actual_return']) * 0.3  # Simplified volatility estimate
-                total_vol += weight * vol
-                total_weight += weight
+            tables = self._build_parameter_tables(allocation_targets, market_scenarios)
+            shard_calls = self._plan_shards(fund_id, fund_size, tables, investment_period)
+            loop = asyncio.get_running_loop()
+            executor = _get_shard_executor(self.max_workers)
+            partials = await asyncio.gather(*[loop.run_in_executor(executor, call) for call in shard_calls])
             
-            return total_vol / total_weight if total_weight > 0 else 0.2
+            return await loop.run_in_executor(
+                None, self._merge_shard_results, list(partials), tables, market_scenarios
+            )
             
         except Exception as e:
-            logger.error(f"Error calculating portfolio volatility: {e}")
-            return 0.2
+            logger.error(f"Error running sharded Monte Carlo simulation: {e}")
+            return self._create_fallback_simulation_results()
     
-    def _aggregate_simulation_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _plan_shards(self, fund_id: str, fund_size: float, tables: Dict[str, Any],
+                     period: int) -> List[functools.partial]:
+        """Split the simulation count into fixed-size shards with independent seeds"""
+        sizes = [self.shard_size] * (self.num_simulations // self.shard_size)
+        if self.num_simulations % self.shard_size:
+            sizes.append(self.num_simulations % self.shard_size)
+        
+        seeds = _fund_seed_sequence(fund_id).spawn(len(sizes))
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int)
+        
+        return [
+            functools.partial(_run_simulation_shard, seed, size, int(offset), fund_size, tables, period)
+            for seed, size, offset in zip(seeds, sizes, offsets)
+        ]
+    
+    def _merge_shard_results(self, partials: List[Dict[str, Any]], tables: Dict[str, Any],
+                             scenarios: List[MonteCarloScenario]) -> Dict[str, Any]:
+        """Merge per-shard partial aggregates (in shard order) into the standard result layout"""
+        n = 0
+        multiple_mean = multiple_m2 = irr_mean = irr_m2 = 0.0
+        peak = None
+        max_drawdown = 0.0
+        for p in partials:
+            # Chan et al. pairwise update for mean and sum of squared deviations
+            total = n + p['count']
+            delta = p['multiple_mean'] - multiple_mean
+            multiple_m2 += p['multiple_m2'] + delta ** 2 * n * p['count'] / total
+            multiple_mean += delta * p['count'] / total
+            delta = p['irr_mean'] - irr_mean
+            irr_m2 += p['irr_m2'] + delta ** 2 * n * p['count'] / total
+            irr_mean += delta * p['count'] / total
+            n = total
+            
+            # Drawdown carried across shard boundaries from the running peak
+            max_drawdown = max(max_drawdown, p['max_drawdown'])
+            if peak is not None and peak > 0:
+                max_drawdown = max(max_drawdown, (peak - p['min_multiple']) / peak)
+            peak = p['peak'] if peak is None else max(peak, p['peak'])
+        
+        counts = [p['count'] for p in partials]
+        multiple_sketches = [p['multiple_sketch'] for p in partials]
+        irr_sketches = [p['irr_sketch'] for p in partials]
+        multiple_q = lambda q: _sketch_quantile(multiple_sketches, counts, q)
+        irr_q = lambda q: _sketch_quantile(irr_sketches, counts, q)
+        
+        irr_std = math.sqrt(irr_m2 / (n - 1)) if n > 1 else 0
+        excess_mean = irr_mean - 0.03
+        downside_count = sum(p['irr_downside_count'] for p in partials)
+        downside_dev = (
+            math.sqrt(sum(p['irr_downside_sq_sum'] for p in partials) / downside_count) if downside_count else 0.0
+        )
+        
+        # Expected shortfall is read from the merged sketch below the 5% quantile
+        var_5 = multiple_q(0.05)
+        sketch_values = np.concatenate(multiple_sketches)
+        sketch_weights = _sketch_weights(multiple_sketches, counts)
+        tail = sketch_values <= var_5
+        
+        scenario_analysis = {}
+        scenario_counts = sum(p['scenario_counts'] for p in partials)
+        scenario_multiple_sums = sum(p['scenario_multiple_sums'] for p in partials)
+        scenario_irr_sums = sum(p['scenario_irr_sums'] for p in partials)
+        scenario_irr_sq_sums = sum(p['scenario_irr_sq_sums'] for p in partials)
+        scenario_positive_counts = sum(p['scenario_positive_counts'] for p in partials)
+        for i, scenario in enumerate(scenarios):
+            count = int(scenario_counts[i])
+            if count == 0:
+                continue
+            
+            mean_irr = scenario_irr_sums[i] / count
+            variance = (scenario_irr_sq_sums[i] - count * mean_irr ** 2) / (count - 1) if count > 1 else 0.0
+            
+            scenario_analysis[scenario.scenario_id] = {
+                'scenario_name': scenario.scenario_name,
+                'probability': scenario.probability,
+                'simulations_count': count,
+                'expected_multiple': float(scenario_multiple_sums[i] / count),
+                'expected_irr': float(mean_irr),
+                'volatility': float(math.sqrt(max(variance, 0.0))),
+                'probability_positive': float(scenario_positive_counts[i] / count)
+            }
+        
+        best = max(partials, key=lambda p: p['best_risk_adj'])
+        optimal_allocations = {}
+        for i, category in enumerate(tables['category_keys']):
+            optimal_allocations[category] = {
+                'recommended_percentage': float(tables['weights'][i] * 100),
+                'expected_return': float(best['best_returns'][i]),
+                'risk_contribution': float(abs(best['best_returns'][i]) * 0.3)  # Simplified
+            }
+        
+        return {
+            'total_simulations': n,
+            'shards': len(partials),
+            'aggregated_results': {
+                'expected_multiple': multiple_mean,
+                'median_multiple': multiple_q(0.5),
+                'multiple_std': math.sqrt(multiple_m2 / (n - 1)) if n > 1 else 0,
+                'expected_irr': irr_mean,
+                'median_irr': irr_q(0.5),
+                'irr_std': irr_std,
+                'expected_risk_adj_return': sum(p['risk_adj_sum'] for p in partials) / n,
+                'probability_positive_returns': sum(p['positive_count'] for p in partials) / n,
+                'probability_target_returns': sum(p['target_count'] for p in partials) / n,
+                'value_at_risk_5': var_5,
+                'value_at_risk_95': multiple_q(0.95)
+            },
+            'confidence_intervals': {
+                'multiple_90_ci': {'lower': var_5, 'upper': multiple_q(0.95)},
+                'multiple_95_ci': {'lower': multiple_q(0.025), 'upper': multiple_q(0.975)},
+                'irr_90_ci': {'lower': irr_q(0.05), 'upper': irr_q(0.95)},
+                'irr_95_ci': {'lower': irr_q(0.025), 'upper': irr_q(0.975)}
+            },
+            'risk_metrics': {
+                'volatility': irr_std,
+                'downside_deviation': downside_dev,
+                'maximum_drawdown': max_drawdown,
+                'probability_of_loss': sum(p['loss_count'] for p in partials) / n,
+                'expected_shortfall_5': float(np.average(sketch_values[tail], weights=sketch_weights[tail])),
+                'sharpe_ratio': excess_mean / irr_std if irr_std > 0 else 0.0,
+                'sortino_ratio': irr_mean / downside_dev if downside_dev > 0 else 0.0
+            },
+            'optimal_allocations': {
+                'best_simulation_id': best['best_index'],
+                'optimal_allocations': optimal_allocations,
+                'expected_portfolio_return': best['best_irr'],
+                'expected_multiple': best['best_multiple'],
+                'risk_adjusted_return': best['best_risk_adj']
+            },
+            'scenario_analysis': scenario_analysis
+        }
+    
+    def _build_parameter_tables(self, allocation_targets: List[AllocationTarget],
+                                market_scenarios: List[MonteCarloScenario]) -> Dict[str, Any]:
+        """Build the (scenarios x targets) return and volatility tables for a simulation"""
+        category_keys = [f"{t.category}_{t.subcategory}" for t in allocation_targets]
+        probabilities = np.array([s.probability for s in market_scenarios], dtype=np.float64)
+        
+        # Defaults are 15% expected return / 30% volatility for unlisted categories
+        return {
+            'category_keys': category_keys,
+            'weights': np.array([t.target_percentage / 100 for t in allocation_targets], dtype=np.float64),
+            'expected_returns': np.array(
+                [[s.expected_returns.get(k, 0.15) for k in category_keys] for s in market_scenarios], dtype=np.float64
+            ),
+            'volatilities': np.array(
+                [[s.risk_factors.get(k, 0.3) for k in category_keys] for s in market_scenarios], dtype=np.float64
+            ),
+            'probabilities': probabilities / probabilities.sum()
+        }
+    
+    def _aggregate_simulation_results(self, paths: Dict[str, Any]) -> Dict[str, Any]:
         """Aggregate results from all simulations"""
         try:
-            if not results:
+            multiples = paths['multiples']
+            irrs = paths['irrs']
+            n = len(multiples)
+            if n == 0:
                 return {}
             
-            # Calculate summary statistics
-            multiples = [r['multiple'] for r in results]
-            irrs = [r['irr'] for r in results]
-            risk_adj_returns = [r['risk_adjusted_return'] for r in results]
-            
-            aggregated = {
-                'expected_multiple': statistics.mean(multiples),
-                'median_multiple': statistics.median(multiples),
-                'multiple_std': statistics.stdev(multiples) if len(multiples) > 1 else 0,
-                'expected_irr': statistics.mean(irrs),
-                'median_irr': statistics.median(irrs),
-                'irr_std': statistics.stdev(irrs) if len(irrs) > 1 else 0,
-                'expected_risk_adj_return': statistics.mean(risk_adj_returns),
-                'probability_positive_returns': sum(1 for m in multiples if m > 1.0) / len(multiples),
-                'probability_target_returns': sum(1 for m in multiples if m > 2.0) / len(multiples),
-                'value_at_risk_5': sorted(multiples)[int(len(multiples) * 0.05)],
-                'value_at_risk_95': sorted(multiples)[int(len(multiples) * 0.95)]
-            }
+            sorted_multiples = np.sort(multiples)
             
-            return aggregated
+            return {
+                'expected_multiple': float(multiples.mean()),
+                'median_multiple': float(np.median(multiples)),
+                'multiple_std': float(multiples.std(ddof=1)) if n > 1 else 0,
+                'expected_irr': float(irrs.mean()),
+                'median_irr': float(np.median(irrs)),
+                'irr_std': float(irrs.std(ddof=1)) if n > 1 else 0,
+                'expected_risk_adj_return': float(paths['risk_adjusted_returns'].mean()),
+                'probability_positive_returns': float(np.count_nonzero(multiples > 1.0) / n),
+                'probability_target_returns': float(np.count_nonzero(multiples > 2.0) / n),
+                'value_at_risk_5': float(sorted_multiples[int(n * 0.05)]),
+                'value_at_risk_95': float(sorted_multiples[int(n * 0.95)])
+            }
             
         except Exception as e:
             logger.error(f"Error aggregating simulation results: {e}")
             return {}
     
-    def _calculate_confidence_intervals(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_confidence_intervals(self, paths: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate confidence intervals for key metrics"""
         try:
-            multiples = sorted([r['multiple'] for r in results])
-            irrs = sorted([r['irr'] for r in results])
+            multiples = np.sort(paths['multiples'])
+            irrs = np.sort(paths['irrs'])
             
             n = len(multiples)
             
             return {
                 'multiple_90_ci': {
-                    'lower': multiples[int(n * 0.05)],
-                    'upper': multiples[int(n * 0.95)]
+                    'lower': float(multiples[int(n * 0.05)]),
+                    'upper': float(multiples[int(n * 0.95)])
                 },
                 'multiple_95_ci': {
-                    'lower': multiples[int(n * 0.025)],
-                    'upper': multiples[int(n * 0.975)]
+                    'lower': float(multiples[int(n * 0.025)]),
+                    'upper': float(multiples[int(n * 0.975)])
                 },
                 'irr_90_ci': {
-                    'lower': irrs[int(n * 0.05)],
-                    'upper': irrs[int(n * 0.95)]
+                    'lower': float(irrs[int(n * 0.05)]),
+                    'upper': float(irrs[int(n * 0.95)])
                 },
                 'irr_95_ci': {
-                    'lower': irrs[int(n * 0.025)],
-                    'upper': irrs[int(n * 0.975)]
+                    'lower': float(irrs[int(n * 0.025)]),
+                    'upper': float(irrs[int(n * 0.975)])
                 }
             }
             
@@ -287,139 +536,121 @@ class MonteCarloEngine:
             logger.error(f"Error calculating confidence intervals: {e}")
             return {}
     
-    def _calculate_risk_metrics(self, results: List[Dict[str, Any]]) -> Dict[str, float]:
+    def _calculate_risk_metrics(self, paths: Dict[str, Any]) -> Dict[str, float]:
         """Calculate risk metrics from simulation results"""
         try:
-            multiples = [r['multiple'] for r in results]
-            irrs = [r['irr'] for r in results]
+            multiples = paths['multiples']
+            irrs = paths['irrs']
+            n = len(multiples)
+            
+            var_5 = np.partition(multiples, int(n * 0.05))[int(n * 0.05)]
             
-            # Calculate various risk metrics
-            risk_metrics = {
-                'volatility': statistics.stdev(irrs) if len(irrs) > 1 else 0,
+            return {
+                'volatility': float(irrs.std(ddof=1)) if n > 1 else 0,
                 'downside_deviation': self._calculate_downside_deviation(irrs),
                 'maximum_drawdown': self._calculate_max_drawdown(multiples),
-                'probability_of_loss': sum(1 for m in multiples if m < 1.0) / len(multiples),
-                'expected_shortfall_5': statistics.mean([m for m in multiples if m <= sorted(multiples)[int(len(multiples) * 0.05)]]),
+                'probability_of_loss': float(np.count_nonzero(multiples < 1.0) / n),
+                'expected_shortfall_5': float(multiples[multiples <= var_5].mean()),
                 'sharpe_ratio': self._calculate_sharpe_ratio(irrs),
                 'sortino_ratio': self._calculate_sortino_ratio(irrs)
             }
             
-            return risk_metrics
-            
         except Exception as e:
             logger.error(f"Error calculating risk metrics: {e}")
             return {}
     
-    def _calculate_downside_deviation(self, returns: List[float], target_return: float = 0.0) -> float:
+    def _calculate_downside_deviation(self, returns: np.ndarray, target_return: float = 0.0) -> float:
         """Calculate downside deviation"""
-        try:
-            downside_returns = [r - target_return for r in returns if r < target_return]
-            if not downside_returns:
-                return 0.0
-            
-            return math.sqrt(sum(r**2 for r in downside_returns) / len(downside_returns))
-            
-        except Exception as e:
+        downside_returns = returns[returns < target_return] - target_return
+        if downside_returns.size == 0:
             return 0.0
+        return float(np.sqrt(np.mean(downside_returns ** 2)))
     
-    def _calculate_max_drawdown(self, values: List[float]) -> float:
+    def _calculate_max_drawdown(self, values: np.ndarray) -> float:
         """Calculate maximum drawdown"""
-        try:
-            if not values:
-                return 0.0
-            
-            peak = values[0]
-            max_drawdown = 0.0
-            
-            for value in values:
-                if value > peak:
-                    peak = value
-                else:
-                    drawdown = (peak - value) / peak
-                    max_drawdown = max(max_drawdown, drawdown)
-            
-            return max_drawdown
-            
-        except Exception as e:
+        if values.size == 0:
             return 0.0
+        
+        peaks = np.maximum.accumulate(values)
+        drawdowns = np.divide(peaks - values, peaks, out=np.zeros_like(values), where=peaks > 0)
+        return float(drawdowns.max())
     
-    def _calculate_sharpe_ratio(self, returns: List[float], risk_free_rate: float = 0.03) -> float:
+    def _calculate_sharpe_ratio(self, returns: np.ndarray, risk_free_rate: float = 0.03) -> float:
         """Calculate Sharpe ratio"""
-        try:
-            if not returns:
-                return 0.0
-            
-            excess_returns = [r - risk_free_rate for r in returns]
-            mean_excess = statistics.mean(excess_returns)
-            std_excess = statistics.stdev(excess_returns) if len(excess_returns) > 1 else 0
-            
-            return mean_excess / std_excess if std_excess > 0 else 0.0
-            
-        except Exception as e:
+        if returns.size < 2:
             return 0.0
+        
+        excess_returns = returns - risk_free_rate
+        std_excess = excess_returns.std(ddof=1)
+        return float(excess_returns.mean() / std_excess) if std_excess > 0 else 0.0
     
-    def _calculate_sortino_ratio(self, returns: List[float], target_return: float = 0.0) -> float:
+    def _calculate_sortino_ratio(self, returns: np.ndarray, target_return: float = 0.0) -> float:
         """Calculate Sortino ratio"""
-        try:
-            if not returns:
-                return 0.0
-            
-            mean_return = statistics.mean(returns)
-            downside_dev = self._calculate_downside_deviation(returns, target_return)
-            
-            return (mean_return - target_return) / downside_dev if downside_dev > 0 else 0.0
-            
-        except Exception as e:
+        if returns.size == 0:
             return 0.0
+        
+        downside_dev = self._calculate_downside_deviation(returns, target_return)
+        return float((returns.mean() - target_return) / downside_dev) if downside_dev > 0 else 0.0
     
-    def _find_optimal_allocations(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _find_optimal_allocations(self, paths: Dict[str, Any]) -> Dict[str, Any]:
         """Find optimal allocations based on risk-return trade-off"""
         try:
-            # For simplicity, find allocations with highest risk-adjusted returns
-            best_simulation = max(results, key=lambda x: x.get('risk_adjusted_return', 0))
+            # For simplicity, pick the path with the highest risk-adjusted return
+            best = int(np.argmax(paths['risk_adjusted_returns']))
+            best_returns = paths['returns'][best]
             
             optimal_allocations = {}
-            for category, allocation in best_simulation.get('allocations', {}).items():
+            for i, category in enumerate(paths['category_keys']):
                 optimal_allocations[category] = {
-                    'recommended_percentage': allocation['target_percentage'],
-                    'expected_return': allocation['actual_return'],
-                    'risk_contribution': abs(allocation['actual_return']) * 0.3  # Simplified
+                    'recommended_percentage': float(paths['target_percentages'][i]),
+                    'expected_return': float(best_returns[i]),
+                    'risk_contribution': float(abs(best_returns[i]) * 0.3)  # Simplified
                 }
             
             return {
-                'best_simulation_id': best_simulation['simulation_id'],
+                'best_simulation_id': best,
                 'optimal_allocations': optimal_allocations,
-                'expected_portfolio_return': best_simulation['irr'],
-                'expected_multiple': best_simulation['multiple'],
-                'risk_adjusted_return': best_simulation['risk_adjusted_return']
+                'expected_portfolio_return': float(paths['irrs'][best]),
+                'expected_multiple': float(paths['multiples'][best]),
+                'risk_adjusted_return': float(paths['risk_adjusted_returns'][best])
             }
             
         except Exception as e:
             logger.error(f"Error finding optimal allocations: {e}")
             return {}
     
-    def _analyze_scenario_performance(self, results: List[Dict[str, Any]], 
+    def _analyze_scenario_performance(self, paths: Dict[str, Any], 
                                     scenarios: List[MonteCarloScenario]) -> Dict[str, Any]:
         """Analyze performance across different scenarios"""
         try:
-            scenario_analysis = {}
+            scenario_idx = paths['scenario_idx']
+            multiples = paths['multiples']
+            irrs = paths['irrs']
             
-            for scenario in scenarios:
-                scenario_results = [r for r in results if r['scenario_id'] == scenario.scenario_id]
+            counts = np.bincount(scenario_idx, minlength=len(scenarios))
+            multiple_sums = np.bincount(scenario_idx, weights=multiples, minlength=len(scenarios))
+            irr_sums = np.bincount(scenario_idx, weights=irrs, minlength=len(scenarios))
+            irr_sq_sums = np.bincount(scenario_idx, weights=irrs ** 2, minlength=len(scenarios))
+            positive_counts = np.bincount(scenario_idx, weights=multiples > 1.0, minlength=len(scenarios))
+            
+            scenario_analysis = {}
+            for i, scenario in enumerate(scenarios):
+                count = int(counts[i])
+                if count == 0:
+                    continue
                 
-                if scenario_results:
-                    multiples = [r['multiple'] for r in scenario_results]
-                    irrs = [r['irr'] for r in scenario_results]
-                    
-                    scenario_analysis[scenario.scenario_id] = {
-                        'scenario_name': scenario.scenario_name,
-                        'probability': scenario.probability,
-                        'simulations_count': len(scenario_results),
-                        'expected_multiple': statistics.mean(multiples),
-                        'expected_irr': statistics.mean(irrs),
-                        'volatility': statistics.stdev(irrs) if len(irrs) > 1 else 0,
-                        'probability_positive': sum(1 for m in multiples if m > 1.0) / len(multiples)
-                    }
+                mean_irr = irr_sums[i] / count
+                variance = (irr_sq_sums[i] - count * mean_irr ** 2) / (count - 1) if count > 1 else 0.0
+                
+                scenario_analysis[scenario.scenario_id] = {
+                    'scenario_name': scenario.scenario_name,
+                    'probability': scenario.probability,
+                    'simulations_count': count,
+                    'expected_multiple': float(multiple_sums[i] / count),
+                    'expected_irr': float(mean_irr),
+                    'volatility': float(math.sqrt(max(variance, 0.0))),
+                    'probability_positive': float(positive_counts[i] / count)
+                }
             
             return scenario_analysis
             
@@ -442,19 +673,6 @@ class MonteCarloEngine:
             'scenario_analysis': {},
             'note': 'Fallback results - Monte Carlo simulation not available'
         }
-    
-    def _create_empty_simulation_result(self, sim_id: int) -> Dict[str, Any]:
-        """Create empty simulation result for failed runs"""
-        return {
-            'simulation_id': sim_id,
-            'scenario_id': 'unknown',
-            'allocations': {},
-            'returns': {},
-            'final_value': 0,
-            'irr': 0,
-            'multiple': 1.0,
-            'risk_adjusted_return': 0
-        }
 
 class AllocationOptimizer(VERSSAIAIAgent):
     """AI Agent for fund allocation optimization"""
@@ -514,9 +732,9 @@ class AllocationOptimizer(VERSSAIAIAgent):
             # Create market scenarios for Monte Carlo simulation
             market_scenarios = self._create_market_scenarios(market_conditions)
             
-            # Run Monte Carlo simulation
-            mc_results = self.monte_carlo.run_allocation_simulation(
-                fund_size, target_allocations, market_scenarios
+            # Run Monte Carlo simulation sharded across the process pool
+            mc_results = await self.monte_carlo.arun_sharded_simulation(
+                fund_id, fund_size, target_allocations, market_scenarios
             )
             
             # Create cache key for deterministic AI analysis
@@ -559,7 +777,7 @@ Strategy Insights:
 Please provide optimization recommendations with valid JSON only."""
             
             # Get AI optimization recommendations
-            ai_response = self.call_ai(optimization_prompt, self.system_prompt, temperature=0.0)
+            ai_response = await self.acall_ai(optimization_prompt, self.system_prompt, temperature=0.0)
             optimization_analysis = self._parse_optimization_response(ai_response)
             
             # Create deployment schedule
@@ -199,7 +199,7 @@ Historical Vintage Context:
 
 Please analyze vintage performance patterns, market timing impact, and provide insights with valid JSON only."""
             
-            response = self.call_ai(analysis_prompt, self.system_prompt, temperature=0.0)
+            response = await self.acall_ai(analysis_prompt, self.system_prompt, temperature=0.0)
             
             # Parse AI response
             analysis_data = self._parse_vintage_analysis(response)
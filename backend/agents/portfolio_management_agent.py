@@ -8,11 +8,13 @@ import hashlib
 import asyncio
 from typing import Dict, List, Any, Optional, Tuple
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from dataclasses import dataclass, asdict
 import uuid
+import bisect
 import statistics
+from array import array
 
 from ai_agents import VERSSAIAIAgent
 from rag_service import rag_service, add_company_document
@@ -21,6 +23,9 @@ from twitter_search_service import twitter_search_service
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of per-company KPI analyses (RAG + LLM) in flight at once
+PORTFOLIO_ANALYSIS_CONCURRENCY = int(os.environ.get('PORTFOLIO_ANALYSIS_CONCURRENCY', '8'))
+
 @dataclass
 class PortfolioCompany:
     company_id: str
@@ -62,6 +67,127 @@ class KPITracker:
     last_updated: str
     historical_data: List[Dict[str, Any]]
 
+class KPISeries:
+    """
+    Time-ordered values of one company metric, held in compact float arrays
+
+    The date strings callers recorded are kept alongside and returned unchanged.
+    """
+
+    __slots__ = ('timestamps', 'values', 'dates', 'target_value', 'period', 'last_updated')
+
+    def __init__(self, target_value: float = 0, period: str = "monthly"):
+        self.timestamps = array('d')
+        self.values = array('d')
+        self.dates: List[str] = []
+        self.target_value = target_value
+        self.period = period
+        self.last_updated = ''
+
+    def record(self, timestamp: float, value: float, date: str):
+        """Insert a data point, keeping the series sorted by time"""
+        position = bisect.bisect_right(self.timestamps, timestamp)
+        self.timestamps.insert(position, timestamp)
+        self.values.insert(position, value)
+        self.dates.insert(position, date)
+        if position == len(self.values) - 1:
+            self.last_updated = date
+
+    def window(self, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[array, array]:
+        """Timestamps and values within [start, end]"""
+        lo = bisect.bisect_left(self.timestamps, start) if start is not None else 0
+        hi = bisect.bisect_right(self.timestamps, end) if end is not None else len(self.timestamps)
+        return self.timestamps[lo:hi], self.values[lo:hi]
+
+    def to_tracker(self, company_id: str, metric_name: str) -> KPITracker:
+        """Materialize the series as a KPITracker"""
+        current_value = self.values[-1]
+        previous_value = self.values[-2] if len(self.values) > 1 else 0
+        if len(self.values) < 2 or current_value == previous_value:
+            trend = "stable"
+        else:
+            trend = "improving" if current_value > previous_value else "declining"
+
+        return KPITracker(
+            company_id=company_id,
+            metric_name=metric_name,
+            current_value=current_value,
+            previous_value=previous_value,
+            target_value=self.target_value,
+            trend=trend,
+            period=self.period,
+            last_updated=self.last_updated,
+            historical_data=[
+                {'date': date, 'value': value}
+                for date, value in zip(self.dates, self.values)
+            ]
+        )
+
+class KPIStore:
+    """
+    KPI time series indexed by company and metric
+
+    Each company carries a version number that is bumped on every update, so
+    callers can tell whether a company's KPIs changed since they last looked.
+    """
+
+    def __init__(self):
+        self._series: Dict[str, Dict[str, KPISeries]] = {}
+        self._versions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return sum(len(metrics) for metrics in self._series.values())
+
+    @staticmethod
+    def _parse_timestamp(date: str) -> float:
+        """Seconds since the epoch (UTC) of an ISO 8601 date; raises ValueError if unparseable"""
+        try:
+            parsed = datetime.fromisoformat(date.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            raise ValueError(f"Unparseable KPI date: {date!r}")
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return (parsed - datetime(1970, 1, 1)).total_seconds()
+
+    def record(self, company_id: str, metric_name: str, value: float, date: str):
+        """Add one KPI observation; raises ValueError when the date cannot be parsed"""
+        timestamp = self._parse_timestamp(date)
+        metrics = self._series.setdefault(company_id, {})
+        series = metrics.get(metric_name)
+        if series is None:
+            series = metrics[metric_name] = KPISeries()
+        series.record(timestamp, float(value), date)
+        self._versions[company_id] = self._versions.get(company_id, 0) + 1
+
+    def version(self, company_id: str) -> int:
+        return self._versions.get(company_id, 0)
+
+    def get_series(self, company_id: str, metric_name: str,
+                   start: Optional[str] = None, end: Optional[str] = None) -> Tuple[array, array]:
+        """Timestamps and values of one metric, optionally limited to a date range"""
+        series = self._series.get(company_id, {}).get(metric_name)
+        if series is None:
+            return array('d'), array('d')
+        return series.window(
+            self._parse_timestamp(start) if start else None,
+            self._parse_timestamp(end) if end else None
+        )
+
+    def get_company_kpis(self, company_id: str) -> List[KPITracker]:
+        """All KPIs of one company as KPITracker objects"""
+        return [
+            series.to_tracker(company_id, metric_name)
+            for metric_name, series in self._series.get(company_id, {}).items()
+        ]
+
+    def all_trackers(self) -> Dict[str, KPITracker]:
+        """Every KPI keyed by '{company_id}_{metric_name}'"""
+        return {
+            f"{company_id}_{metric_name}": series.to_tracker(company_id, metric_name)
+            for company_id, metrics in self._series.items()
+            for metric_name, series in metrics.items()
+        }
+
 @dataclass
 class PortfolioInsight:
     insight_id: str
@@ -194,7 +320,7 @@ Historical Context:
 
 Please analyze and respond with valid JSON only."""
             
-            response = self.call_ai(analysis_prompt, self.system_prompt, temperature=0.0)
+            response = await self.acall_ai(analysis_prompt, self.system_prompt, temperature=0.0)
             
             # Parse AI response
             analysis_data = self._parse_analysis_response(response)
@@ -361,7 +487,7 @@ Industry Benchmarks:
 
 Please analyze trends, predict performance, and provide recommendations with valid JSON only."""
             
-            response = self.call_ai(analysis_prompt, self.system_prompt, temperature=0.0)
+            response = await self.acall_ai(analysis_prompt, self.system_prompt, temperature=0.0)
             
             # Parse AI response
             analysis_data = self._parse_kpi_response(response)
@@ -477,7 +603,14 @@ class PortfolioOrchestrator:
         self.kpi_analyzer = KPIAnalyzer()
         self.portfolio_companies = {}  # In-memory storage for demo
         self.board_meetings = {}
-        self.kpi_trackers = {}
+        self.kpi_store = KPIStore()
+        self._kpi_analyses = {}  # company_id -> (kpi version, context signature, analysis)
+        self._analysis_semaphore = asyncio.Semaphore(PORTFOLIO_ANALYSIS_CONCURRENCY)
+    
+    @property
+    def kpi_trackers(self) -> Dict[str, KPITracker]:
+        """All tracked KPIs keyed by '{company_id}_{metric_name}'"""
+        return self.kpi_store.all_trackers()
         
     async def add_portfolio_company(self, company_data: Dict[str, Any]) -> PortfolioCompany:
         """Add new portfolio company"""
@@ -582,30 +715,17 @@ class PortfolioOrchestrator:
                 # In a real implementation, filter by fund_id
                 pass
             
+            # Analyze every company's KPIs concurrently, bounded by the semaphore
+            kpi_analyses = await asyncio.gather(*[
+                self._analyze_company_kpis(company) for company in companies
+            ])
+            
             # Analyze each company's performance
             company_performances = []
             total_value = 0
             total_investment = 0
             
-            for company in companies:
-                # Get latest KPIs
-                company_kpis = [kpi for kpi in self.kpi_trackers.values() 
-                             if kpi.company_id == company.company_id]
-                
-                # Analyze KPI trends
-                if company_kpis:
-                    company_context = {
-                        'company_id': company.company_id,
-                        'company_name': company.company_name,
-                        'industry': company.industry,
-                        'stage': company.stage
-                    }
-                    kpi_analysis = await self.kpi_analyzer.analyze_kpi_trends(
-                        company.company_id, company_kpis, company_context
-                    )
-                else:
-                    kpi_analysis = {'status': 'no_kpis_available'}
-                
+            for company, kpi_analysis in zip(companies, kpi_analyses):
                 # Calculate performance metrics
                 multiple = (company.current_valuation / company.initial_investment) if company.initial_investment > 0 else 0
                 total_value += company.current_valuation
@@ -667,6 +787,35 @@ class PortfolioOrchestrator:
             logger.error(f"Error analyzing portfolio performance: {e}")
             raise
     
+    async def _analyze_company_kpis(self, company: PortfolioCompany) -> Dict[str, Any]:
+        """Analyze one company's KPI trends, reusing the last analysis if nothing changed"""
+        company_kpis = self.kpi_store.get_company_kpis(company.company_id)
+        if not company_kpis:
+            return {'status': 'no_kpis_available'}
+        
+        company_context = {
+            'company_id': company.company_id,
+            'company_name': company.company_name,
+            'industry': company.industry,
+            'stage': company.stage
+        }
+        version = self.kpi_store.version(company.company_id)
+        context_signature = json.dumps(company_context, sort_keys=True)
+        
+        cached = self._kpi_analyses.get(company.company_id)
+        if cached and cached[0] == version and cached[1] == context_signature:
+            return cached[2]
+        
+        async with self._analysis_semaphore:
+            kpi_analysis = await self.kpi_analyzer.analyze_kpi_trends(
+                company.company_id, company_kpis, company_context
+            )
+        
+        # Fallback analyses are retried on the next report
+        if kpi_analysis.get('ai_provider') != 'fallback':
+            self._kpi_analyses[company.company_id] = (version, context_signature, kpi_analysis)
+        return kpi_analysis
+    
     async def _add_company_to_portfolio_rag(self, company: PortfolioCompany):
         """Add portfolio company to RAG knowledge base"""
         try:
@@ -744,43 +893,10 @@ class PortfolioOrchestrator:
         """Update company KPIs from meeting data"""
         try:
             for metric_name, value in kpi_updates.items():
-                kpi_id = f"{company_id}_{metric_name}"
-                
-                if kpi_id in self.kpi_trackers:
-                    # Update existing KPI
-                    kpi = self.kpi_trackers[kpi_id]
-                    kpi.previous_value = kpi.current_value
-                    kpi.current_value = float(value)
-                    kpi.last_updated = date
-                    
-                    # Add to historical data
-                    kpi.historical_data.append({
-                        'date': date,
-                        'value': float(value)
-                    })
-                    
-                    # Determine trend
-                    if kpi.current_value > kpi.previous_value:
-                        kpi.trend = "improving"
-                    elif kpi.current_value < kpi.previous_value:
-                        kpi.trend = "declining"
-                    else:
-                        kpi.trend = "stable"
-                else:
-                    # Create new KPI tracker
-                    kpi = KPITracker(
-                        company_id=company_id,
-                        metric_name=metric_name,
-                        current_value=float(value),
-                        previous_value=0,
-                        target_value=0,  # Would be set based on company plans
-                        trend="stable",
-                        period="monthly",
-                        last_updated=date,
-                        historical_data=[{'date': date, 'value': float(value)}]
-                    )
-                    self.kpi_trackers[kpi_id] = kpi
+                self.kpi_store.record(company_id, metric_name, float(value), date)
                 
+        except ValueError as e:
+            logger.warning(f"Rejected KPI updates for {company_id}: {e}")
         except Exception as e:
             logger.error(f"Error updating KPIs: {e}")
     
@@ -6,6 +6,8 @@ Now powered by Google Gemini Pro
 import os
 import json
 import re
+import asyncio
+import random
 from typing import Dict, List, Any, Optional
 import logging
 from datetime import datetime
@@ -13,9 +15,6 @@ import uuid
 from pathlib import Path
 import hashlib
 
-# Cache for deterministic results
-_analysis_cache = {}
-
 # Import for Google Gemini integration
 try:
     import google.generativeai as genai
@@ -29,11 +28,87 @@ try:
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
+
+# Shared connection pool for async OpenAI calls
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
     
 from rag_service import rag_service
+from persistent_cache import PersistentCache
 
 logger = logging.getLogger(__name__)
 
+# Async LLM client settings (per-provider concurrency and retry policy)
+AI_MAX_CONCURRENCY = {
+    'gemini': int(os.environ.get('GEMINI_MAX_CONCURRENCY', '8')),
+    'openai': int(os.environ.get('OPENAI_MAX_CONCURRENCY', '8'))
+}
+AI_MAX_RETRIES = int(os.environ.get('AI_MAX_RETRIES', '4'))
+AI_RETRY_BASE_DELAY = 1.0
+AI_RETRY_MAX_DELAY = 30.0
+
+# Bump when prompt templates change so stale analyses are not served
+ANALYSIS_PROMPT_VERSION = '2.0'
+
+# Cache for deterministic results, shared by all workers through SQLite
+_analysis_cache = PersistentCache(
+    'ai_analysis',
+    db_path=os.environ.get('AI_ANALYSIS_CACHE_PATH'),
+    max_entries=int(os.environ.get('AI_ANALYSIS_CACHE_MAX_ENTRIES', '5000')),
+    max_bytes=int(os.environ.get('AI_ANALYSIS_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+    default_ttl=float(os.environ.get('AI_ANALYSIS_CACHE_TTL', '0')) or None
+)
+
+_provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+_openai_session = None
+
+def _get_provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Shared semaphore bounding in-flight requests per AI provider"""
+    if provider not in _provider_semaphores:
+        _provider_semaphores[provider] = asyncio.Semaphore(AI_MAX_CONCURRENCY.get(provider, 4))
+    return _provider_semaphores[provider]
+
+def _get_openai_session():
+    """Shared, connection-pooled aiohttp session for async OpenAI calls"""
+    global _openai_session
+    if AIOHTTP_AVAILABLE and (_openai_session is None or _openai_session.closed):
+        _openai_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=AI_MAX_CONCURRENCY['openai'], keepalive_timeout=60)
+        )
+    return _openai_session
+
+async def close_ai_clients():
+    """Close shared async AI client resources (call on application shutdown)"""
+    global _openai_session
+    if _openai_session is not None and not _openai_session.closed:
+        await _openai_session.close()
+    _openai_session = None
+
+def _is_retryable_ai_error(error: Exception) -> bool:
+    """Rate-limit, quota and transient server errors are worth retrying"""
+    name = type(error).__name__
+    message = str(error)
+    return (
+        name in ('RateLimitError', 'ResourceExhausted', 'ServiceUnavailable', 'APIConnectionError',
+                 'Timeout', 'TimeoutError', 'DeadlineExceeded', 'InternalServerError')
+        or '429' in message or '503' in message
+    )
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Backoff delay, honoring a server-provided Retry-After when present"""
+    headers = getattr(error, 'headers', None) or {}
+    retry_after = getattr(error, 'retry_after', None) or headers.get('retry-after')
+    if retry_after:
+        try:
+            return min(float(retry_after), AI_RETRY_MAX_DELAY)
+        except (TypeError, ValueError):
+            pass
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(AI_RETRY_MAX_DELAY, AI_RETRY_BASE_DELAY * (2 ** attempt)))
+
 class VERSSAIAIAgent:
     """Base class for VERSSAI AI agents with Gemini Pro integration"""
     
@@ -44,6 +119,13 @@ class VERSSAIAIAgent:
         self.model = "gemini-1.5-pro"  # Default Gemini model
         self.setup_ai_clients()
     
+    def analysis_cache_key(self, kind: str, *inputs: Any) -> str:
+        """Cache key covering the model, provider, prompt version and system prompt"""
+        system_prompt_hash = hashlib.sha256(getattr(self, 'system_prompt', '').encode()).hexdigest()[:16]
+        return PersistentCache.make_key(
+            kind, self.model, self.ai_provider, ANALYSIS_PROMPT_VERSION, system_prompt_hash, *inputs
+        )
+    
     def setup_ai_clients(self):
         """Setup AI clients (Gemini preferred, OpenAI as fallback)"""
         if self.gemini_api_key and GEMINI_AVAILABLE:
@@ -76,6 +158,72 @@ class VERSSAIAIAgent:
         else:
             return self._mock_response(prompt)
     
+    async def acall_ai(self, prompt: str, system_prompt: str = "", temperature: float = 0.0) -> str:
+        """
+        Non-blocking call_ai for async code paths
+        
+        Requests share one client per provider, are bounded by a per-provider
+        semaphore, and are retried with backoff on rate limits and transient
+        errors. Falls back to the mock response like call_ai.
+        """
+        if self.ai_provider == "gemini":
+            request = lambda: self._acall_gemini(prompt, system_prompt, temperature)
+        elif self.ai_provider == "openai":
+            request = lambda: self._acall_openai(prompt, system_prompt, temperature)
+        else:
+            return self._mock_response(prompt)
+        
+        semaphore = _get_provider_semaphore(self.ai_provider)
+        for attempt in range(AI_MAX_RETRIES + 1):
+            try:
+                async with semaphore:
+                    return await request()
+            except Exception as e:
+                if attempt >= AI_MAX_RETRIES or not _is_retryable_ai_error(e):
+                    logger.error(f"{self.ai_provider} API error: {e}")
+                    return self._mock_response(prompt)
+                delay = _retry_delay(e, attempt)
+                logger.warning(f"{self.ai_provider} API throttled/unavailable ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    async def _acall_gemini(self, prompt: str, system_prompt: str = "", temperature: float = 0.0) -> str:
+        """Async Gemini call with the same deterministic settings as _call_gemini"""
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        generation_config = genai.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=2000,
+            candidate_count=1,
+            top_p=1.0,
+            top_k=1
+        )
+        response = await self.gemini_model.generate_content_async(
+            full_prompt,
+            generation_config=generation_config
+        )
+        return response.text
+    
+    async def _acall_openai(self, prompt: str, system_prompt: str = "", temperature: float = 0.0) -> str:
+        """Async OpenAI call over the shared aiohttp session"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        session = _get_openai_session()
+        if session is not None:
+            openai.aiosession.set(session)
+        
+        response = await openai.ChatCompletion.acreate(
+            model="gpt-4",
+            messages=messages,
+            temperature=temperature,
+            max_tokens=2000,
+            top_p=1.0,
+            frequency_penalty=0,
+            presence_penalty=0
+        )
+        return response.choices[0].message.content
+    
     def _call_gemini(self, prompt: str, system_prompt: str = "", temperature: float = 0.0) -> str:
         """Call Google Gemini API with deterministic settings"""
         try:
@@ -186,12 +334,13 @@ class DeckExtractionAgent(VERSSAIAIAgent):
         """
         try:
             # Create cache key for deterministic results
-            cache_key = hashlib.md5(f"extraction_{text_content}_{company_name_hint}".encode()).hexdigest()
+            cache_key = self.analysis_cache_key('extraction', text_content, company_name_hint)
             
             # Check cache first
-            if cache_key in _analysis_cache:
+            cached_result = _analysis_cache.get(cache_key)
+            if cached_result is not None:
                 logger.info(f"Returning cached extraction result for {company_name_hint}")
-                return _analysis_cache[cache_key]
+                return cached_result
             
             user_prompt = f"""Analyze this pitch deck content and extract key information:
 
@@ -222,7 +371,7 @@ Please extract the information and respond with valid JSON only."""
                 extraction_data['agent_version'] = '2.0'
                 
                 # Cache the result
-                _analysis_cache[cache_key] = extraction_data
+                _analysis_cache.set(cache_key, extraction_data)
                 
                 return extraction_data
                 
@@ -340,12 +489,13 @@ class FounderSignalAgent(VERSSAIAIAgent):
         """
         try:
             # Create cache key for deterministic results
-            cache_key = hashlib.md5(f"founder_{json.dumps(founder_data, sort_keys=True)}_{json.dumps(company_context or {}, sort_keys=True)}".encode()).hexdigest()
+            cache_key = self.analysis_cache_key('founder', founder_data, company_context or {})
             
             # Check cache first
-            if cache_key in _analysis_cache:
+            cached_result = _analysis_cache.get(cache_key)
+            if cached_result is not None:
                 logger.info(f"Returning cached founder analysis for {founder_data.get('name', 'Unknown')}")
-                return _analysis_cache[cache_key]
+                return cached_result
             
             # Create deterministic RAG context to avoid non-deterministic results
             rag_context = ""
@@ -403,7 +553,7 @@ Please analyze and respond with valid JSON only."""
                 analysis_data = self._validate_founder_scores(analysis_data)
                 
                 # Cache the result
-                _analysis_cache[cache_key] = analysis_data
+                _analysis_cache.set(cache_key, analysis_data)
                 
                 return analysis_data
                 
@@ -560,12 +710,13 @@ class InvestmentThesisAgent(VERSSAIAIAgent):
         """
         try:
             # Create cache key for deterministic results
-            cache_key = hashlib.md5(f"investment_{json.dumps(company_data, sort_keys=True)}_{json.dumps(founder_analysis or {}, sort_keys=True)}_{investor_thesis or ''}".encode()).hexdigest()
+            cache_key = self.analysis_cache_key('investment', company_data, founder_analysis or {}, investor_thesis or '')
             
             # Check cache first
-            if cache_key in _analysis_cache:
+            cached_result = _analysis_cache.get(cache_key)
+            if cached_result is not None:
                 logger.info(f"Returning cached investment evaluation for {company_data.get('company_name', 'Unknown')}")
-                return _analysis_cache[cache_key]
+                return cached_result
             
             # Query RAG for similar successful investments - Use deterministic approach
             market = company_data.get('market', 'technology')
@@ -622,7 +773,7 @@ Please evaluate and respond with valid JSON only."""
                 evaluation_data['ai_provider'] = 'gemini'
                 
                 # Cache the result
-                _analysis_cache[cache_key] = evaluation_data
+                _analysis_cache.set(cache_key, evaluation_data)
                 
                 return evaluation_data
                 
@@ -685,13 +836,20 @@ def evaluate_investment_opportunity(company_data: Dict[str, Any], founder_analys
 
 def clear_analysis_cache():
     """Clear the analysis cache for fresh results - Use only when needed"""
-    global _analysis_cache
     _analysis_cache.clear()
     logger.info("Analysis cache cleared - all future analyses will be fresh")
 
 def get_cache_stats():
     """Get statistics about the current cache"""
+    stats = _analysis_cache.get_stats()
     return {
-        "cached_analyses": len(_analysis_cache),
-        "cache_keys": list(_analysis_cache.keys())[:10]  # Show first 10 keys only
+        "cached_analyses": stats['entries'],
+        "cache_keys": stats['recent_keys'],  # Most recently used 10 keys only
+        "hit_ratio": stats['hit_ratio'],
+        "hits": stats['hits'],
+        "misses": stats['misses'],
+        "bytes": stats['bytes'],
+        "evictions": stats['evictions'],
+        "max_entries": stats['max_entries'],
+        "max_bytes": stats['max_bytes']
     }
\ No newline at end of file
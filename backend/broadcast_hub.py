@@ -0,0 +1,192 @@
+"""
+VERSSAI Broadcast Hub
+Organization-indexed WebSocket fan-out with one writer task per connection
+
+Each message is serialized once per broadcast and queued on every recipient's
+bounded outbound queue. Frames that carry a coalesce key (e.g. progress updates
+for one execution) replace any queued frame with the same key, so a slow client
+only ever receives the latest state instead of a backlog of stale updates.
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+WS_QUEUE_SIZE = int(os.getenv("MCP_WS_QUEUE_SIZE", "64"))
+WS_SEND_TIMEOUT = float(os.getenv("MCP_WS_SEND_TIMEOUT", "10"))
+
+
+class ConnectionChannel:
+    """Bounded outbound queue and writer task for one WebSocket"""
+
+    def __init__(self, connection_id: str, websocket: Any, organization_id: str, max_queue: int):
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.organization_id = organization_id
+        self.max_queue = max_queue
+        # coalesce key (or unique sequence key) -> serialized frame, in send order
+        self.pending: "OrderedDict[Any, str]" = OrderedDict()
+        self.ready = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+        self._sequence = 0
+
+    def enqueue(self, text: str, coalesce_key: Optional[str] = None) -> str:
+        """
+        Queue a frame without blocking
+
+        Returns:
+            "queued", "coalesced" (replaced a stale frame) or "dropped" (evicted the oldest frame)
+        """
+        outcome = "queued"
+        if coalesce_key is not None and coalesce_key in self.pending:
+            # Keep the original position so ordering against other frames is preserved
+            self.pending[coalesce_key] = text
+            outcome = "coalesced"
+        else:
+            if coalesce_key is None:
+                self._sequence += 1
+                coalesce_key = ("seq", self._sequence)
+            if len(self.pending) >= self.max_queue:
+                self.pending.popitem(last=False)
+                outcome = "dropped"
+            self.pending[coalesce_key] = text
+
+        self.ready.set()
+        return outcome
+
+
+class BroadcastHub:
+    """Fan-out of JSON messages to WebSocket connections, indexed by organization"""
+
+    def __init__(self, max_queue: int = WS_QUEUE_SIZE, send_timeout: float = WS_SEND_TIMEOUT,
+                 on_close: Optional[Callable[[str], Awaitable[None]]] = None):
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.on_close = on_close
+
+        self._channels: Dict[str, ConnectionChannel] = {}
+        self._by_organization: Dict[str, Set[str]] = {}
+
+        self._started_at = time.time()
+        self.stats = {
+            "broadcasts": 0,
+            "frames_queued": 0,
+            "frames_sent": 0,
+            "bytes_sent": 0,
+            "frames_coalesced": 0,
+            "frames_dropped": 0,
+            "send_errors": 0,
+            "send_timeouts": 0
+        }
+
+    def register(self, connection_id: str, websocket: Any, organization_id: str):
+        """Add a connection and start its writer task"""
+        channel = ConnectionChannel(connection_id, websocket, organization_id, self.max_queue)
+        channel.writer = asyncio.create_task(self._writer(channel))
+        self._channels[connection_id] = channel
+        self._by_organization.setdefault(organization_id, set()).add(connection_id)
+
+    def unregister(self, connection_id: str):
+        """Remove a connection; queued frames are discarded"""
+        channel = self._channels.pop(connection_id, None)
+        if channel is None:
+            return
+
+        members = self._by_organization.get(channel.organization_id)
+        if members is not None:
+            members.discard(connection_id)
+            if not members:
+                del self._by_organization[channel.organization_id]
+
+        if channel.writer is not None and channel.writer is not asyncio.current_task():
+            channel.writer.cancel()
+
+    def send(self, connection_id: str, message: Dict[str, Any], coalesce_key: Optional[str] = None) -> bool:
+        """Queue a message for one connection"""
+        channel = self._channels.get(connection_id)
+        if channel is None:
+            return False
+        self._enqueue(channel, json.dumps(message, default=str), coalesce_key)
+        return True
+
+    def broadcast(self, organization_id: str, message: Dict[str, Any],
+                  coalesce_key: Optional[str] = None) -> int:
+        """
+        Queue a message for every connection of an organization
+
+        The message is serialized once regardless of the number of recipients.
+
+        Returns:
+            Number of connections the message was queued for
+        """
+        connection_ids = self._by_organization.get(organization_id)
+        if not connection_ids:
+            return 0
+
+        text = json.dumps(message, default=str)
+        for connection_id in connection_ids:
+            self._enqueue(self._channels[connection_id], text, coalesce_key)
+
+        self.stats["broadcasts"] += 1
+        return len(connection_ids)
+
+    def _enqueue(self, channel: ConnectionChannel, text: str, coalesce_key: Optional[str]):
+        outcome = channel.enqueue(text, coalesce_key)
+        self.stats["frames_queued"] += 1
+        if outcome == "coalesced":
+            self.stats["frames_coalesced"] += 1
+        elif outcome == "dropped":
+            self.stats["frames_dropped"] += 1
+
+    async def _writer(self, channel: ConnectionChannel):
+        """Drain one connection's queue; a failed or stalled send closes the connection"""
+        try:
+            while True:
+                await channel.ready.wait()
+                channel.ready.clear()
+
+                while channel.pending:
+                    _, text = channel.pending.popitem(last=False)
+                    await asyncio.wait_for(channel.websocket.send_text(text), timeout=self.send_timeout)
+                    self.stats["frames_sent"] += 1
+                    self.stats["bytes_sent"] += len(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats["send_timeouts"] += 1
+                logger.warning(f"Send to {channel.connection_id} stalled for {self.send_timeout}s, closing")
+            else:
+                self.stats["send_errors"] += 1
+                logger.error(f"Failed to send message to {channel.connection_id}: {e}")
+
+            self.unregister(channel.connection_id)
+            if self.on_close is not None:
+                await self.on_close(channel.connection_id)
+
+    async def close(self):
+        """Stop every writer task"""
+        writers = [channel.writer for channel in self._channels.values() if channel.writer is not None]
+        for connection_id in list(self._channels):
+            self.unregister(connection_id)
+        await asyncio.gather(*writers, return_exceptions=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Throughput, drop/coalesce counters and current queue depths"""
+        depths = [len(channel.pending) for channel in self._channels.values()]
+        uptime = max(time.time() - self._started_at, 1e-9)
+        return {
+            **self.stats,
+            "connections": len(self._channels),
+            "organizations": len(self._by_organization),
+            "frames_per_second": self.stats["frames_sent"] / uptime,
+            "bytes_per_second": self.stats["bytes_sent"] / uptime,
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "queue_capacity": self.max_queue
+        }
@@ -0,0 +1,257 @@
+"""
+VERSSAI Citation Graph
+Compact CSR adjacency for paper citation networks
+
+Papers are integer-coded once with pandas; edges are stored as CSR index
+arrays (forward for references, reverse for citations) and edge attributes as
+parallel typed arrays. PageRank, degrees and k-hop neighborhoods run directly on
+the arrays, so no per-edge Python objects are created. Use to_networkx() only
+when a caller needs the full networkx API.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DIRECTIONS = ('out', 'in', 'both')
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, num_nodes: int):
+    """CSR index arrays for the given edges; also returns the edge permutation used"""
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32), order
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Concatenated CSR rows of several nodes, without a Python loop"""
+    starts = indptr[nodes]
+    lengths = indptr[nodes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype)
+    # Position of every gathered entry: row start + offset within the row
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return indices[np.repeat(starts, lengths) + offsets]
+
+
+class CitationGraph:
+    """Directed citation graph (citing paper -> cited paper) in CSR form"""
+
+    def __init__(self, node_ids: Optional[pd.Index] = None, sources: Optional[np.ndarray] = None,
+                 targets: Optional[np.ndarray] = None, edge_attributes: Optional[Dict[str, Any]] = None):
+        self.node_ids = node_ids if node_ids is not None else pd.Index([])
+        self._labels = self.node_ids.tolist()
+        num_nodes = len(self.node_ids)
+        sources = sources if sources is not None else np.empty(0, dtype=np.int32)
+        targets = targets if targets is not None else np.empty(0, dtype=np.int32)
+
+        # Forward adjacency, with edge attributes in the same order as its indices
+        self.indptr, self.indices, order = _csr(sources, targets, num_nodes)
+        self.edge_attributes = {
+            name: (values[order], categories)
+            for name, (values, categories) in (edge_attributes or {}).items()
+        }
+        self._edge_sources = sources[order].astype(np.int32)
+
+        # Reverse adjacency for "cited by" queries
+        self.rev_indptr, self.rev_indices, _ = _csr(targets, sources, num_nodes)
+
+        self._pagerank: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_dataframe(cls, citations_df: pd.DataFrame, source_col: str = 'citing_paper_id',
+                       target_col: str = 'cited_paper_id') -> 'CitationGraph':
+        """
+        Build the graph from a Citation_Network sheet
+
+        Rows without both paper IDs are skipped. Repeated citing/cited pairs
+        collapse to one edge, keeping the attributes of the last row.
+        """
+        df = citations_df.dropna(subset=[source_col, target_col])
+        df = df.drop_duplicates(subset=[source_col, target_col], keep='last')
+
+        codes, node_ids = pd.factorize(pd.concat([df[source_col], df[target_col]], ignore_index=True))
+        codes = codes.astype(np.int32)
+        sources, targets = codes[:len(df)], codes[len(df):]
+
+        edge_attributes = {}
+        for name, column, default in (('context', 'citation_context', 'Unknown'),
+                                      ('sentiment', 'citation_sentiment', 'Neutral')):
+            values = df[column].fillna(default) if column in df else pd.Series(default, index=df.index)
+            categorical = pd.Categorical(values.astype(str))
+            edge_attributes[name] = (categorical.codes.astype(np.int16), np.asarray(categorical.categories))
+        self_citation = df['self_citation'] if 'self_citation' in df else pd.Series(False, index=df.index)
+        edge_attributes['self_citation'] = (self_citation.fillna(False).astype(bool).to_numpy(), None)
+
+        return cls(pd.Index(node_ids), sources, targets, edge_attributes)
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    def number_of_edges(self) -> int:
+        return len(self.indices)
+
+    def __contains__(self, paper_id: Any) -> bool:
+        return paper_id in self.node_ids
+
+    def resolve_id(self, paper_id: str) -> Any:
+        """Map an ID received as text (e.g. a URL path) to the stored paper ID"""
+        if paper_id in self.node_ids:
+            return paper_id
+        for cast in (int, float):
+            try:
+                if cast(paper_id) in self.node_ids:
+                    return cast(paper_id)
+            except ValueError:
+                continue
+        raise KeyError(paper_id)
+
+    def out_degree(self) -> np.ndarray:
+        """References made by each paper, indexed like node_ids"""
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        """Citations received by each paper, indexed like node_ids"""
+        return np.diff(self.rev_indptr)
+
+    def degrees(self, paper_id: Any) -> Dict[str, int]:
+        code = self.node_ids.get_loc(paper_id)
+        return {
+            'in_degree': int(self.rev_indptr[code + 1] - self.rev_indptr[code]),
+            'out_degree': int(self.indptr[code + 1] - self.indptr[code])
+        }
+
+    def pagerank(self, alpha: float = 0.85, tol: float = 1.0e-6, max_iter: int = 100) -> np.ndarray:
+        """
+        PageRank by power iteration over the edge arrays (cached)
+
+        Matches networkx.pagerank: dangling papers spread their rank uniformly
+        and convergence is checked on the L1 change scaled by the node count.
+        """
+        if self._pagerank is not None:
+            return self._pagerank
+
+        n = self.number_of_nodes()
+        if n == 0:
+            self._pagerank = np.empty(0)
+            return self._pagerank
+
+        out_degree = self.out_degree().astype(np.float64)
+        dangling = out_degree == 0
+        inv_out = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            previous = rank
+            flow = np.bincount(self.indices, weights=(previous * inv_out)[self._edge_sources], minlength=n)
+            rank = alpha * (flow + previous[dangling].sum() / n) + (1.0 - alpha) / n
+            if np.abs(rank - previous).sum() < n * tol:
+                break
+        else:
+            logger.warning(f"PageRank did not converge in {max_iter} iterations")
+
+        self._pagerank = rank
+        return rank
+
+    def top_papers(self, n: int = 10, by: str = 'pagerank') -> List[Dict[str, Any]]:
+        """Highest ranked papers by 'pagerank' or 'in_degree'"""
+        if self.number_of_nodes() == 0:
+            return []
+        scores = self.pagerank() if by == 'pagerank' else self.in_degree()
+        n = min(n, len(scores))
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        in_degree, out_degree = self.in_degree(), self.out_degree()
+        return [
+            {
+                'paper_id': self._labels[code],
+                by: float(scores[code]),
+                'in_degree': int(in_degree[code]),
+                'out_degree': int(out_degree[code])
+            }
+            for code in top
+        ]
+
+    def neighborhood(self, paper_id: Any, k: int = 1, direction: str = 'out') -> Dict[Any, int]:
+        """
+        Papers within k hops of paper_id, mapped to their hop distance
+
+        Args:
+            direction: 'out' follows references, 'in' follows citations, 'both' ignores direction
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}")
+
+        start = self.node_ids.get_loc(paper_id)
+        distance = np.full(self.number_of_nodes(), -1, dtype=np.int32)
+        distance[start] = 0
+        frontier = np.array([start])
+
+        for hop in range(1, k + 1):
+            reached = []
+            if direction in ('out', 'both'):
+                reached.append(_gather(self.indptr, self.indices, frontier))
+            if direction in ('in', 'both'):
+                reached.append(_gather(self.rev_indptr, self.rev_indices, frontier))
+            candidates = np.unique(np.concatenate(reached))
+            frontier = candidates[distance[candidates] < 0]
+            if len(frontier) == 0:
+                break
+            distance[frontier] = hop
+
+        found = np.flatnonzero(distance > 0)
+        return {self._labels[code]: int(distance[code]) for code in found}
+
+    def edges_from(self, paper_id: Any) -> List[Dict[str, Any]]:
+        """References of one paper with their edge attributes"""
+        code = self.node_ids.get_loc(paper_id)
+        return [self._edge(position) for position in range(self.indptr[code], self.indptr[code + 1])]
+
+    def _edge(self, position: int) -> Dict[str, Any]:
+        edge = {
+            'citing_paper_id': self._labels[self._edge_sources[position]],
+            'cited_paper_id': self._labels[self.indices[position]]
+        }
+        for name, (values, categories) in self.edge_attributes.items():
+            value = values[position]
+            edge[name] = str(categories[value]) if categories is not None else value.item()
+        return edge
+
+    def get_statistics(self) -> Dict[str, Any]:
+        in_degree = self.in_degree()
+        self_citation = self.edge_attributes.get('self_citation', (np.empty(0, dtype=bool), None))[0]
+        return {
+            'nodes': self.number_of_nodes(),
+            'edges': self.number_of_edges(),
+            'avg_citations': float(in_degree.mean()) if len(in_degree) else 0.0,
+            'max_citations': int(in_degree.max()) if len(in_degree) else 0,
+            'self_citation_rate': float(self_citation.mean()) if len(self_citation) else 0.0,
+            'memory_bytes': int(
+                self.indptr.nbytes + self.indices.nbytes + self.rev_indptr.nbytes
+                + self.rev_indices.nbytes + self._edge_sources.nbytes
+                + sum(values.nbytes for values, _ in self.edge_attributes.values())
+            )
+        }
+
+    def to_networkx(self):
+        """Materialize a networkx.DiGraph with the same nodes, edges and attributes"""
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._labels)
+        columns = {
+            name: (categories[values] if categories is not None else values).tolist()
+            for name, (values, categories) in self.edge_attributes.items()
+        }
+        names = list(columns)
+        graph.add_edges_from(
+            (self._labels[source], self._labels[target], dict(zip(names, attributes)))
+            for source, target, *attributes in zip(self._edge_sources.tolist(), self.indices.tolist(),
+                                                   *columns.values())
+        )
+        return graph
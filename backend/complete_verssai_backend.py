@@ -12,11 +12,15 @@ import numpy as np
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel
 import json
 from typing import List, Dict, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from datetime import datetime
+from founder_name_index import FounderNameIndex
+
+MAX_BATCH_FOUNDERS = 1000
 
 class VERSSAIFullAcademicAPI:
     """
@@ -29,6 +33,7 @@ class VERSSAIFullAcademicAPI:
         self.search_indices = {}
         self.load_complete_datasets()
         self.setup_advanced_search()
+        self.setup_founder_index()
     
     def load_complete_datasets(self):
         """Load complete Excel dataset with all sheets"""
@@ -98,6 +103,20 @@ class VERSSAIFullAcademicAPI:
             print(f"⚠️ Search indexing failed: {e}")
             self.search_indices = {}
     
+    def setup_founder_index(self):
+        """Index researcher names and precompute academic credibility for founder validation"""
+        researchers = self.datasets['researchers']
+        self.name_index = FounderNameIndex(researchers['name'])
+        
+        # Same weighting as advanced_founder_validation, for every researcher at once
+        self.academic_credibility = (
+            np.minimum(50, researchers['h_index'] * 0.5) +
+            np.minimum(30, researchers['total_citations'] / 1000 * 30) +
+            np.where(researchers['industry_experience'].fillna(False).astype(bool), 10, 0) +
+            np.minimum(10, researchers['collaboration_count'] * 0.3)
+        ).to_numpy()
+        print(f"✅ Founder name index ready ({len(self.name_index):,} researchers)")
+    
     def get_summary_stats(self):
         """Get comprehensive platform statistics"""
         base_stats = self.datasets['summary'].iloc[0].to_dict()
@@ -133,12 +152,12 @@ class VERSSAIFullAcademicAPI:
         researchers = self.datasets['researchers']
         
         # Direct name match (exact and fuzzy)
-        exact_matches = researchers[researchers['name'].str.contains(founder_name, case=False, na=False)]
+        match = self.name_index.best_match(founder_name)
         
-        if not exact_matches.empty:
-            # Found exact match
-            researcher = exact_matches.iloc[0]
+        if match is not None:
+            researcher = researchers.iloc[match.position]
             results['found_in_database'] = True
+            results['match_score'] = match.score
             results['researcher_profile'] = {
                 'name': researcher['name'],
                 'institution': researcher['institution'],
@@ -159,7 +178,7 @@ class VERSSAIFullAcademicAPI:
             collaboration_score = min(10, researcher['collaboration_count'] * 0.3)
             
             results['academic_credibility'] = h_index_score + citations_score + experience_score + collaboration_score
-            results['validation_confidence'] = 95
+            results['validation_confidence'] = round(95 * match.score)
             
             # Find similar researchers in the field
             field_researchers = researchers[
@@ -179,7 +198,7 @@ class VERSSAIFullAcademicAPI:
             
             # Get field ranking
             field_ranking = researchers[researchers['primary_field'] == researcher['primary_field']]['h_index'].rank(ascending=False)
-            researcher_rank = field_ranking[exact_matches.index[0]]
+            researcher_rank = field_ranking[match.label]
             total_in_field = len(researchers[researchers['primary_field'] == researcher['primary_field']])
             
             results['field_expertise_ranking'] = {
@@ -219,6 +238,35 @@ class VERSSAIFullAcademicAPI:
         
         return results
     
+    def validate_founders_batch(self, founder_names: List[str]) -> List[Dict]:
+        """Name-level validation for many founders (e.g. a whole deck pipeline) in one call"""
+        researchers = self.datasets['researchers']
+        results = []
+        for name, matches in zip(founder_names, self.name_index.lookup_batch(founder_names)):
+            if not matches:
+                results.append({
+                    'founder_name': name,
+                    'found_in_database': False,
+                    'academic_credibility': 0,
+                    'validation_confidence': 0
+                })
+                continue
+            
+            match = matches[0]
+            researcher = researchers.iloc[match.position]
+            results.append({
+                'founder_name': name,
+                'found_in_database': True,
+                'match_score': match.score,
+                'matched_name': match.name,
+                'institution': researcher['institution'],
+                'primary_field': researcher['primary_field'],
+                'h_index': int(researcher['h_index']),
+                'academic_credibility': float(self.academic_credibility[match.position]),
+                'validation_confidence': round(95 * match.score)
+            })
+        return results
+    
     def comprehensive_market_research(self, industry: str, technology: str = None, stage: str = None) -> Dict:
         """Comprehensive market research with advanced analysis"""
         search_terms = industry
@@ -533,6 +581,23 @@ async def advanced_founder_validation(founder_name: str, founder_institution: st
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+class FounderBatchRequest(BaseModel):
+    founder_names: List[str]
+
+@app.post("/api/academic/validate-founders")
+async def validate_founders_batch(request: FounderBatchRequest):
+    """Validate a batch of founder names against the researcher index"""
+    if not academic_api:
+        raise HTTPException(status_code=503, detail="Academic Intelligence not available")
+    if len(request.founder_names) > MAX_BATCH_FOUNDERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_FOUNDERS} founders per request")
+    
+    try:
+        result = academic_api.validate_founders_batch(request.founder_names)
+        return {"status": "success", "data": result, "total": len(result)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/academic/market-research")
 async def comprehensive_market_research(industry: str, technology: str = None, stage: str = None):
     """Comprehensive market research with advanced analysis"""
@@ -1,4 +1,6 @@
 # Add these imports at the top of the file
+import json
+from fastapi import Request, Response
 from .verssai_dataset_processor import VERSSAIDatasetProcessor, initialize_verssai_dataset
 
 # Add the dataset processor after the RAG system initialization
@@ -18,6 +20,32 @@ except Exception as e:
 
 # Add these API endpoints after the existing routes:
 
+# Latest encoded body per precomputed analysis: name -> (etag, bytes)
+_precomputed_bodies = {}
+
+def _precomputed_response(request: Request, name: str):
+    """
+    Serve a precomputed analysis with ETag revalidation
+
+    Returns a 304 when If-None-Match carries the current ETag, otherwise the
+    body encoded once per dataset version. None if nothing is precomputed.
+    """
+    result = app.state.dataset_processor.get_precomputed(name)
+    if result is None:
+        return None
+
+    etag = f'"{result.etag}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Dataset-Version": result.version}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    cached = _precomputed_bodies.get(name)
+    if cached is None or cached[0] != result.etag:
+        body = json.dumps({**result.payload, "dataset_version": result.version, "status": "real_data"})
+        cached = _precomputed_bodies[name] = (result.etag, body.encode())
+    return Response(content=cached[1], media_type="application/json", headers=headers)
+
 @app.get("/api/dataset/stats")
 async def get_dataset_stats():
     """Get comprehensive dataset statistics"""
@@ -121,8 +149,28 @@ async def search_researchers(request: dict):
         logger.error(f"Error searching researchers: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Researcher search failed: {str(e)}")
 
+@app.get("/api/papers/search")
+async def search_papers(query: str, limit: int = 20):
+    """Full-text search over paper titles and abstracts"""
+    try:
+        if not app.state.dataset_processor:
+            return {"papers": [], "total_found": 0, "query": query, "status": "mock_data"}
+
+        results = app.state.dataset_processor.search_papers(query, min(limit, 100))
+
+        return {
+            "papers": results,
+            "total_found": len(results),
+            "query": query,
+            "status": "real_data"
+        }
+
+    except Exception as e:
+        logger.error(f"Error searching papers: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Paper search failed: {str(e)}")
+
 @app.get("/api/institutions/analysis")
-async def get_institution_analysis():
+async def get_institution_analysis(request: Request):
     """Get institution performance analysis"""
     try:
         if not app.state.dataset_processor:
@@ -156,6 +204,10 @@ async def get_institution_analysis():
                 "status": "mock_data"
             }
             
+        response = _precomputed_response(request, "institution_analysis")
+        if response is not None:
+            return response
+
         analysis = app.state.dataset_processor.get_institution_analysis()
         analysis["status"] = "real_data"
         return analysis
@@ -165,7 +217,7 @@ async def get_institution_analysis():
         raise HTTPException(status_code=500, detail=f"Institution analysis failed: {str(e)}")
 
 @app.get("/api/research/insights")
-async def get_research_insights(category: str = None):
+async def get_research_insights(request: Request, category: str = None):
     """Get research insights and trends"""
     try:
         if not app.state.dataset_processor:
@@ -190,6 +242,11 @@ async def get_research_insights(category: str = None):
                 "status": "mock_data"
             }
             
+        if category is None:
+            response = _precomputed_response(request, "research_insights")
+            if response is not None:
+                return response
+
         insights = app.state.dataset_processor.get_research_insights(category)
         insights["status"] = "real_data"
         return insights
@@ -199,7 +256,7 @@ async def get_research_insights(category: str = None):
         raise HTTPException(status_code=500, detail=f"Research insights failed: {str(e)}")
 
 @app.get("/api/citations/network-analysis")
-async def get_citation_network_analysis():
+async def get_citation_network_analysis(request: Request):
     """Get citation network analysis"""
     try:
         if not app.state.dataset_processor:
@@ -218,6 +275,10 @@ async def get_citation_network_analysis():
                 "status": "mock_data"
             }
             
+        response = _precomputed_response(request, "citation_network_analysis")
+        if response is not None:
+            return response
+
         analysis = app.state.dataset_processor.get_citation_network_analysis()
         analysis["status"] = "real_data"
         return analysis
@@ -227,7 +288,7 @@ async def get_citation_network_analysis():
         raise HTTPException(status_code=500, detail=f"Citation network analysis failed: {str(e)}")
 
 @app.get("/api/vc/insights")
-async def get_vc_insights():
+async def get_vc_insights(request: Request):
     """Generate VC-specific insights from dataset"""
     try:
         if not app.state.dataset_processor:
@@ -273,6 +334,10 @@ async def get_vc_insights():
                 "status": "mock_data"
             }
             
+        response = _precomputed_response(request, "vc_insights")
+        if response is not None:
+            return response
+
         insights = app.state.dataset_processor.generate_vc_insights()
         insights["status"] = "real_data"
         return insights
@@ -315,9 +380,12 @@ async def get_dataset_overview():
             }
             
         # Get comprehensive overview
-        stats = app.state.dataset_processor.get_dataset_stats()
-        research_insights = app.state.dataset_processor.get_research_insights()
-        institution_analysis = app.state.dataset_processor.get_institution_analysis()
+        processor = app.state.dataset_processor
+        stats = processor.get_dataset_stats()
+        research = processor.get_precomputed("research_insights")
+        research_insights = research.payload if research else processor.get_research_insights()
+        institutions = processor.get_precomputed("institution_analysis")
+        institution_analysis = institutions.payload if institutions else processor.get_institution_analysis()
         
         return {
             "summary": {
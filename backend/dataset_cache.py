@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+VERSSAI Dataset Cache
+Columnar on-disk cache of the VERSSAI Excel workbook, keyed by the workbook's hash
+
+Parsing the workbook with openpyxl dominates cold-start time. The first load
+converts every sheet to Parquet (or pickle when pyarrow is unavailable or a
+sheet has mixed-type columns); later starts read the columnar files directly.
+
+Usage:
+    python dataset_cache.py uploads/VERSSAI_Massive_Dataset_Complete.xlsx --rebuild
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Parquet needs pyarrow; pickle is the always-available fallback
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.environ.get('VERSSAI_DATASET_CACHE_DIR', './cache/dataset')
+MANIFEST_NAME = 'manifest.json'
+# Hex digits of the workbook checksum in a cache directory name
+CHECKSUM_PREFIX_LENGTH = 16
+
+
+def compute_file_checksum(path: str) -> str:
+    """SHA-256 of a file, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """Columnar cache of one Excel workbook"""
+
+    def __init__(self, workbook_path: str, cache_dir: Optional[str] = None):
+        self.workbook_path = Path(workbook_path)
+        self.cache_root = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self._checksum = None
+
+    @property
+    def checksum(self) -> str:
+        """Hash of the source workbook (computed once per instance)"""
+        if self._checksum is None:
+            self._checksum = compute_file_checksum(str(self.workbook_path))
+        return self._checksum
+
+    @property
+    def cache_path(self) -> Path:
+        return self.cache_root / f"{self.workbook_path.stem}_{self.checksum[:CHECKSUM_PREFIX_LENGTH]}"
+
+    def _read_manifest(self) -> Optional[Dict]:
+        manifest_path = self.cache_path / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            return manifest if manifest.get('checksum') == self.checksum else None
+        except Exception as e:
+            logger.warning(f"Unreadable dataset cache manifest {manifest_path}: {e}")
+            return None
+
+    def is_fresh(self) -> bool:
+        """True when a complete cache exists for the current workbook contents"""
+        return self._read_manifest() is not None
+
+    def load(self, sheets: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Load sheets from the cache, rebuilding it first if the workbook changed
+
+        Args:
+            sheets: Sheet names to load (all sheets when omitted)
+
+        Returns:
+            Dict of sheet name -> DataFrame, in workbook order
+        """
+        manifest = self._read_manifest()
+        if manifest is None:
+            manifest = self.rebuild()
+
+        start = time.perf_counter()
+        dataset = {}
+        for entry in manifest['sheets']:
+            if sheets is not None and entry['name'] not in sheets:
+                continue
+            path = self.cache_path / entry['file']
+            if entry['format'] == 'parquet':
+                dataset[entry['name']] = pd.read_parquet(path)
+            else:
+                dataset[entry['name']] = pd.read_pickle(path)
+
+        logger.info(f"Loaded {len(dataset)} cached sheets in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return dataset
+
+    def rebuild(self) -> Dict:
+        """Parse the workbook and write every sheet to the columnar cache"""
+        if not self.workbook_path.exists():
+            raise FileNotFoundError(f"Dataset not found: {self.workbook_path}")
+
+        start = time.perf_counter()
+        excel_data = pd.read_excel(self.workbook_path, sheet_name=None)
+
+        # Write into a private temporary directory and swap it in, so readers never see a
+        # partial cache and concurrent rebuilds (e.g. several workers starting) never collide.
+        # Dot-prefixed names are ignored by _remove_stale_caches.
+        self.cache_root.mkdir(parents=True, exist_ok=True)
+        tmp_path = Path(tempfile.mkdtemp(prefix=f".{self.cache_path.name}.", suffix='.tmp', dir=self.cache_root))
+
+        try:
+            entries = []
+            for index, (sheet_name, df) in enumerate(excel_data.items()):
+                entries.append(self._write_sheet(tmp_path, index, sheet_name, df))
+
+            manifest = {
+                'source': str(self.workbook_path),
+                'checksum': self.checksum,
+                'created_at': datetime.now().isoformat(),
+                'sheets': entries
+            }
+            with open(tmp_path / MANIFEST_NAME, 'w') as f:
+                json.dump(manifest, f, indent=2)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        # Move any existing cache aside rather than deleting it in place
+        old_path = self.cache_root / f".{self.cache_path.name}.{uuid.uuid4().hex}.old"
+        try:
+            self.cache_path.rename(old_path)
+        except FileNotFoundError:
+            pass
+        try:
+            tmp_path.rename(self.cache_path)
+        except OSError:
+            # Another writer swapped in its cache first; the path is keyed by the
+            # workbook checksum, so its contents are the same as ours
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            manifest = self._read_manifest()
+            if manifest is None:
+                raise
+            logger.info(f"Dataset cache for {self.workbook_path.name} was rebuilt concurrently, using that one")
+        finally:
+            shutil.rmtree(old_path, ignore_errors=True)
+        self._remove_stale_caches()
+
+        logger.info(f"Rebuilt dataset cache for {self.workbook_path.name} in {time.perf_counter() - start:.2f}s")
+        return manifest
+
+    def _write_sheet(self, directory: Path, index: int, sheet_name: str, df: pd.DataFrame) -> Dict:
+        """Write one sheet as Parquet, falling back to pickle for mixed-type columns"""
+        stem = f"{index:02d}_{''.join(c if c.isalnum() else '_' for c in sheet_name)}"
+        if PARQUET_AVAILABLE:
+            try:
+                df.to_parquet(directory / f"{stem}.parquet", index=False)
+                return {'name': sheet_name, 'file': f"{stem}.parquet", 'format': 'parquet', 'rows': len(df)}
+            except Exception as e:
+                logger.warning(f"Parquet write failed for sheet '{sheet_name}', using pickle: {e}")
+
+        df.to_pickle(directory / f"{stem}.pkl")
+        return {'name': sheet_name, 'file': f"{stem}.pkl", 'format': 'pickle', 'rows': len(df)}
+
+    def _remove_stale_caches(self):
+        """Delete caches built from earlier versions of the same workbook"""
+        # Exactly "<stem>_<checksum prefix>", so "data.xlsx" leaves "data_v2_<checksum>" alone
+        own_cache = re.compile(re.escape(self.workbook_path.stem) + f"_[0-9a-f]{{{CHECKSUM_PREFIX_LENGTH}}}")
+        for path in self.cache_root.glob(f"{self.workbook_path.stem}_*"):
+            if path.is_dir() and path != self.cache_path and own_cache.fullmatch(path.name):
+                shutil.rmtree(path, ignore_errors=True)
+
+
+def load_dataset(workbook_path: str, sheets: Optional[List[str]] = None,
+                 cache_dir: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """Convenience function: load workbook sheets through the columnar cache"""
+    return DatasetCache(workbook_path, cache_dir).load(sheets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or check the VERSSAI dataset cache")
+    parser.add_argument('workbook', help="Path to the VERSSAI Excel workbook")
+    parser.add_argument('--cache-dir', default=None, help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild even if the cache is fresh")
+    parser.add_argument('--check', action='store_true', help="Only report whether the cache is fresh")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    cache = DatasetCache(args.workbook, args.cache_dir)
+
+    if args.check:
+        fresh = cache.is_fresh()
+        print(f"{'fresh' if fresh else 'stale'}: {cache.cache_path}")
+        raise SystemExit(0 if fresh else 1)
+
+    if args.rebuild or not cache.is_fresh():
+        manifest = cache.rebuild()
+    else:
+        manifest = cache._read_manifest()
+
+    for entry in manifest['sheets']:
+        print(f"   ✓ {entry['name']}: {entry['rows']} rows ({entry['format']})")
+    print(f"Cache: {cache.cache_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 # File: backend/enhanced_mcp_n8n_service.py
 
 import os
+import hmac
+import hashlib
 import asyncio
 import logging
 import json
@@ -17,6 +19,14 @@ import redis
 
 # Import our enhanced RAG service
 from enhanced_rag_service import enhanced_rag_service, RAGQuery, RAGResponse
+from broadcast_hub import BroadcastHub
+
+# Polling is only a fallback for missed completion callbacks, so it starts fast and backs off
+N8N_POLL_INITIAL_INTERVAL = float(os.getenv("N8N_POLL_INITIAL_INTERVAL", "1"))
+N8N_POLL_MAX_INTERVAL = float(os.getenv("N8N_POLL_MAX_INTERVAL", "30"))
+N8N_POLL_BACKOFF = 1.5
+# Callbacks that arrive before anyone waits on them are kept briefly
+N8N_EARLY_COMPLETION_LIMIT = 1000
 
 class UserRole(Enum):
     SUPER_ADMIN = "SuperAdmin"
@@ -74,6 +84,9 @@ class EnhancedMCPService:
         self.active_connections: Dict[str, WebSocket] = {}
         self.user_sessions: Dict[str, Dict[str, Any]] = {}
         
+        # Outbound fan-out: per-connection bounded queues, indexed by organization
+        self.broadcast_hub = BroadcastHub(on_close=self._cleanup_connection)
+        
         # Execution tracking
         self.active_executions: Dict[str, WorkflowExecution] = {}
         self.execution_callbacks: Dict[str, List[Callable]] = {}
@@ -85,6 +98,16 @@ class EnhancedMCPService:
             "password": os.getenv("N8N_BASIC_AUTH_PASSWORD", "verssai_n8n_2024")
         }
         
+        # Completion callbacks: n8n workflows POST to callback_url when they finish.
+        # Without a secret, callbacks are rejected and completion relies on polling.
+        self.callback_base_url = os.getenv("MCP_CALLBACK_BASE_URL", "http://localhost:8080")
+        self.callback_secret = os.getenv("N8N_CALLBACK_SECRET")
+        self._completion_futures: Dict[str, asyncio.Future] = {}
+        self._early_completions: Dict[str, Dict[str, Any]] = {}
+        
+        # One pooled HTTP client for all n8n traffic
+        self._http_client: Optional[httpx.AsyncClient] = None
+        
         # Redis for execution persistence
         self.redis_client = None
         self._init_redis()
@@ -129,6 +152,69 @@ class EnhancedMCPService:
             }
         }
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Shared n8n HTTP client (created lazily inside the running event loop)"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                auth=(self.n8n_auth["user"], self.n8n_auth["password"]),
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+        return self._http_client
+
+    async def close(self):
+        """Stop WebSocket writers and close the pooled HTTP client"""
+        await self.broadcast_hub.close()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def _callback_token(self, execution_id: str) -> str:
+        """Per-execution callback token: HMAC-SHA256 of the execution ID under the callback secret"""
+        return hmac.new(self.callback_secret.encode(), execution_id.encode(), hashlib.sha256).hexdigest()
+
+    def resolve_n8n_completion(self, execution_id: str, payload: Dict[str, Any],
+                               token: Optional[str] = None) -> bool:
+        """
+        Handle an n8n completion callback
+        
+        Args:
+            execution_id: Our execution ID (the one in callback_url)
+            payload: Callback body; "status": "error" marks a failed run
+            token: The callback_token sent to n8n with the execution
+            
+        Returns:
+            True if a waiting execution was resolved, False if the result was stored for later
+            
+        Raises:
+            PermissionError: Callbacks are disabled (no N8N_CALLBACK_SECRET) or the token is wrong
+            KeyError: No such execution
+        """
+        if not self.callback_secret:
+            raise PermissionError("n8n completion callbacks are disabled: N8N_CALLBACK_SECRET is not set")
+        if not token or not hmac.compare_digest(token, self._callback_token(execution_id)):
+            raise PermissionError("Invalid n8n callback token")
+        if execution_id not in self.active_executions:
+            raise KeyError(execution_id)
+        
+        future = self._completion_futures.get(execution_id)
+        if future is None:
+            # Callback raced ahead of the waiter; keep it for _wait_for_n8n_completion
+            if len(self._early_completions) >= N8N_EARLY_COMPLETION_LIMIT:
+                self._early_completions.pop(next(iter(self._early_completions)))
+            self._early_completions[execution_id] = payload
+            return False
+        
+        if not future.done():
+            future.set_result(payload)
+        return True
+
+    def _callback_result(self, execution_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a completion callback body into the execution result"""
+        if payload.get("status") == "error":
+            raise Exception(f"N8N execution {execution_id} failed: {payload.get('error', 'Unknown error')}")
+        return payload.get("data", payload)
+
     def _init_redis(self):
         """Initialize Redis connection for execution persistence"""
         try:
@@ -155,6 +241,7 @@ class EnhancedMCPService:
         
         connection_id = f"{user_id}_{organization_id}_{uuid.uuid4().hex[:8]}"
         self.active_connections[connection_id] = websocket
+        self.broadcast_hub.register(connection_id, websocket, organization_id)
         
         # Initialize user session
         self.user_sessions[connection_id] = {
@@ -322,6 +409,10 @@ class EnhancedMCPService:
                 "rag_layer": execution.rag_layer,
                 "timestamp": datetime.now().isoformat()
             }
+            if self.callback_secret:
+                # n8n posts the result back with this token in the X-N8N-Callback-Token header
+                n8n_payload["callback_url"] = f"{self.callback_base_url}/api/v1/n8n/executions/{execution.execution_id}/complete"
+                n8n_payload["callback_token"] = self._callback_token(execution.execution_id)
             
             # Trigger N8N workflow
             execution.progress = 0.2
@@ -352,7 +443,8 @@ class EnhancedMCPService:
             # Wait for N8N completion (with timeout)
             n8n_results = await self._wait_for_n8n_completion(
                 execution.n8n_execution_id,
-                timeout=workflow_config["estimated_duration"]
+                timeout=workflow_config["estimated_duration"],
+                execution_id=execution.execution_id
             )
             
             # Combine results
@@ -467,46 +559,72 @@ class EnhancedMCPService:
         """Trigger N8N workflow via webhook"""
         webhook_url = f"{self.n8n_base_url}/webhook/{webhook_id}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                webhook_url,
-                json=payload,
-                auth=(self.n8n_auth["user"], self.n8n_auth["password"]),
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise Exception(f"N8N webhook failed: {response.status_code} - {response.text}")
+        response = await self._get_http_client().post(webhook_url, json=payload)
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(f"N8N webhook failed: {response.status_code} - {response.text}")
 
-    async def _wait_for_n8n_completion(self, n8n_execution_id: str, timeout: int = 600) -> Dict[str, Any]:
-        """Wait for N8N workflow completion with polling"""
-        start_time = datetime.now()
+    async def _wait_for_n8n_completion(self, n8n_execution_id: str, timeout: int = 600,
+                                       execution_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Wait for N8N workflow completion
         
-        while (datetime.now() - start_time).total_seconds() < timeout:
-            try:
-                # Check execution status via N8N API
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.n8n_base_url}/api/v1/executions/{n8n_execution_id}",
-                        auth=(self.n8n_auth["user"], self.n8n_auth["password"])
-                    )
-                    
-                    if response.status_code == 200:
-                        execution_data = response.json()
-                        
-                        if execution_data.get("finished"):
-                            return execution_data
-                        elif execution_data.get("stoppedAt"):
-                            raise Exception(f"N8N execution stopped: {execution_data.get('error', 'Unknown error')}")
+        Resolves as soon as the workflow posts its completion callback. Between
+        waits the execution is polled over the pooled client, with the interval
+        backing off from N8N_POLL_INITIAL_INTERVAL to N8N_POLL_MAX_INTERVAL.
+        """
+        callback_keys = [key for key in (execution_id, n8n_execution_id) if key]
+        
+        # The callback may already have arrived
+        for key in callback_keys:
+            if key in self._early_completions:
+                return self._callback_result(key, self._early_completions.pop(key))
+        
+        completion = asyncio.get_running_loop().create_future()
+        for key in callback_keys:
+            self._completion_futures[key] = completion
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = N8N_POLL_INITIAL_INTERVAL
+        
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
                 
-                # Wait before next poll
-                await asyncio.sleep(5)
+                try:
+                    payload = await asyncio.wait_for(asyncio.shield(completion), timeout=min(interval, remaining))
+                    return self._callback_result(execution_id or n8n_execution_id, payload)
+                except asyncio.TimeoutError:
+                    pass
                 
-            except Exception as e:
-                self.logger.error(f"Error polling N8N execution {n8n_execution_id}: {e}")
-                await asyncio.sleep(5)
+                interval = min(interval * N8N_POLL_BACKOFF, N8N_POLL_MAX_INTERVAL)
+                if not n8n_execution_id:
+                    continue
+                
+                # Fallback: poll the execution status
+                try:
+                    response = await self._get_http_client().get(
+                        f"{self.n8n_base_url}/api/v1/executions/{n8n_execution_id}"
+                    )
+                except httpx.HTTPError as e:
+                    self.logger.error(f"Error polling N8N execution {n8n_execution_id}: {e}")
+                    continue
+                
+                if response.status_code == 200:
+                    execution_data = response.json()
+                    
+                    if execution_data.get("finished"):
+                        return execution_data
+                    elif execution_data.get("stoppedAt"):
+                        raise Exception(f"N8N execution stopped: {execution_data.get('error', 'Unknown error')}")
+        finally:
+            for key in callback_keys:
+                self._completion_futures.pop(key, None)
         
         raise Exception(f"N8N execution {n8n_execution_id} timed out after {timeout} seconds")
 
@@ -625,24 +743,23 @@ class EnhancedMCPService:
     async def _handle_n8n_health_check(self, connection_id: str, message: MCPMessage):
         """Handle N8N health check requests"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.n8n_base_url}/healthz",
-                    timeout=10.0
-                )
-                
-                is_healthy = response.status_code == 200
-                
-                await self._send_message(connection_id, {
-                    "type": "n8n_health_status",
-                    "data": {
-                        "healthy": is_healthy,
-                        "status_code": response.status_code,
-                        "url": self.n8n_base_url,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                })
-                
+            response = await self._get_http_client().get(
+                f"{self.n8n_base_url}/healthz",
+                timeout=10.0
+            )
+            
+            is_healthy = response.status_code == 200
+            
+            await self._send_message(connection_id, {
+                "type": "n8n_health_status",
+                "data": {
+                    "healthy": is_healthy,
+                    "status_code": response.status_code,
+                    "url": self.n8n_base_url,
+                    "timestamp": datetime.now().isoformat()
+                }
+            })
+            
         except Exception as e:
             await self._send_message(connection_id, {
                 "type": "n8n_health_status",
@@ -678,20 +795,18 @@ class EnhancedMCPService:
             "data": asdict(execution)
         }
         
-        # Send to all connections for the same organization
-        for connection_id, session in self.user_sessions.items():
-            if session["organization_id"] == execution.organization_id:
-                await self._send_message(connection_id, update_message)
+        # Send to all connections for the same organization; a newer update for the
+        # same execution replaces one still queued for a slow client
+        self.broadcast_hub.broadcast(
+            execution.organization_id,
+            update_message,
+            coalesce_key=f"execution_update:{execution.execution_id}"
+        )
 
     async def _send_message(self, connection_id: str, message: Dict[str, Any]):
-        """Send message to specific connection"""
-        if connection_id in self.active_connections:
-            try:
-                websocket = self.active_connections[connection_id]
-                await websocket.send_text(json.dumps(message, default=str))
-            except Exception as e:
-                self.logger.error(f"Failed to send message to {connection_id}: {e}")
-                await self._cleanup_connection(connection_id)
+        """Queue message for specific connection"""
+        if not self.broadcast_hub.send(connection_id, message):
+            self.logger.debug(f"Dropping message for closed connection {connection_id}")
 
     async def _send_error(self, connection_id: str, error_message: str):
         """Send error message to connection"""
@@ -705,6 +820,8 @@ class EnhancedMCPService:
 
     async def _cleanup_connection(self, connection_id: str):
         """Clean up connection and session data"""
+        self.broadcast_hub.unregister(connection_id)
+        
         if connection_id in self.active_connections:
             del self.active_connections[connection_id]
         
@@ -717,6 +834,10 @@ class EnhancedMCPService:
         """Get number of active connections"""
         return len(self.active_connections)
 
+    def get_broadcast_metrics(self) -> Dict[str, Any]:
+        """WebSocket fan-out throughput and queue depths"""
+        return self.broadcast_hub.get_metrics()
+
     async def get_active_executions_count(self) -> int:
         """Get number of active executions"""
         return len([exec for exec in self.active_executions.values() 
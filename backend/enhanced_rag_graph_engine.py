@@ -7,6 +7,7 @@ Integration with the VERSSAI massive dataset for multi-layer intelligence
 import asyncio
 import json
 import logging
+import os
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
@@ -14,13 +15,21 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+import scipy.sparse as sp
+import joblib
 import networkx as nx
 
+from dataset_cache import DatasetCache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump when the layer text construction changes so persisted indexes are rebuilt
+RETRIEVAL_INDEX_VERSION = 1
+TOP_K_MATCHES = 5
+
 @dataclass
 class VERSSAIDataPoint:
     """Structured data point for VERSSAI intelligence"""
@@ -41,14 +50,18 @@ class VERSSAIRAGGraphEngine:
     Layer 3 (Founder/Startup): Founder-level intelligence
     """
     
-    def __init__(self, dataset_path: str = "./uploads/VERSSAI_Massive_Dataset_Complete.xlsx"):
+    def __init__(self, dataset_path: str = "./uploads/VERSSAI_Massive_Dataset_Complete.xlsx",
+                 index_dir: Optional[str] = None):
         self.dataset_path = dataset_path
+        self.index_dir = Path(index_dir or os.environ.get('VERSSAI_INDEX_DIR', './cache/retrieval_index'))
+        self.dataset_checksum = None
         self.layers = {
             'roof': {
                 'name': 'Research Intelligence Layer',
                 'description': 'Complete academic dataset for ML/DL research',
                 'data_sources': ['references', 'researchers', 'institutions', 'citations'],
                 'knowledge_graph': nx.MultiDiGraph(),
+                'graph_version': 0,
                 'vector_store': {},
                 'metadata': {}
             },
@@ -57,6 +70,7 @@ class VERSSAIRAGGraphEngine:
                 'description': 'Customized investor experience and insights',
                 'data_sources': ['portfolio_analysis', 'market_trends', 'investment_patterns'],
                 'knowledge_graph': nx.MultiDiGraph(),
+                'graph_version': 0,
                 'vector_store': {},
                 'metadata': {}
             },
@@ -65,6 +79,7 @@ class VERSSAIRAGGraphEngine:
                 'description': 'Founder and startup-level intelligence',
                 'data_sources': ['founder_profiles', 'startup_metrics', 'success_patterns'],
                 'knowledge_graph': nx.MultiDiGraph(),
+                'graph_version': 0,
                 'vector_store': {},
                 'metadata': {}
             }
@@ -77,8 +92,13 @@ class VERSSAIRAGGraphEngine:
             'founder': TfidfVectorizer(max_features=2000, stop_words='english')
         }
         
-        # Graph analysis cache
+        # Block-diagonal matrix over all layers for one-product multi-layer queries
+        self.combined_index = None
+        
+        # Graph analysis cache: per-layer metrics index built at initialization,
+        # tagged with the layer's graph_version it was computed from
         self.graph_cache = {}
+        self.betweenness_samples = 200  # Pivot nodes for approximate betweenness
         self.last_updated = None
         
     async def initialize_layers(self):
@@ -97,6 +117,10 @@ class VERSSAIRAGGraphEngine:
             # Build cross-layer connections
             await self._build_cross_layer_connections()
             
+            # Precompute graph metrics so queries only do lookups
+            self.refresh_graph_metrics()
+            self._build_combined_index()
+            
             self.last_updated = datetime.now()
             logger.info("✅ All 3 layers initialized successfully")
             
@@ -125,13 +149,13 @@ class VERSSAIRAGGraphEngine:
         if not Path(self.dataset_path).exists():
             raise FileNotFoundError(f"Dataset not found: {self.dataset_path}")
         
-        # Load all sheets from the Excel file
-        dataset = {}
+        # Load all sheets through the columnar cache (parses the Excel file only when it changed)
         try:
-            with pd.ExcelFile(self.dataset_path) as xls:
-                for sheet_name in xls.sheet_names:
-                    dataset[sheet_name] = pd.read_excel(xls, sheet_name=sheet_name)
-                    logger.info(f"   ✓ Loaded {sheet_name}: {len(dataset[sheet_name])} rows")
+            cache = DatasetCache(self.dataset_path)
+            dataset = await asyncio.to_thread(cache.load)
+            self.dataset_checksum = cache.checksum
+            for sheet_name, df in dataset.items():
+                logger.info(f"   ✓ Loaded {sheet_name}: {len(df)} rows")
             
             return dataset
             
@@ -139,6 +163,124 @@ class VERSSAIRAGGraphEngine:
             logger.error(f"Failed to load dataset: {e}")
             raise
     
+    def _build_layer_index(self, layer_name: str, texts: List[str], ids: List[str]) -> Dict[str, Any]:
+        """
+        Build (or load) a layer's retrieval index
+        
+        Rows are L2-normalized CSR vectors, so cosine similarity is a sparse dot
+        product. The fitted vectorizer and matrix are persisted per dataset
+        checksum and memory-mapped on later starts instead of refitting.
+        """
+        self.combined_index = None
+        index_path = self.index_dir / f"{layer_name}_{self.dataset_checksum}_v{RETRIEVAL_INDEX_VERSION}"
+        
+        if self.dataset_checksum and (index_path / 'meta.json').exists():
+            try:
+                store = self._load_layer_index(layer_name, index_path, ids)
+                if store:
+                    store['texts'] = texts
+                    logger.info(f"   ✓ Loaded persisted {layer_name} retrieval index")
+                    return store
+            except Exception as e:
+                logger.warning(f"Could not load persisted {layer_name} index, refitting: {e}")
+        
+        vectors = self.vectorizers[layer_name].fit_transform(texts)
+        vectors = normalize(vectors, norm='l2', copy=False).astype(np.float32).tocsr()
+        store = {'texts': texts, 'ids': ids, 'vectors': vectors}
+        
+        if self.dataset_checksum:
+            try:
+                self._save_layer_index(layer_name, index_path, store)
+            except Exception as e:
+                logger.warning(f"Could not persist {layer_name} index: {e}")
+        
+        return store
+    
+    def _save_layer_index(self, layer_name: str, index_path: Path, store: Dict[str, Any]):
+        """Persist a layer's fitted vectorizer and CSR arrays"""
+        index_path.mkdir(parents=True, exist_ok=True)
+        vectors = store['vectors']
+        joblib.dump(self.vectorizers[layer_name], index_path / 'vectorizer.joblib')
+        np.save(index_path / 'data.npy', vectors.data)
+        np.save(index_path / 'indices.npy', vectors.indices)
+        np.save(index_path / 'indptr.npy', vectors.indptr)
+        with open(index_path / 'meta.json', 'w') as f:
+            json.dump({
+                'layer': layer_name,
+                'dataset_checksum': self.dataset_checksum,
+                'version': RETRIEVAL_INDEX_VERSION,
+                'shape': list(vectors.shape),
+                'ids': store['ids']
+            }, f)
+    
+    def _load_layer_index(self, layer_name: str, index_path: Path, ids: List[str]) -> Optional[Dict[str, Any]]:
+        """Load a persisted layer index, memory-mapping the CSR arrays"""
+        with open(index_path / 'meta.json') as f:
+            meta = json.load(f)
+        if meta.get('ids') != ids:
+            return None
+        
+        self.vectorizers[layer_name] = joblib.load(index_path / 'vectorizer.joblib')
+        vectors = sp.csr_matrix(
+            (
+                np.load(index_path / 'data.npy', mmap_mode='r'),
+                np.load(index_path / 'indices.npy', mmap_mode='r'),
+                np.load(index_path / 'indptr.npy', mmap_mode='r')
+            ),
+            shape=tuple(meta['shape']),
+            copy=False
+        )
+        return {'ids': ids, 'vectors': vectors}
+    
+    def _build_combined_index(self):
+        """Stack every layer matrix block-diagonally for batched multi-layer scoring"""
+        layer_names = [name for name, layer in self.layers.items() if layer['vector_store']]
+        if not layer_names:
+            self.combined_index = None
+            return
+        
+        offsets = {}
+        row = 0
+        for name in layer_names:
+            rows = self.layers[name]['vector_store']['vectors'].shape[0]
+            offsets[name] = (row, row + rows)
+            row += rows
+        
+        self.combined_index = {
+            'layers': layer_names,
+            'offsets': offsets,
+            'matrix': sp.block_diag(
+                [self.layers[name]['vector_store']['vectors'] for name in layer_names], format='csr'
+            )
+        }
+    
+    def _search_layers(self, query: str, layer_names: List[str], top_k: int = TOP_K_MATCHES) -> Dict[str, List[tuple]]:
+        """Score a query against several layers in one sparse product and keep each layer's top-k"""
+        if self.combined_index is None:
+            self._build_combined_index()
+        if self.combined_index is None:
+            return {}
+        
+        query_vector = sp.hstack(
+            [self.vectorizers[name].transform([query]) for name in self.combined_index['layers']], format='csr'
+        )
+        scores = np.asarray((self.combined_index['matrix'] @ query_vector.T).todense()).ravel()
+        
+        hits = {}
+        for name in layer_names:
+            if name not in self.combined_index['offsets']:
+                continue
+            start, end = self.combined_index['offsets'][name]
+            layer_scores = scores[start:end]
+            if len(layer_scores) > top_k:
+                candidates = np.argpartition(layer_scores, -top_k)[-top_k:]
+            else:
+                candidates = np.arange(len(layer_scores))
+            ranked = candidates[np.argsort(layer_scores[candidates])[::-1]]
+            hits[name] = [(int(idx), float(layer_scores[idx])) for idx in ranked]
+        
+        return hits
+    
     async def _initialize_roof_layer(self, dataset: Dict[str, pd.DataFrame]):
         """Initialize Roof Layer - Complete Research Intelligence"""
         logger.info("🏗️ Building Roof Layer (Research Intelligence)...")
@@ -219,13 +361,9 @@ class VERSSAIRAGGraphEngine:
                 roof_ids.append(node_id)
         
         if roof_texts:
-            roof_vectors = self.vectorizers['roof'].fit_transform(roof_texts)
-            roof_layer['vector_store'] = {
-                'texts': roof_texts,
-                'ids': roof_ids,
-                'vectors': roof_vectors
-            }
+            roof_layer['vector_store'] = self._build_layer_index('roof', roof_texts, roof_ids)
         
+        self.mark_graph_changed('roof')
         logger.info(f"   ✓ Roof Layer: {len(roof_layer['knowledge_graph'].nodes())} nodes, {len(roof_layer['knowledge_graph'].edges())} edges")
     
     async def _initialize_vc_layer(self, dataset: Dict[str, pd.DataFrame]):
@@ -282,13 +420,9 @@ class VERSSAIRAGGraphEngine:
                 vc_ids.append(node_id)
         
         if vc_texts:
-            vc_vectors = self.vectorizers['vc'].fit_transform(vc_texts)
-            vc_layer['vector_store'] = {
-                'texts': vc_texts,
-                'ids': vc_ids,
-                'vectors': vc_vectors
-            }
+            vc_layer['vector_store'] = self._build_layer_index('vc', vc_texts, vc_ids)
         
+        self.mark_graph_changed('vc')
         logger.info(f"   ✓ VC Layer: {len(vc_layer['knowledge_graph'].nodes())} nodes, {len(vc_layer['knowledge_graph'].edges())} edges")
     
     async def _initialize_founder_layer(self, dataset: Dict[str, pd.DataFrame]):
@@ -346,13 +480,9 @@ class VERSSAIRAGGraphEngine:
                 founder_ids.append(node_id)
         
         if founder_texts:
-            founder_vectors = self.vectorizers['founder'].fit_transform(founder_texts)
-            founder_layer['vector_store'] = {
-                'texts': founder_texts,
-                'ids': founder_ids,
-                'vectors': founder_vectors
-            }
+            founder_layer['vector_store'] = self._build_layer_index('founder', founder_texts, founder_ids)
         
+        self.mark_graph_changed('founder')
         logger.info(f"   ✓ Founder Layer: {len(founder_layer['knowledge_graph'].nodes())} nodes, {len(founder_layer['knowledge_graph'].edges())} edges")
     
     async def _build_cross_layer_connections(self):
@@ -407,10 +537,14 @@ class VERSSAIRAGGraphEngine:
             'summary': {}
         }
         
+        # Score all requested layers in one batched sparse product
+        active_layers = [name for name, weight in layer_weights.items() if weight > 0 and name in self.layers]
+        layer_hits = self._search_layers(query, active_layers)
+        
         # Query each layer
         for layer_name, weight in layer_weights.items():
             if weight > 0 and layer_name in self.layers:
-                layer_results = await self._query_single_layer(layer_name, query)
+                layer_results = await self._query_single_layer(layer_name, query, layer_hits.get(layer_name))
                 layer_results['weight'] = weight
                 results['layers'][layer_name] = layer_results
         
@@ -422,28 +556,26 @@ class VERSSAIRAGGraphEngine:
         
         return results
     
-    async def _query_single_layer(self, layer_name: str, query: str) -> Dict[str, Any]:
+    async def _query_single_layer(self, layer_name: str, query: str,
+                                  hits: Optional[List[tuple]] = None) -> Dict[str, Any]:
         """Query a single layer using vector similarity and graph analysis"""
         layer = self.layers[layer_name]
         
         if not layer['vector_store']:
             return {'matches': [], 'graph_insights': [], 'status': 'no_data'}
         
-        # Vector similarity search
-        query_vector = self.vectorizers[layer_name].transform([query])
-        similarities = cosine_similarity(query_vector, layer['vector_store']['vectors']).flatten()
-        
-        # Get top matches
-        top_indices = np.argsort(similarities)[::-1][:5]
+        # Vector similarity search (top-k already ranked when called from query_multi_layer)
+        if hits is None:
+            hits = self._search_layers(query, [layer_name]).get(layer_name, [])
         matches = []
         
-        for idx in top_indices:
-            if similarities[idx] > 0.1:  # Minimum threshold
+        for idx, similarity in hits:
+            if similarity > 0.1:  # Minimum threshold
                 node_id = layer['vector_store']['ids'][idx]
                 node_data = layer['knowledge_graph'].nodes[node_id]
                 matches.append({
                     'id': node_id,
-                    'similarity': float(similarities[idx]),
+                    'similarity': similarity,
                     'data': dict(node_data),
                     'layer': layer_name
                 })
@@ -457,35 +589,79 @@ class VERSSAIRAGGraphEngine:
             'status': 'success'
         }
     
+    def mark_graph_changed(self, layer_name: str):
+        """Record that a layer's knowledge graph was mutated; call after every change to it"""
+        self.layers[layer_name]['graph_version'] += 1
+    
+    def refresh_graph_metrics(self, layer_name: Optional[str] = None):
+        """Rebuild the graph metrics index for one layer (or all layers)"""
+        layer_names = [layer_name] if layer_name else list(self.layers)
+        for name in layer_names:
+            layer = self.layers[name]
+            self.graph_cache[name] = {
+                'version': layer['graph_version'],
+                **self._build_graph_metrics(layer['knowledge_graph'])
+            }
+            logger.info(f"   ✓ Graph metrics indexed for {name}: {len(self.graph_cache[name]['degree'])} nodes")
+    
+    def _build_graph_metrics(self, graph: nx.MultiDiGraph) -> Dict[str, Any]:
+        """Compute degree, PageRank, approximate betweenness and edge-type sets for a graph"""
+        node_count = graph.number_of_nodes()
+        metrics = {
+            'degree': {},
+            'pagerank': {},
+            'betweenness': {},
+            'neighbor_count': {},
+            'edge_types': {}
+        }
+        if node_count == 0:
+            return metrics
+        
+        metrics['degree'] = nx.degree_centrality(graph) if node_count > 1 else {n: 0.0 for n in graph}
+        metrics['neighbor_count'] = {node: len(successors) for node, successors in graph.succ.items()}
+        
+        edge_types: Dict[str, set] = {}
+        for u, _, edge_type in graph.edges(data='type', default='unknown'):
+            edge_types.setdefault(u, set()).add(edge_type)
+        metrics['edge_types'] = {node: sorted(types) for node, types in edge_types.items()}
+        
+        try:
+            metrics['pagerank'] = nx.pagerank(nx.DiGraph(graph))
+        except Exception as e:
+            logger.warning(f"PageRank failed to converge: {e}")
+        
+        try:
+            # Sampled pivots keep betweenness near-linear on large graphs
+            k = min(self.betweenness_samples, node_count)
+            metrics['betweenness'] = nx.betweenness_centrality(graph, k=k, seed=42)
+        except Exception as e:
+            logger.warning(f"Betweenness approximation failed: {e}")
+        
+        return metrics
+    
+    def _get_graph_metrics(self, layer_name: str) -> Dict[str, Any]:
+        """Return the metrics index for a layer, rebuilding it if the graph changed since"""
+        metrics = self.graph_cache.get(layer_name)
+        if metrics is None or metrics['version'] != self.layers[layer_name]['graph_version']:
+            self.refresh_graph_metrics(layer_name)
+            metrics = self.graph_cache[layer_name]
+        return metrics
+    
     async def _analyze_graph_patterns(self, layer_name: str, node_ids: List[str]) -> List[Dict[str, Any]]:
-        """Analyze graph patterns for given nodes"""
-        graph = self.layers[layer_name]['knowledge_graph']
+        """Analyze graph patterns for given nodes using the precomputed metrics index"""
+        metrics = self._get_graph_metrics(layer_name)
         insights = []
         
         for node_id in node_ids:
-            if node_id in graph:
-                # Get node centrality measures
-                try:
-                    degree_centrality = nx.degree_centrality(graph)[node_id]
-                    neighbors = list(graph.neighbors(node_id))
-                    
-                    insights.append({
-                        'node_id': node_id,
-                        'degree_centrality': degree_centrality,
-                        'neighbor_count': len(neighbors),
-                        'connection_types': list(set([
-                            graph.edges[node_id, neighbor].get('type', 'unknown') 
-                            for neighbor in neighbors if graph.has_edge(node_id, neighbor)
-                        ]))
-                    })
-                except:
-                    # Handle disconnected graphs
-                    insights.append({
-                        'node_id': node_id,
-                        'degree_centrality': 0,
-                        'neighbor_count': 0,
-                        'connection_types': []
-                    })
+            if node_id in metrics['degree']:
+                insights.append({
+                    'node_id': node_id,
+                    'degree_centrality': metrics['degree'][node_id],
+                    'pagerank': metrics['pagerank'].get(node_id, 0.0),
+                    'betweenness_centrality': metrics['betweenness'].get(node_id, 0.0),
+                    'neighbor_count': metrics['neighbor_count'].get(node_id, 0),
+                    'connection_types': metrics['edge_types'].get(node_id, [])
+                })
         
         return insights
     
@@ -89,6 +89,7 @@ async def lifespan(app: FastAPI):
     
     # Cleanup on shutdown
     logger.info("🛑 Shutting down Enhanced VERSSAI Server...")
+    await enhanced_mcp_service.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -152,7 +153,8 @@ async def health_check():
                 "mcp_service": {
                     "status": "active",
                     "active_connections": mcp_connections,
-                    "active_executions": mcp_executions
+                    "active_executions": mcp_executions,
+                    "broadcast": enhanced_mcp_service.get_broadcast_metrics()
                 }
             }
         }
@@ -219,6 +221,31 @@ async def trigger_workflow(
         logger.error(f"Error triggering workflow: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/v1/n8n/executions/{execution_id}/complete")
+async def n8n_execution_complete(execution_id: str, request: Request):
+    """Completion callback posted by n8n workflows (replaces status polling)"""
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = {}
+    
+    try:
+        resolved = enhanced_mcp_service.resolve_n8n_completion(
+            execution_id,
+            payload,
+            token=request.headers.get("X-N8N-Callback-Token")
+        )
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Execution not found")
+    
+    return {
+        "execution_id": execution_id,
+        "resolved": resolved,
+        "timestamp": datetime.now().isoformat()
+    }
+
 @app.post("/api/v1/rag/query")
 async def rag_query(
     request: RAGQueryRequest,
@@ -4,6 +4,9 @@ This provides a fallback storage mechanism for deck uploads and analysis results
 """
 import json
 import uuid
+import sqlite3
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
@@ -29,6 +32,120 @@ class FileBasedStorage:
         for path in [self.decks_path, self.extractions_path, self.signals_path, 
                      self.workflows_path, self.data_rooms_path, self.dd_reports_path]:
             path.mkdir(exist_ok=True)
+        
+        # Secondary index so listings never parse unrelated JSON files
+        self._index_lock = threading.Lock()
+        self.index_conn = sqlite3.connect(str(self.storage_path / "index.sqlite3"), check_same_thread=False)
+        self._create_index_tables()
+        self.sync_index()
+    
+    # Listing Index Methods
+    
+    def _create_index_tables(self):
+        """Create the listing index tables"""
+        with self._index_lock, self.index_conn:
+            self.index_conn.executescript('''
+                CREATE TABLE IF NOT EXISTS data_rooms_index (
+                    data_room_id TEXT PRIMARY KEY,
+                    company_name TEXT,
+                    status TEXT,
+                    total_files INTEGER,
+                    upload_timestamp TEXT NOT NULL DEFAULT '',
+                    uploaded_by TEXT,
+                    updated_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_data_rooms_upload
+                    ON data_rooms_index (upload_timestamp DESC);
+                CREATE INDEX IF NOT EXISTS idx_data_rooms_status_upload
+                    ON data_rooms_index (status, upload_timestamp DESC);
+                
+                CREATE TABLE IF NOT EXISTS decks_index (
+                    deck_id TEXT PRIMARY KEY,
+                    status TEXT,
+                    modified_at REAL NOT NULL,
+                    updated_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_decks_modified
+                    ON decks_index (modified_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_decks_status_modified
+                    ON decks_index (status, modified_at DESC);
+            ''')
+    
+    def _index_data_room(self, data_room: Dict[str, Any]):
+        """Insert or update a data room's listing row"""
+        with self._index_lock, self.index_conn:
+            self.index_conn.execute(
+                '''INSERT OR REPLACE INTO data_rooms_index
+                   (data_room_id, company_name, status, total_files, upload_timestamp, uploaded_by, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                (
+                    data_room.get('data_room_id'),
+                    data_room.get('company_name'),
+                    data_room.get('status'),
+                    data_room.get('total_files', 0),
+                    data_room.get('upload_timestamp') or '',
+                    data_room.get('uploaded_by'),
+                    data_room.get('updated_at')
+                )
+            )
+    
+    def _index_deck(self, deck_data: Dict[str, Any], modified_at: Optional[float] = None):
+        """Insert or update a deck's listing row (modified_at mirrors the file mtime)"""
+        with self._index_lock, self.index_conn:
+            self.index_conn.execute(
+                '''INSERT OR REPLACE INTO decks_index (deck_id, status, modified_at, updated_at)
+                   VALUES (?, ?, ?, ?)''',
+                (
+                    deck_data.get('deck_id'),
+                    deck_data.get('status'),
+                    modified_at if modified_at is not None else time.time(),
+                    deck_data.get('updated_at')
+                )
+            )
+    
+    def sync_index(self):
+        """
+        Reconcile the listing index with the JSON files on disk
+        
+        Only files missing from the index are parsed; rows whose file was
+        removed are dropped. Runs at startup to pick up files written before
+        the index existed or by other tools.
+        """
+        try:
+            indexed_rooms = {row[0] for row in self.index_conn.execute('SELECT data_room_id FROM data_rooms_index')}
+            room_files = {f.stem: f for f in self.data_rooms_path.glob("*.json")}
+            for data_room_id in room_files.keys() - indexed_rooms:
+                try:
+                    with open(room_files[data_room_id], 'r') as f:
+                        data_room = json.load(f)
+                    data_room.setdefault('data_room_id', data_room_id)
+                    self._index_data_room(data_room)
+                except Exception as e:
+                    logger.error(f"Error indexing data room file {room_files[data_room_id]}: {e}")
+            
+            indexed_decks = {row[0] for row in self.index_conn.execute('SELECT deck_id FROM decks_index')}
+            deck_files = {f.stem: f for f in self.decks_path.glob("*.json")}
+            for deck_id in deck_files.keys() - indexed_decks:
+                try:
+                    with open(deck_files[deck_id], 'r') as f:
+                        deck_data = json.load(f)
+                    deck_data.setdefault('deck_id', deck_id)
+                    self._index_deck(deck_data, deck_files[deck_id].stat().st_mtime)
+                except Exception as e:
+                    logger.error(f"Error indexing deck file {deck_files[deck_id]}: {e}")
+            
+            with self._index_lock, self.index_conn:
+                self.index_conn.executemany(
+                    'DELETE FROM data_rooms_index WHERE data_room_id = ?',
+                    [(i,) for i in indexed_rooms - room_files.keys()]
+                )
+                self.index_conn.executemany(
+                    'DELETE FROM decks_index WHERE deck_id = ?',
+                    [(i,) for i in indexed_decks - deck_files.keys()]
+                )
+            
+        except Exception as e:
+            logger.error(f"Error syncing storage index: {e}")
     
     def save_deck(self, deck_data: Dict[str, Any]) -> str:
         """Save deck information to file"""
@@ -42,6 +159,7 @@ class FileBasedStorage:
             deck_file = self.decks_path / f"{deck_id}.json"
             with open(deck_file, 'w') as f:
                 json.dump(deck_data, f, indent=2, default=str)
+            self._index_deck(deck_data)
             
             logger.info(f"Saved deck {deck_id} to file storage")
             return deck_id
@@ -73,6 +191,7 @@ class FileBasedStorage:
                 deck_file = self.decks_path / f"{deck_id}.json"
                 with open(deck_file, 'w') as f:
                     json.dump(deck_data, f, indent=2, default=str)
+                self._index_deck(deck_data)
                 
                 return True
             return False
@@ -92,6 +211,7 @@ class FileBasedStorage:
             data_room_file = self.data_rooms_path / f"{data_room_id}.json"
             with open(data_room_file, 'w') as f:
                 json.dump(data_room_data, f, indent=2, default=str)
+            self._index_data_room(data_room_data)
             
             logger.info(f"Saved data room {data_room_id} to file storage")
             return data_room_id
@@ -117,39 +237,30 @@ class FileBasedStorage:
                           status: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all data rooms with pagination and optional status filtering"""
         try:
-            data_rooms = []
-            
-            for data_room_file in self.data_rooms_path.glob("*.json"):
-                try:
-                    with open(data_room_file, 'r') as f:
-                        data_room = json.load(f)
-                        
-                    # Filter by status if provided
-                    if status and data_room.get('status') != status:
-                        continue
-                        
-                    # Add summary info only
-                    data_room_summary = {
-                        'data_room_id': data_room.get('data_room_id'),
-                        'company_name': data_room.get('company_name'),
-                        'status': data_room.get('status'),
-                        'total_files': data_room.get('total_files', 0),
-                        'upload_timestamp': data_room.get('upload_timestamp'),
-                        'uploaded_by': data_room.get('uploaded_by')
-                    }
-                    data_rooms.append(data_room_summary)
-                    
-                except Exception as e:
-                    logger.error(f"Error reading data room file {data_room_file}: {e}")
-                    continue
-            
-            # Sort by upload timestamp (newest first)
-            data_rooms.sort(key=lambda x: x.get('upload_timestamp', ''), reverse=True)
-            
-            # Apply pagination
-            start = offset
-            end = offset + limit
-            return data_rooms[start:end]
+            # Indexed range scan over (status, upload_timestamp); no JSON files are read
+            query = '''SELECT data_room_id, company_name, status, total_files, upload_timestamp, uploaded_by
+                       FROM data_rooms_index'''
+            params: List[Any] = []
+            if status:
+                query += ' WHERE status = ?'
+                params.append(status)
+            query += ' ORDER BY upload_timestamp DESC LIMIT ? OFFSET ?'
+            params.extend([limit, offset])
+            
+            with self._index_lock:
+                rows = self.index_conn.execute(query, params).fetchall()
+            
+            return [
+                {
+                    'data_room_id': row[0],
+                    'company_name': row[1],
+                    'status': row[2],
+                    'total_files': row[3],
+                    'upload_timestamp': row[4] or None,
+                    'uploaded_by': row[5]
+                }
+                for row in rows
+            ]
             
         except Exception as e:
             logger.error(f"Error getting all data rooms: {e}")
@@ -168,6 +279,7 @@ class FileBasedStorage:
                 
                 with open(data_room_file, 'w') as f:
                     json.dump(data_room, f, indent=2, default=str)
+                self._index_data_room(data_room)
                 
                 logger.info(f"Updated data room {data_room_id} status to {status}")
             
@@ -257,24 +369,25 @@ class FileBasedStorage:
     def get_all_decks(self, limit: int = 50, offset: int = 0, status: str = None) -> List[Dict[str, Any]]:
         """Get all decks with pagination and filtering"""
         try:
-            decks = []
+            # Page through the index (newest first) and only read the files on this page
+            query = 'SELECT deck_id FROM decks_index'
+            params: List[Any] = []
+            if status is not None:
+                query += ' WHERE status = ?'
+                params.append(status)
+            query += ' ORDER BY modified_at DESC LIMIT ? OFFSET ?'
+            params.extend([limit, offset])
+            
+            with self._index_lock:
+                deck_ids = [row[0] for row in self.index_conn.execute(query, params).fetchall()]
             
-            for deck_file in sorted(self.decks_path.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True):
-                try:
-                    with open(deck_file, 'r') as f:
-                        deck_data = json.load(f)
-                    
-                    if status is None or deck_data.get('status') == status:
-                        decks.append(deck_data)
-                        
-                except Exception as e:
-                    logger.error(f"Error reading deck file {deck_file}: {e}")
-                    continue
+            decks = []
+            for deck_id in deck_ids:
+                deck_data = self.get_deck(deck_id)
+                if deck_data is not None:
+                    decks.append(deck_data)
             
-            # Apply pagination
-            start_idx = offset
-            end_idx = offset + limit
-            return decks[start_idx:end_idx]
+            return decks
             
         except Exception as e:
             logger.error(f"Error getting all decks: {e}")
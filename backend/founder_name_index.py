@@ -0,0 +1,136 @@
+"""
+VERSSAI Founder Name Index
+Prebuilt fuzzy index over researcher names for founder validation
+
+Names are normalized (accents, case and punctuation removed) and indexed by
+whole tokens and padded character trigrams. A lookup scores every candidate
+that shares a trigram with the query in one numpy pass, so spelling variants
+("Jon Smith" for "John Smith") and partial names ("Smith") are found without
+scanning the researchers table.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MIN_SCORE = 0.55
+# A query whose tokens all appear in a name (e.g. a surname) scores just below an exact match
+TOKEN_MATCH_WEIGHT = 0.9
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name: Any) -> str:
+    """Lowercase ASCII name with punctuation collapsed to single spaces"""
+    if not isinstance(name, str):
+        return ''
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub(' ', ascii_name.lower()).strip()
+
+
+def name_trigrams(normalized: str) -> set:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class NameMatch:
+    label: Any          # index label of the matched row
+    position: int       # row position in the indexed Series
+    name: str
+    score: float
+
+
+class FounderNameIndex:
+    """Token and trigram index over a Series of names"""
+
+    def __init__(self, names: pd.Series):
+        self.labels = names.index
+        self.names = names.fillna('').astype(str).tolist()
+
+        normalized = [normalize_name(name) for name in self.names]
+        self._exact: Dict[str, int] = {}
+        token_postings: Dict[str, List[int]] = {}
+        trigram_postings: Dict[str, List[int]] = {}
+        trigram_counts = np.zeros(len(normalized), dtype=np.float64)
+
+        for position, name in enumerate(normalized):
+            if not name:
+                continue
+            self._exact.setdefault(name, position)
+            for token in set(name.split()):
+                token_postings.setdefault(token, []).append(position)
+            trigrams = name_trigrams(name)
+            trigram_counts[position] = len(trigrams)
+            for trigram in trigrams:
+                trigram_postings.setdefault(trigram, []).append(position)
+
+        self._tokens = {token: np.array(rows, dtype=np.int32) for token, rows in token_postings.items()}
+        self._trigrams = {trigram: np.array(rows, dtype=np.int32) for trigram, rows in trigram_postings.items()}
+        self._trigram_counts = trigram_counts
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, name: str, limit: int = 5, min_score: float = DEFAULT_MIN_SCORE) -> List[NameMatch]:
+        """
+        Ranked fuzzy matches for one name
+
+        Score is 1.0 for an exact normalized match, otherwise the larger of the
+        trigram Jaccard similarity and TOKEN_MATCH_WEIGHT x the share of query
+        tokens found in the candidate name.
+        """
+        query = normalize_name(name)
+        if not query:
+            return []
+
+        exact = self._exact.get(query)
+        size = len(self.names)
+
+        trigrams = name_trigrams(query)
+        postings = [self._trigrams[t] for t in trigrams if t in self._trigrams]
+        if not postings and exact is None:
+            return []
+
+        shared = np.bincount(np.concatenate(postings), minlength=size) if postings else np.zeros(size)
+        candidates = np.flatnonzero(shared)
+        jaccard = shared[candidates] / (len(trigrams) + self._trigram_counts[candidates] - shared[candidates])
+
+        query_tokens = set(query.split())
+        token_hits = np.zeros(size)
+        for token in query_tokens:
+            rows = self._tokens.get(token)
+            if rows is not None:
+                token_hits[rows] += 1
+        scores = np.maximum(jaccard, TOKEN_MATCH_WEIGHT * token_hits[candidates] / len(query_tokens))
+
+        if exact is not None:
+            scores[candidates == exact] = 1.0
+
+        keep = scores >= min_score
+        candidates, scores = candidates[keep], scores[keep]
+        # Highest score first; ties keep table order, like the first str.contains hit
+        order = np.lexsort((candidates, -scores))[:limit]
+
+        return [
+            NameMatch(self.labels[position], int(position), self.names[position], round(float(score), 3))
+            for position, score in zip(candidates[order], scores[order])
+        ]
+
+    def best_match(self, name: str, min_score: float = DEFAULT_MIN_SCORE) -> Optional[NameMatch]:
+        matches = self.lookup(name, limit=1, min_score=min_score)
+        return matches[0] if matches else None
+
+    def lookup_batch(self, names: Iterable[str], limit: int = 1,
+                     min_score: float = DEFAULT_MIN_SCORE) -> List[List[NameMatch]]:
+        """Matches for many names; repeated names are looked up once"""
+        seen: Dict[str, List[NameMatch]] = {}
+        results = []
+        for name in names:
+            if name not in seen:
+                seen[name] = self.lookup(name, limit=limit, min_score=min_score)
+            results.append(seen[name])
+        return results
@@ -206,7 +206,7 @@ Historical Patterns:
 
 Please analyze the decision quality, predict outcomes, and provide insights with valid JSON only."""
             
-            response = self.call_ai(analysis_prompt, self.system_prompt, temperature=0.0)
+            response = await self.acall_ai(analysis_prompt, self.system_prompt, temperature=0.0)
             
             # Parse AI response
             analysis_data = self._parse_decision_analysis(response)
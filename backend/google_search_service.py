@@ -3,18 +3,34 @@ Google Custom Search API Service for VERSSAI VC Intelligence Platform
 Enhanced research capabilities for founder and company intelligence
 """
 import os
+import time
 import asyncio
 import httpx
 import json
 import logging
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import hashlib
 from urllib.parse import quote_plus
 
+from persistent_cache import PersistentCache
+
 logger = logging.getLogger(__name__)
 
+# Custom Search allows 100 queries/day on the free tier; paid keys raise this
+GOOGLE_SEARCH_DAILY_QUOTA = int(os.environ.get('GOOGLE_SEARCH_DAILY_QUOTA', '10000'))
+GOOGLE_SEARCH_QPS = float(os.environ.get('GOOGLE_SEARCH_QPS', '5'))
+GOOGLE_SEARCH_MEMORY_CACHE_SIZE = int(os.environ.get('GOOGLE_SEARCH_MEMORY_CACHE_SIZE', '512'))
+# Seconds a multi-query search waits before returning whatever has completed
+GOOGLE_SEARCH_DEADLINE = float(os.environ.get('GOOGLE_SEARCH_DEADLINE', '8'))
+# The API returns at most 10 results per page and serves at most 100 results per query
+GOOGLE_SEARCH_PAGE_SIZE = 10
+GOOGLE_SEARCH_MAX_RESULTS = 100
+# Daily quota counters outlive their UTC day so a late worker still sees the count
+QUOTA_COUNTER_TTL = 2 * 24 * 3600
+
 @dataclass
 class SearchResult:
     title: str
@@ -27,6 +43,63 @@ class SearchResult:
     image_url: Optional[str] = None
     page_map: Optional[Dict[str, Any]] = None
 
+class TokenBucket:
+    """
+    Async token bucket limiting request rate, with a daily request quota
+    
+    The rate is paced per process. The daily quota is counted in `quota_store`,
+    keyed by UTC date, so every worker sharing the store draws from one quota
+    and the count survives restarts.
+    """
+    
+    def __init__(self, rate: float, capacity: float, daily_quota: int, quota_store: PersistentCache):
+        self.rate = rate
+        self.capacity = capacity
+        self.daily_quota = daily_quota
+        self.quota_store = quota_store
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    @staticmethod
+    def _quota_key() -> str:
+        return f"quota_used:{datetime.utcnow().date().isoformat()}"
+    
+    def quota_remaining(self) -> int:
+        quota_used = self.quota_store.get(self._quota_key()) or 0
+        return max(0, self.daily_quota - quota_used)
+    
+    def exhaust_quota(self):
+        """Treat today's quota as spent (the API reported it exceeded)"""
+        self.quota_store.set(self._quota_key(), self.daily_quota, ttl=QUOTA_COUNTER_TTL)
+    
+    def pause(self, seconds: float):
+        """Stop issuing tokens for a while, e.g. after a 429"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+    
+    async def acquire(self) -> bool:
+        """Wait for a token; returns False when the daily quota is used up"""
+        async with self._lock:
+            if self.quota_remaining() <= 0:
+                return False
+            
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    # Another worker may have used the last of the quota meanwhile
+                    return self.quota_store.increment(
+                        self._quota_key(), limit=self.daily_quota, ttl=QUOTA_COUNTER_TTL
+                    ) is not None
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 @dataclass
 class SearchResponse:
     query: str
@@ -44,9 +117,21 @@ class GoogleSearchService:
         self.search_engine_id = os.environ.get('GOOGLE_SEARCH_ENGINE_ID')
         self.base_url = "https://www.googleapis.com/customsearch/v1"
         self.session = httpx.AsyncClient(timeout=30)
-        self.cache = {}  # Simple in-memory cache
         self.cache_ttl = 3600  # 1 hour
         
+        # Bounded in-memory LRU in front of a SQLite cache shared by all workers
+        self.cache = OrderedDict()
+        self.cache_max_size = GOOGLE_SEARCH_MEMORY_CACHE_SIZE
+        self.persistent_cache = PersistentCache('google_search', default_ttl=self.cache_ttl)
+        
+        # Single-flight: concurrent identical searches share one API request
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.rate_limiter = TokenBucket(
+            GOOGLE_SEARCH_QPS, max(1.0, GOOGLE_SEARCH_QPS), GOOGLE_SEARCH_DAILY_QUOTA,
+            PersistentCache('google_search_quota')
+        )
+        self.stats = {'memory_hits': 0, 'persistent_hits': 0, 'coalesced': 0, 'api_calls': 0, 'quota_rejections': 0}
+        
         if not self.api_key:
             logger.warning("GOOGLE_API_KEY not configured - search functionality will be limited")
     
@@ -55,9 +140,15 @@ class GoogleSearchService:
         founder_name: str,
         company_name: Optional[str] = None,
         include_social_media: bool = True,
-        include_news: bool = True
+        include_news: bool = True,
+        deadline: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Search for comprehensive founder information"""
+        """
+        Search for comprehensive founder information
+        
+        Query variants run concurrently; after `deadline` seconds the categories
+        that have not finished are reported as timed out.
+        """
         
         if not self.api_key:
             return self._create_mock_founder_data(founder_name, company_name)
@@ -90,12 +181,7 @@ class GoogleSearchService:
                 queries.append(("news", news_query))
             
             # Execute searches concurrently
-            search_tasks = [
-                self._execute_search(query_type, query)
-                for query_type, query in queries
-            ]
-            
-            search_results = await asyncio.gather(*search_tasks, return_exceptions=True)
+            search_results, query_timings = await self._fan_out(queries, deadline)
             
             # Compile results
             compiled_results = {
@@ -106,7 +192,9 @@ class GoogleSearchService:
                 "consolidated_results": [],
                 "key_insights": [],
                 "social_profiles": [],
-                "recent_news": []
+                "recent_news": [],
+                "query_timings": query_timings,
+                "partial": any(timing["timed_out"] for timing in query_timings.values())
             }
             
             for (query_type, _), result in zip(queries, search_results):
@@ -133,9 +221,15 @@ class GoogleSearchService:
         industry: Optional[str] = None,
         include_financials: bool = True,
         include_news: bool = True,
-        include_competitors: bool = True
+        include_competitors: bool = True,
+        deadline: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Search for comprehensive company intelligence"""
+        """
+        Search for comprehensive company intelligence
+        
+        Query variants run concurrently; after `deadline` seconds the categories
+        that have not finished are reported as timed out.
+        """
         
         if not self.api_key:
             return self._create_mock_company_data(company_name, industry)
@@ -170,12 +264,7 @@ class GoogleSearchService:
                 queries.append(("industry", industry_query))
             
             # Execute searches concurrently
-            search_tasks = [
-                self._execute_search(query_type, query, date_restrict="y1")  # Last year
-                for query_type, query in queries
-            ]
-            
-            search_results = await asyncio.gather(*search_tasks, return_exceptions=True)
+            search_results, query_timings = await self._fan_out(queries, deadline, date_restrict="y1")  # Last year
             
             # Compile comprehensive company intelligence
             intelligence_report = {
@@ -187,7 +276,9 @@ class GoogleSearchService:
                 "all_sources": [],
                 "funding_information": [],
                 "recent_developments": [],
-                "competitive_analysis": []
+                "competitive_analysis": [],
+                "query_timings": query_timings,
+                "partial": any(timing["timed_out"] for timing in query_timings.values())
             }
             
             for (query_type, _), result in zip(queries, search_results):
@@ -208,6 +299,57 @@ class GoogleSearchService:
             logger.error(f"Error in company intelligence search: {e}")
             return self._create_mock_company_data(company_name, industry)
     
+    async def _fan_out(
+        self,
+        queries: List[tuple],
+        deadline: Optional[float] = None,
+        **search_params
+    ) -> tuple:
+        """
+        Run (query_type, query) searches concurrently under a shared deadline
+        
+        Returns the results in query order, with a timeout error in place of any
+        search still running at the deadline, plus per-query timing. Searches
+        that miss the deadline keep running in the background so their results
+        land in the cache for the next call.
+        """
+        deadline = GOOGLE_SEARCH_DEADLINE if deadline is None else deadline
+        started = time.perf_counter()
+        finished_at = {}
+        
+        async def timed_search(query_type: str, query: str) -> Dict[str, Any]:
+            try:
+                return await self._execute_search(query_type, query, **search_params)
+            finally:
+                finished_at[query_type] = time.perf_counter()
+        
+        tasks = [asyncio.ensure_future(timed_search(query_type, query)) for query_type, query in queries]
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        
+        results = []
+        timings = {}
+        for (query_type, _), task in zip(queries, tasks):
+            if task in pending:
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                logger.warning(f"Search '{query_type}' missed the {deadline}s deadline")
+                results.append(asyncio.TimeoutError(f"Search exceeded {deadline}s deadline"))
+                timings[query_type] = {"elapsed_ms": round(deadline * 1000, 1), "timed_out": True}
+            elif task.cancelled():
+                logger.warning(f"Search '{query_type}' was cancelled")
+                results.append(RuntimeError(f"Search '{query_type}' was cancelled"))
+                timings[query_type] = {
+                    "elapsed_ms": round((finished_at.get(query_type, time.perf_counter()) - started) * 1000, 1),
+                    "timed_out": False
+                }
+            else:
+                results.append(task.exception() or task.result())
+                timings[query_type] = {
+                    "elapsed_ms": round((finished_at[query_type] - started) * 1000, 1),
+                    "timed_out": False
+                }
+        
+        return results, timings
+    
     async def _execute_search(
         self,
         search_type: str,
@@ -215,23 +357,93 @@ class GoogleSearchService:
         max_results: int = 10,
         **search_params
     ) -> Dict[str, Any]:
-        """Execute search with caching support"""
+        """Execute search with caching and request coalescing"""
+        
+        cache_key = hashlib.md5(f"{search_type}_{query}_{max_results}_{json.dumps(search_params, sort_keys=True)}".encode()).hexdigest()
+        
+        # Check the in-memory cache, then the shared persistent cache
+        cached = self._recall(cache_key)
+        if cached is not None:
+            self.stats['memory_hits'] += 1
+            logger.info(f"Cache hit for query: {query[:50]}...")
+            return cached
         
-        cache_key = hashlib.md5(f"{search_type}_{query}_{json.dumps(search_params, sort_keys=True)}".encode()).hexdigest()
+        cached = self.persistent_cache.get(cache_key)
+        if cached is not None:
+            self.stats['persistent_hits'] += 1
+            logger.info(f"Persistent cache hit for query: {query[:50]}...")
+            self._remember(cache_key, cached)
+            return cached
+        
+        # Join an identical search that is already in flight, or start one. The
+        # fetch runs in its own task so a cancelled caller leaves it running for
+        # the others; each caller only stops waiting on it.
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            self.stats['coalesced'] += 1
+        else:
+            inflight = asyncio.ensure_future(
+                self._fetch_search(cache_key, search_type, query, max_results, **search_params)
+            )
+            self._inflight[cache_key] = inflight
+            inflight.add_done_callback(lambda task: self._finish_inflight(cache_key, task))
+        
+        return await asyncio.shield(inflight)
+    
+    def _finish_inflight(self, cache_key: str, task: asyncio.Task):
+        """Forget a finished in-flight search"""
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        # Retrieve the exception so a search nobody waits for any more does not log a warning
+        if not task.cancelled():
+            task.exception()
+    
+    async def _fetch_page(self, query: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fetch one result page; returns None when the daily quota is used up"""
+        if not await self.rate_limiter.acquire():
+            return None
         
-        # Check cache first
-        if cache_key in self.cache:
-            cached_item = self.cache[cache_key]
-            if datetime.now() < cached_item["expiry"]:
-                logger.info(f"Cache hit for query: {query[:50]}...")
-                return cached_item["data"]
+        self.stats['api_calls'] += 1
+        response = await self.session.get(self.base_url, params=params)
+        response.raise_for_status()
+        return response.json()
+    
+    def _recall(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up the in-memory LRU, dropping the entry if it expired"""
+        cached_item = self.cache.get(cache_key)
+        if cached_item is None:
+            return None
+        if datetime.now() >= cached_item["expiry"]:
+            del self.cache[cache_key]
+            return None
+        self.cache.move_to_end(cache_key)
+        return cached_item["data"]
+    
+    def _remember(self, cache_key: str, data: Dict[str, Any]):
+        """Store in the in-memory LRU, evicting the least recently used entries"""
+        self.cache[cache_key] = {
+            "data": data,
+            "expiry": datetime.now() + timedelta(seconds=self.cache_ttl)
+        }
+        self.cache.move_to_end(cache_key)
+        while len(self.cache) > self.cache_max_size:
+            self.cache.popitem(last=False)
+    
+    async def _fetch_search(
+        self,
+        cache_key: str,
+        search_type: str,
+        query: str,
+        max_results: int = 10,
+        **search_params
+    ) -> Dict[str, Any]:
+        """Call the Custom Search API and cache successful results"""
         
         try:
             params = {
                 "key": self.api_key,
                 "cx": self.search_engine_id or "temp_engine_id",  # Will need to be created
                 "q": query,
-                "num": min(max_results, 10),  # Max 10 per request
                 "lr": "lang_en",
                 "safe": "medium"
             }
@@ -241,19 +453,33 @@ class GoogleSearchService:
                 if value:
                     params[param] = value
             
+            # Fetch every page concurrently; each page costs one query of quota
+            max_results = max(1, min(max_results, GOOGLE_SEARCH_MAX_RESULTS))
+            page_starts = range(1, max_results + 1, GOOGLE_SEARCH_PAGE_SIZE)
+            
             logger.info(f"Executing Google search: {query}")
             start_time = datetime.now()
             
-            response = await self.session.get(self.base_url, params=params)
-            response.raise_for_status()
+            pages = await asyncio.gather(*[
+                self._fetch_page(query, {
+                    **params,
+                    "start": page_start,
+                    "num": min(GOOGLE_SEARCH_PAGE_SIZE, max_results - page_start + 1)
+                })
+                for page_start in page_starts
+            ])
             
             search_time = (datetime.now() - start_time).total_seconds()
-            data = response.json()
+            if any(page is None for page in pages):
+                self.stats['quota_rejections'] += 1
+                logger.warning(f"Daily Google search quota exhausted - skipping: {query[:50]}...")
+                return {"error": "API quota exceeded", "results": []}
+            data = pages[0]
             
             # Parse search results
             results = []
-            if "items" in data:
-                for item in data["items"]:
+            for page in pages:
+                for item in page.get("items", []):
                     result = {
                         "title": item.get("title", ""),
                         "url": item.get("link", ""),
@@ -277,15 +503,20 @@ class GoogleSearchService:
             }
             
             # Cache results
-            self.cache[cache_key] = {
-                "data": result_data,
-                "expiry": datetime.now() + timedelta(seconds=self.cache_ttl)
-            }
+            self._remember(cache_key, result_data)
+            self.persistent_cache.set(cache_key, result_data)
             
             return result_data
             
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 403:
+            if e.response.status_code == 429:
+                retry_after = float(e.response.headers.get("Retry-After", "30"))
+                self.rate_limiter.pause(retry_after)
+                logger.error(f"Google API rate limited - pausing requests for {retry_after}s")
+                return {"error": "API rate limited", "results": []}
+            elif e.response.status_code == 403:
+                if "limitExceeded" in e.response.text or "quota" in e.response.text.lower():
+                    self.rate_limiter.exhaust_quota()
                 logger.error("Google API quota exceeded or invalid API key")
                 return {"error": "API quota exceeded", "results": []}
             elif e.response.status_code == 400:
@@ -298,6 +529,16 @@ class GoogleSearchService:
             logger.error(f"Search execution failed: {str(e)}")
             return {"error": str(e), "results": []}
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Cache, coalescing and quota statistics"""
+        return {
+            **self.stats,
+            'memory_cache_entries': len(self.cache),
+            'inflight_requests': len(self._inflight),
+            'daily_quota_remaining': self.rate_limiter.quota_remaining(),
+            'persistent_cache': self.persistent_cache.get_stats()
+        }
+    
     def _calculate_relevance_score(self, result: Dict[str, Any], query: str) -> float:
         """Calculate relevance score for search result"""
         score = 0.0
@@ -3,13 +3,16 @@ LangGraph + LangSmith Workflow Orchestrator for VERSSAI VC Intelligence Platform
 Provides robust, observable, and trustworthy AI workflow execution with comprehensive reporting
 """
 import os
+import time
 import asyncio
 import logging
 from typing import TypedDict, Annotated, Sequence, Dict, Any, Optional, List
 from datetime import datetime, timedelta
 import json
 import uuid
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain_core.prompts import PromptTemplate
@@ -26,6 +29,17 @@ os.environ["LANGCHAIN_API_KEY"] = os.environ.get("OPENAI_API_KEY", "fallback_key
 
 logger = logging.getLogger(__name__)
 
+# Threads for synchronous (CPU-bound) nodes so they never block the event loop
+LANGGRAPH_NODE_WORKERS = int(os.environ.get('LANGGRAPH_NODE_WORKERS', '4'))
+
+def _merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """State reducer: merge updates from nodes that ran in the same step"""
+    return {**(left or {}), **(right or {})}
+
+def _last_value(left: Any, right: Any) -> Any:
+    """State reducer: keep the most recent write"""
+    return right
+
 @dataclass
 class WorkflowMetrics:
     """Comprehensive workflow execution metrics"""
@@ -41,6 +55,7 @@ class WorkflowMetrics:
     confidence_score: float = 0.0
     quality_score: float = 0.0
     cost_estimate: float = 0.0
+    node_latencies: Dict[str, List[float]] = field(default_factory=dict)  # Seconds per node execution
 
 class VCWorkflowState(TypedDict):
     """Enhanced state for VC intelligence workflow with comprehensive tracking"""
@@ -56,11 +71,12 @@ class VCWorkflowState(TypedDict):
     social_research_results: Dict[str, Any]
     ai_analysis_results: Dict[str, Any]
     
-    # Workflow control
-    current_step: str
-    next_step: str
-    execution_path: List[str]
-    error_log: List[str]
+    # Workflow control (reducers let parallel branches update these in the same step)
+    current_step: Annotated[str, _last_value]
+    next_step: Annotated[str, _last_value]
+    execution_path: Annotated[List[str], operator.add]
+    error_log: Annotated[List[str], operator.add]
+    workflow_status: str
     
     # Quality metrics
     data_quality_score: float
@@ -70,7 +86,7 @@ class VCWorkflowState(TypedDict):
     # Execution metadata
     workflow_id: str
     execution_start: datetime
-    step_timings: Dict[str, float]
+    step_timings: Annotated[Dict[str, float], _merge_dicts]
     
     # Final outputs
     investment_recommendation: str
@@ -96,6 +112,9 @@ class LangGraphVCOrchestrator:
         # Initialize metrics storage
         self.execution_metrics: Dict[str, WorkflowMetrics] = {}
         
+        # Executor for synchronous nodes
+        self.node_executor = ThreadPoolExecutor(max_workers=LANGGRAPH_NODE_WORKERS, thread_name_prefix="langgraph-node")
+        
         logger.info("LangGraph VC Orchestrator initialized with LangSmith monitoring")
     
     def _initialize_llm(self) -> ChatOpenAI:
@@ -123,6 +142,9 @@ class LangGraphVCOrchestrator:
         class MockLLM:
             def invoke(self, messages):
                 return AIMessage(content="Mock analysis result for development")
+            
+            async def ainvoke(self, messages):
+                return self.invoke(messages)
         return MockLLM()
     
     def _build_workflow_graph(self) -> StateGraph:
@@ -130,17 +152,21 @@ class LangGraphVCOrchestrator:
         
         workflow = StateGraph(VCWorkflowState)
         
-        # Add workflow nodes
-        workflow.add_node("initialize_workflow", self._initialize_workflow_node)
-        workflow.add_node("extract_deck_data", self._extract_deck_data_node)
-        workflow.add_node("web_research", self._web_research_node)
-        workflow.add_node("social_research", self._social_research_node)
-        workflow.add_node("compile_research", self._compile_research_node)
-        workflow.add_node("ai_analysis", self._ai_analysis_node)
-        workflow.add_node("quality_assessment", self._quality_assessment_node)
-        workflow.add_node("investment_evaluation", self._investment_evaluation_node)
-        workflow.add_node("generate_report", self._generate_report_node)
-        workflow.add_node("finalize_workflow", self._finalize_workflow_node)
+        # Add workflow nodes (async nodes run on the event loop, sync nodes in the executor)
+        nodes = {
+            "initialize_workflow": self._initialize_workflow_node,
+            "extract_deck_data": self._extract_deck_data_node,
+            "web_research": self._web_research_node,
+            "social_research": self._social_research_node,
+            "compile_research": self._compile_research_node,
+            "ai_analysis": self._ai_analysis_node,
+            "quality_assessment": self._quality_assessment_node,
+            "investment_evaluation": self._investment_evaluation_node,
+            "generate_report": self._generate_report_node,
+            "finalize_workflow": self._finalize_workflow_node
+        }
+        for node_name, node_fn in nodes.items():
+            workflow.add_node(node_name, self._instrument_node(node_name, node_fn))
         
         # Define the workflow edges
         workflow.add_edge(START, "initialize_workflow")
@@ -170,6 +196,23 @@ class LangGraphVCOrchestrator:
         
         return workflow.compile()
     
+    def _instrument_node(self, node_name: str, node_fn):
+        """Wrap a node as a coroutine that records its latency in the workflow metrics"""
+        
+        async def run_node(state: VCWorkflowState) -> Dict[str, Any]:
+            start = time.perf_counter()
+            try:
+                if asyncio.iscoroutinefunction(node_fn):
+                    return await node_fn(state)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.node_executor, node_fn, state)
+            finally:
+                metrics = self.execution_metrics.get(state.get("workflow_id", ""))
+                if metrics:
+                    metrics.node_latencies.setdefault(node_name, []).append(time.perf_counter() - start)
+        
+        return run_node
+    
     async def process_deck_with_langraph(self, deck_id: str, deck_file_path: str) -> Dict[str, Any]:
         """
         Process a pitch deck using the LangGraph workflow with comprehensive monitoring
@@ -204,6 +247,7 @@ class LangGraphVCOrchestrator:
                 workflow_id=workflow_id,
                 execution_start=datetime.now(),
                 step_timings={},
+                workflow_status="running",
                 investment_recommendation="PENDING",
                 risk_assessment={},
                 detailed_analysis={}
@@ -211,21 +255,21 @@ class LangGraphVCOrchestrator:
             
             logger.info(f"Starting LangGraph workflow execution: {workflow_id}")
             
-            # Execute the workflow with LangSmith tracing
+            # Execute the workflow with LangSmith tracing; parallel branches overlap on the event loop
             final_state = None
             step_count = 0
             
-            for step_output in self.workflow_graph.stream(initial_state):
+            async for stream_mode, chunk in self.workflow_graph.astream(initial_state, stream_mode=["updates", "values"]):
+                if stream_mode == "values":
+                    # Full state after each step
+                    final_state = chunk
+                    continue
+                
                 step_count += 1
                 metrics.steps_completed = step_count
                 
                 # Log each step for observability
-                logger.info(f"Workflow {workflow_id} - Step {step_count}: {list(step_output.keys())}")
-                
-                # Update final state
-                for node_name, node_output in step_output.items():
-                    if isinstance(node_output, dict):
-                        final_state = node_output
+                logger.info(f"Workflow {workflow_id} - Step {step_count}: {list(chunk.keys())}")
             
             # Finalize metrics
             metrics.end_time = datetime.now()
@@ -263,27 +307,22 @@ class LangGraphVCOrchestrator:
             # Extract basic information from the initial message
             deck_info = state["messages"][0].content if state["messages"] else ""
             
-            # Initialize tracking
-            execution_path = state.get("execution_path", [])
-            execution_path.append("initialize_workflow")
             
             logger.info(f"Initializing workflow for: {deck_info}")
             
             # Record step timing
-            step_timings = state.get("step_timings", {})
-            step_timings["initialize_workflow"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             return {
                 "current_step": "initialize_workflow",
                 "next_step": "extract_deck_data",
-                "execution_path": execution_path,
-                "step_timings": step_timings,
+                "execution_path": ["initialize_workflow"],
+                "step_timings": {"initialize_workflow": step_duration},
                 "messages": [AIMessage(content="Workflow initialized successfully")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"Initialize workflow error: {str(e)}")
+            error_log = [f"Initialize workflow error: {str(e)}"]
             
             return {
                 "current_step": "initialize_workflow",
@@ -312,11 +351,7 @@ class LangGraphVCOrchestrator:
             }
             
             # Update state with extracted data
-            execution_path = state.get("execution_path", [])
-            execution_path.append("extract_deck_data")
-            
-            step_timings = state.get("step_timings", {})
-            step_timings["extract_deck_data"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             logger.info(f"Extracted deck data for {extraction_results.get('company_name', 'Unknown')}")
             
@@ -326,14 +361,13 @@ class LangGraphVCOrchestrator:
                 "industry": extraction_results.get("industry", ""),
                 "current_step": "extract_deck_data",
                 "next_step": "research",
-                "execution_path": execution_path,
-                "step_timings": step_timings,
+                "execution_path": ["extract_deck_data"],
+                "step_timings": {"extract_deck_data": step_duration},
                 "messages": [AIMessage(content=f"Extracted data for {extraction_results.get('company_name', 'company')}")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"Deck extraction error: {str(e)}")
+            error_log = [f"Deck extraction error: {str(e)}"]
             
             return {
                 "current_step": "extract_deck_data",
@@ -341,7 +375,7 @@ class LangGraphVCOrchestrator:
                 "error_log": error_log
             }
     
-    def _web_research_node(self, state: VCWorkflowState) -> Dict[str, Any]:
+    async def _web_research_node(self, state: VCWorkflowState) -> Dict[str, Any]:
         """Conduct web research using Google Search API"""
         
         step_start = datetime.now()
@@ -354,9 +388,7 @@ class LangGraphVCOrchestrator:
             
             # Conduct company research
             if company_name:
-                web_results = asyncio.run(
-                    google_search_service.search_company_intelligence(company_name, industry)
-                )
+                web_results = await google_search_service.search_company_intelligence(company_name, industry)
                 
                 # Update metrics
                 metrics = self.execution_metrics.get(state.get("workflow_id", ""))
@@ -366,25 +398,20 @@ class LangGraphVCOrchestrator:
             else:
                 web_results = {"error": "No company name provided"}
             
-            execution_path = state.get("execution_path", [])
-            execution_path.append("web_research")
-            
-            step_timings = state.get("step_timings", {})
-            step_timings["web_research"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             logger.info(f"Completed web research for {company_name}")
             
             return {
                 "web_research_results": web_results,
                 "current_step": "web_research", 
-                "execution_path": execution_path,
-                "step_timings": step_timings,
+                "execution_path": ["web_research"],
+                "step_timings": {"web_research": step_duration},
                 "messages": [AIMessage(content=f"Web research completed for {company_name}")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"Web research error: {str(e)}")
+            error_log = [f"Web research error: {str(e)}"]
             
             return {
                 "web_research_results": {"error": str(e)},
@@ -392,7 +419,7 @@ class LangGraphVCOrchestrator:
                 "error_log": error_log
             }
     
-    def _social_research_node(self, state: VCWorkflowState) -> Dict[str, Any]:
+    async def _social_research_node(self, state: VCWorkflowState) -> Dict[str, Any]:
         """Conduct social media research using Twitter API"""
         
         step_start = datetime.now()
@@ -404,9 +431,7 @@ class LangGraphVCOrchestrator:
             
             # Conduct social research
             if company_name:
-                social_results = asyncio.run(
-                    twitter_search_service.search_company_social_signals(company_name)
-                )
+                social_results = await twitter_search_service.search_company_social_signals(company_name)
                 
                 # Update metrics
                 metrics = self.execution_metrics.get(state.get("workflow_id", ""))
@@ -415,25 +440,20 @@ class LangGraphVCOrchestrator:
             else:
                 social_results = {"error": "No company name provided"}
             
-            execution_path = state.get("execution_path", [])
-            execution_path.append("social_research")
-            
-            step_timings = state.get("step_timings", {})
-            step_timings["social_research"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             logger.info(f"Completed social research for {company_name}")
             
             return {
                 "social_research_results": social_results,
                 "current_step": "social_research",
-                "execution_path": execution_path, 
-                "step_timings": step_timings,
+                "execution_path": ["social_research"], 
+                "step_timings": {"social_research": step_duration},
                 "messages": [AIMessage(content=f"Social research completed for {company_name}")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"Social research error: {str(e)}")
+            error_log = [f"Social research error: {str(e)}"]
             
             return {
                 "social_research_results": {"error": str(e)},
@@ -463,11 +483,7 @@ class LangGraphVCOrchestrator:
                 social_mentions = social_results.get("mentions", {}).get("total_mentions", 0)
                 completeness_score += min(social_mentions / 20, 0.5)  # Max 0.5 for social
             
-            execution_path = state.get("execution_path", [])
-            execution_path.append("compile_research")
-            
-            step_timings = state.get("step_timings", {})
-            step_timings["compile_research"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             logger.info(f"Research compilation completed - Completeness: {completeness_score:.2f}")
             
@@ -475,14 +491,13 @@ class LangGraphVCOrchestrator:
                 "research_completeness": completeness_score,
                 "current_step": "compile_research",
                 "next_step": "ai_analysis",
-                "execution_path": execution_path,
-                "step_timings": step_timings,
+                "execution_path": ["compile_research"],
+                "step_timings": {"compile_research": step_duration},
                 "messages": [AIMessage(content=f"Research compiled - {completeness_score:.1%} complete")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"Research compilation error: {str(e)}")
+            error_log = [f"Research compilation error: {str(e)}"]
             
             return {
                 "current_step": "compile_research",
@@ -490,7 +505,7 @@ class LangGraphVCOrchestrator:
                 "error_log": error_log
             }
     
-    def _ai_analysis_node(self, state: VCWorkflowState) -> Dict[str, Any]:
+    async def _ai_analysis_node(self, state: VCWorkflowState) -> Dict[str, Any]:
         """Perform AI-powered analysis of all collected data"""
         
         step_start = datetime.now()
@@ -532,7 +547,7 @@ class LangGraphVCOrchestrator:
             
             # Generate AI analysis
             try:
-                analysis_result = self.llm.invoke(
+                analysis_result = await self.llm.ainvoke(
                     analysis_prompt.format(
                         company_name=analysis_context["company_name"],
                         industry=analysis_context["industry"],
@@ -555,11 +570,7 @@ class LangGraphVCOrchestrator:
                 logger.warning(f"LLM analysis failed, using fallback: {llm_error}")
                 ai_analysis = {"analysis": "Fallback analysis based on available data", "fallback": True}
             
-            execution_path = state.get("execution_path", [])
-            execution_path.append("ai_analysis")
-            
-            step_timings = state.get("step_timings", {})
-            step_timings["ai_analysis"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             logger.info("AI analysis completed")
             
@@ -567,14 +578,13 @@ class LangGraphVCOrchestrator:
                 "ai_analysis_results": ai_analysis,
                 "current_step": "ai_analysis",
                 "next_step": "quality_assessment", 
-                "execution_path": execution_path,
-                "step_timings": step_timings,
+                "execution_path": ["ai_analysis"],
+                "step_timings": {"ai_analysis": step_duration},
                 "messages": [AIMessage(content="AI analysis completed")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"AI analysis error: {str(e)}")
+            error_log = [f"AI analysis error: {str(e)}"]
             
             return {
                 "ai_analysis_results": {"error": str(e)},
@@ -622,11 +632,7 @@ class LangGraphVCOrchestrator:
                 confidence_level = "VERY_LOW"
                 data_quality = "error"
             
-            execution_path = state.get("execution_path", [])
-            execution_path.append("quality_assessment")
-            
-            step_timings = state.get("step_timings", {})
-            step_timings["quality_assessment"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             # Update metrics
             metrics = self.execution_metrics.get(state.get("workflow_id", ""))
@@ -641,14 +647,13 @@ class LangGraphVCOrchestrator:
                 "confidence_level": confidence_level,
                 "current_step": "quality_assessment",
                 "next_step": data_quality,
-                "execution_path": execution_path,
-                "step_timings": step_timings,
+                "execution_path": ["quality_assessment"],
+                "step_timings": {"quality_assessment": step_duration},
                 "messages": [AIMessage(content=f"Quality assessment: {confidence_level} ({quality_score:.1%})")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"Quality assessment error: {str(e)}")
+            error_log = [f"Quality assessment error: {str(e)}"]
             
             return {
                 "current_step": "quality_assessment",
@@ -695,11 +700,7 @@ class LangGraphVCOrchestrator:
                 ]
             }
             
-            execution_path = state.get("execution_path", [])
-            execution_path.append("investment_evaluation")
-            
-            step_timings = state.get("step_timings", {})
-            step_timings["investment_evaluation"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             logger.info(f"Investment evaluation completed - Recommendation: {recommendation}")
             
@@ -708,14 +709,13 @@ class LangGraphVCOrchestrator:
                 "risk_assessment": risk_assessment,
                 "current_step": "investment_evaluation",
                 "next_step": "generate_report",
-                "execution_path": execution_path,
-                "step_timings": step_timings,
+                "execution_path": ["investment_evaluation"],
+                "step_timings": {"investment_evaluation": step_duration},
                 "messages": [AIMessage(content=f"Investment recommendation: {recommendation}")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"Investment evaluation error: {str(e)}")
+            error_log = [f"Investment evaluation error: {str(e)}"]
             
             return {
                 "investment_recommendation": "ERROR",
@@ -754,11 +754,7 @@ class LangGraphVCOrchestrator:
                 }
             }
             
-            execution_path = state.get("execution_path", [])
-            execution_path.append("generate_report")
-            
-            step_timings = state.get("step_timings", {})
-            step_timings["generate_report"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             logger.info("Comprehensive report generated")
             
@@ -766,14 +762,13 @@ class LangGraphVCOrchestrator:
                 "detailed_analysis": detailed_analysis,
                 "current_step": "generate_report",
                 "next_step": "finalize_workflow",
-                "execution_path": execution_path,
-                "step_timings": step_timings,
+                "execution_path": ["generate_report"],
+                "step_timings": {"generate_report": step_duration},
                 "messages": [AIMessage(content="Comprehensive analysis report generated")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"Report generation error: {str(e)}")
+            error_log = [f"Report generation error: {str(e)}"]
             
             return {
                 "detailed_analysis": {"error": str(e)},
@@ -799,11 +794,7 @@ class LangGraphVCOrchestrator:
                 # Calculate cost estimate (mock)
                 metrics.cost_estimate = metrics.api_calls_made * 0.02 + metrics.tokens_consumed * 0.00001
             
-            execution_path = state.get("execution_path", [])
-            execution_path.append("finalize_workflow")
-            
-            step_timings = state.get("step_timings", {})
-            step_timings["finalize_workflow"] = (datetime.now() - step_start).total_seconds()
+            step_duration = (datetime.now() - step_start).total_seconds()
             
             # Log final workflow completion to LangSmith
             logger.info(f"Workflow {workflow_id} finalized successfully")
@@ -811,15 +802,14 @@ class LangGraphVCOrchestrator:
             return {
                 "current_step": "finalize_workflow",
                 "next_step": "completed",
-                "execution_path": execution_path,
-                "step_timings": step_timings,
+                "execution_path": ["finalize_workflow"],
+                "step_timings": {"finalize_workflow": step_duration},
                 "workflow_status": "completed",
                 "messages": [AIMessage(content="Workflow completed successfully")]
             }
             
         except Exception as e:
-            error_log = state.get("error_log", [])
-            error_log.append(f"Workflow finalization error: {str(e)}")
+            error_log = [f"Workflow finalization error: {str(e)}"]
             
             return {
                 "current_step": "finalize_workflow",
@@ -911,6 +901,22 @@ class LangGraphVCOrchestrator:
         total_api_calls = sum(m.api_calls_made for m in self.execution_metrics.values())
         total_cost = sum(m.cost_estimate for m in self.execution_metrics.values())
         
+        # Per-node latency percentiles across all executions
+        node_samples: Dict[str, List[float]] = {}
+        for m in self.execution_metrics.values():
+            for node_name, latencies in m.node_latencies.items():
+                node_samples.setdefault(node_name, []).extend(latencies)
+        
+        node_latency = {}
+        for node_name, samples in node_samples.items():
+            p50, p95 = np.percentile(samples, [50, 95])
+            node_latency[node_name] = {
+                "count": len(samples),
+                "p50_ms": round(float(p50) * 1000, 1),
+                "p95_ms": round(float(p95) * 1000, 1),
+                "max_ms": round(max(samples) * 1000, 1)
+            }
+        
         return {
             "total_workflows": total_workflows,
             "completed_workflows": completed_workflows,
@@ -918,6 +924,7 @@ class LangGraphVCOrchestrator:
             "average_duration": avg_duration,
             "total_api_calls": total_api_calls,
             "total_cost_estimate": total_cost,
+            "node_latency": node_latency,
             "recent_executions": [
                 {
                     "execution_id": metrics.execution_id,
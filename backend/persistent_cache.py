@@ -0,0 +1,210 @@
+"""
+VERSSAI Persistent Cache
+Bounded, SQLite-backed key/value cache shared by every worker process on a host
+
+Entries are JSON values with optional TTL. The store is capped by entry count
+and total bytes; the least recently used entries are evicted first. WAL mode
+lets multiple uvicorn workers read and write the same file concurrently.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.environ.get('VERSSAI_CACHE_PATH', './cache/verssai_cache.sqlite3')
+
+
+class PersistentCache:
+    """LRU + TTL cache persisted in SQLite, partitioned by namespace"""
+
+    def __init__(self, namespace: str, db_path: Optional[str] = None,
+                 max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024,
+                 default_ttl: Optional[float] = None):
+        self.namespace = namespace
+        self.db_path = Path(db_path or DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        # Process-local counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.conn:
+            self.conn.executescript('''
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache_entries (namespace, last_access);
+                CREATE INDEX IF NOT EXISTS idx_cache_expiry ON cache_entries (namespace, expires_at);
+            ''')
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Content-addressed key: SHA-256 over the JSON encoding of all parts"""
+        payload = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    with self.conn:
+                        self.conn.execute(
+                            'DELETE FROM cache_entries WHERE namespace = ? AND key = ?', (self.namespace, key)
+                        )
+                self.misses += 1
+                return None
+
+            with self.conn:
+                self.conn.execute(
+                    'UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?',
+                    (now, self.namespace, key)
+                )
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a JSON-serializable value, then evict down to the size limits"""
+        encoded = json.dumps(value, default=str)
+        now = time.time()
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = now + ttl if ttl else None
+
+        try:
+            with self._lock, self.conn:
+                self.conn.execute(
+                    '''INSERT OR REPLACE INTO cache_entries
+                       (namespace, key, value, size, created_at, expires_at, last_access)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                    (self.namespace, key, encoded, len(encoded), now, expires_at, now)
+                )
+                self._evict(now)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing {self.namespace} cache entry: {e}")
+
+    def increment(self, key: str, amount: int = 1, limit: Optional[int] = None,
+                  ttl: Optional[float] = None) -> Optional[int]:
+        """
+        Atomically add to an integer entry, creating it at 0 when missing or expired
+
+        Returns the new value, or None (leaving the entry unchanged) when it would
+        exceed `limit`. The read-modify-write runs in one SQLite write transaction,
+        so every worker sharing the file sees a single counter.
+        """
+        now = time.time()
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = now + ttl if ttl else None
+
+        with self._lock, self.conn:
+            self.conn.execute(
+                '''DELETE FROM cache_entries
+                   WHERE namespace = ? AND key = ? AND expires_at IS NOT NULL AND expires_at <= ?''',
+                (self.namespace, key, now)
+            )
+            self.conn.execute(
+                '''INSERT OR IGNORE INTO cache_entries
+                   (namespace, key, value, size, created_at, expires_at, last_access)
+                   VALUES (?, ?, '0', 1, ?, ?, ?)''',
+                (self.namespace, key, now, expires_at, now)
+            )
+            value = int(self.conn.execute(
+                'SELECT value FROM cache_entries WHERE namespace = ? AND key = ?', (self.namespace, key)
+            ).fetchone()[0]) + amount
+            if limit is not None and value > limit:
+                return None
+
+            encoded = str(value)
+            self.conn.execute(
+                '''UPDATE cache_entries SET value = ?, size = ?, last_access = ?
+                   WHERE namespace = ? AND key = ?''',
+                (encoded, len(encoded), now, self.namespace, key)
+            )
+        return value
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones over the limits (lock held)"""
+        self.evictions += self.conn.execute(
+            'DELETE FROM cache_entries WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?',
+            (self.namespace, now)
+        ).rowcount
+
+        count, total_bytes = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?', (self.namespace,)
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        excess_entries = max(0, count - self.max_entries)
+        excess_bytes = total_bytes - self.max_bytes
+        victims = []
+        freed = 0
+        for key, size in self.conn.execute(
+            'SELECT key, size FROM cache_entries WHERE namespace = ? ORDER BY last_access ASC', (self.namespace,)
+        ):
+            if len(victims) >= excess_entries and freed >= excess_bytes:
+                break
+            victims.append((self.namespace, key))
+            freed += size
+
+        self.conn.executemany('DELETE FROM cache_entries WHERE namespace = ? AND key = ?', victims)
+        self.evictions += len(victims)
+
+    def clear(self):
+        """Remove every entry in this namespace"""
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM cache_entries WHERE namespace = ?', (self.namespace,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count, stored bytes, hit ratio and eviction count"""
+        with self._lock:
+            count, total_bytes = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?',
+                (self.namespace,)
+            ).fetchone()
+            recent_keys = [row[0] for row in self.conn.execute(
+                'SELECT key FROM cache_entries WHERE namespace = ? ORDER BY last_access DESC LIMIT 10',
+                (self.namespace,)
+            )]
+
+        lookups = self.hits + self.misses
+        return {
+            'namespace': self.namespace,
+            'entries': count,
+            'bytes': total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'recent_keys': recent_keys
+        }
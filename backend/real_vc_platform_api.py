@@ -135,6 +135,18 @@ class FinancialMetrics(Base):
     churn_rate = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class CashFlow(Base):
+    __tablename__ = "cash_flows"
+    
+    id = Column(String, primary_key=True)
+    fund_id = Column(String, ForeignKey("funds.id"), nullable=False, index=True)
+    company_id = Column(String, ForeignKey("companies.id"), index=True)
+    flow_date = Column(DateTime, nullable=False)
+    flow_type = Column(String, nullable=False)  # call, distribution, nav
+    amount = Column(Float, nullable=False)  # Always positive; direction comes from flow_type
+    benchmark_index = Column(Float)  # Public index level on flow_date, used for PME
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 # Pydantic models
 class DealCreate(BaseModel):
     company_name: str
@@ -160,6 +172,14 @@ class InvestmentCreate(BaseModel):
     investment_date: datetime
     security_type: str = "Preferred"
 
+class CashFlowCreate(BaseModel):
+    fund_id: str
+    company_id: Optional[str] = None
+    flow_date: datetime
+    flow_type: str = Field(..., pattern="^(call|distribution|nav)$")
+    amount: float = Field(..., ge=0)
+    benchmark_index: Optional[float] = None
+
 class FinancialMetricsUpdate(BaseModel):
     company_id: str
     revenue: Optional[float] = None
@@ -341,29 +361,152 @@ scoring_engine = DealScoringEngine()
 
 # Fund performance calculator
 class FundPerformanceCalculator:
+    XIRR_NEWTON_ITERATIONS = 50
+    XIRR_BISECTION_ITERATIONS = 100
+    XIRR_TOLERANCE = 1e-9
+    XIRR_BRACKET = (-0.9999, 100.0)
+    
     @staticmethod
-    def calculate_irr(cash_flows: List[tuple], periods: List[int]) -> float:
-        """Calculate Internal Rate of Return using numpy"""
-        try:
-            # Convert to numpy arrays for calculation
-            cf_array = np.array([cf[1] for cf in cash_flows])
-            # Simple IRR approximation for demo
-            if len(cf_array) < 2:
-                return 0.0
+    def xirr_batch(times: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+        """
+        Solve XIRR for many cash-flow series at once
+        
+        Args:
+            times: (series, flows) matrix of flow times in years from each series' first flow
+            amounts: Matching signed amounts (negative = paid in), zero-padded
             
-            # Basic IRR calculation (simplified)
-            total_invested = sum(cf for cf in cf_array if cf < 0)
-            total_returned = sum(cf for cf in cf_array if cf > 0)
+        Returns:
+            Annualized IRR per series (NaN when no root exists)
+        """
+        times = np.asarray(times, dtype=float)
+        amounts = np.asarray(amounts, dtype=float)
+        
+        def npv(rates):
+            return (amounts * np.power(1.0 + rates[:, None], -times)).sum(axis=1)
+        
+        # Newton iterations from 10% for every series together
+        rates = np.full(len(amounts), 0.1)
+        converged = np.zeros(len(amounts), dtype=bool)
+        with np.errstate(all='ignore'):
+            for _ in range(FundPerformanceCalculator.XIRR_NEWTON_ITERATIONS):
+                discount = np.power(1.0 + rates[:, None], -times)
+                value = (amounts * discount).sum(axis=1)
+                derivative = (-times * amounts * discount / (1.0 + rates[:, None])).sum(axis=1)
+                step = np.where(derivative != 0, value / derivative, np.nan)
+                rates = np.where(converged, rates, rates - step)
+                converged |= np.abs(step) < FundPerformanceCalculator.XIRR_TOLERANCE
+                if converged.all():
+                    break
             
-            if total_invested == 0:
-                return 0.0
+            valid = converged & np.isfinite(rates) & (rates > -1.0)
+            
+            # Bisection fallback for series where Newton diverged
+            retry = ~valid
+            if retry.any():
+                low = np.full(retry.sum(), FundPerformanceCalculator.XIRR_BRACKET[0])
+                high = np.full(retry.sum(), FundPerformanceCalculator.XIRR_BRACKET[1])
+                sub_times, sub_amounts = times[retry], amounts[retry]
+                
+                def sub_npv(r):
+                    return (sub_amounts * np.power(1.0 + r[:, None], -sub_times)).sum(axis=1)
+                
+                f_low = sub_npv(low)
+                bracketed = np.sign(f_low) != np.sign(sub_npv(high))
+                for _ in range(FundPerformanceCalculator.XIRR_BISECTION_ITERATIONS):
+                    mid = (low + high) / 2
+                    f_mid = sub_npv(mid)
+                    same_side = np.sign(f_mid) == np.sign(f_low)
+                    low = np.where(same_side, mid, low)
+                    f_low = np.where(same_side, f_mid, f_low)
+                    high = np.where(same_side, high, mid)
+                
+                rates[retry] = np.where(bracketed, (low + high) / 2, np.nan)
+        
+        return rates
+    
+    @staticmethod
+    def calculate_ledger_metrics(ledger: pd.DataFrame, group_by: str = 'fund_id') -> pd.DataFrame:
+        """
+        IRR, TVPI, DPI, RVPI and Kaplan-Schoar PME for every group in a cash-flow ledger
+        
+        Args:
+            ledger: Columns group_by, flow_date, flow_type (call/distribution/nav),
+                amount and optionally benchmark_index
+            group_by: Column identifying each series (fund, company, vintage, ...)
             
-            multiple = abs(total_returned / total_invested)
-            years = max(periods) / 12 if periods else 1
+        Returns:
+            One row per group
+        """
+        columns = ['paid_in', 'distributions', 'nav', 'total_value', 'irr', 'tvpi', 'dpi', 'rvpi', 'pme', 'as_of']
+        if ledger.empty:
+            return pd.DataFrame(columns=columns)
+        
+        ledger = ledger.copy()
+        ledger['flow_date'] = pd.to_datetime(ledger['flow_date'])
+        if 'benchmark_index' not in ledger:
+            ledger['benchmark_index'] = np.nan
+        
+        # Residual value is the sum of the latest NAV mark of every holding in the group;
+        # marks without a company are fund-level and keep one latest mark per fund
+        is_nav = ledger['flow_type'] == 'nav'
+        mark_keys = [group_by] + [c for c in ('fund_id', 'company_id') if c in ledger and c != group_by]
+        latest_nav = ledger[is_nav].sort_values('flow_date').groupby(mark_keys, dropna=False).tail(1)
+        flows = pd.concat([ledger[~is_nav], latest_nav], ignore_index=True)
+        
+        flows['signed'] = np.where(flows['flow_type'] == 'call', -flows['amount'], flows['amount'])
+        for flow_type in ('call', 'distribution', 'nav'):
+            flows[flow_type] = np.where(flows['flow_type'] == flow_type, flows['amount'], 0.0)
+        
+        grouped = flows.groupby(group_by)
+        metrics = pd.DataFrame({
+            'paid_in': grouped['call'].sum(),
+            'distributions': grouped['distribution'].sum(),
+            'nav': grouped['nav'].sum(),
+            'as_of': grouped['flow_date'].max()
+        })
+        metrics['total_value'] = metrics['distributions'] + metrics['nav']
+        paid_in = metrics['paid_in'].replace(0, np.nan)
+        metrics['tvpi'] = metrics['total_value'] / paid_in
+        metrics['dpi'] = metrics['distributions'] / paid_in
+        metrics['rvpi'] = metrics['nav'] / paid_in
+        
+        # Pad every group's flows into one matrix for the batched solver
+        flows = flows.sort_values([group_by, 'flow_date'])
+        codes, uniques = pd.factorize(flows[group_by], sort=True)
+        position = flows.groupby(codes).cumcount().to_numpy()
+        start = flows.groupby(codes)['flow_date'].transform('min')
+        years = ((flows['flow_date'] - start).dt.total_seconds() / (365.0 * 86400)).to_numpy()
+        
+        times = np.zeros((len(uniques), position.max() + 1))
+        amounts = np.zeros_like(times)
+        times[codes, position] = years
+        amounts[codes, position] = flows['signed'].to_numpy()
+        irr = pd.Series(FundPerformanceCalculator.xirr_batch(times, amounts), index=uniques)
+        metrics['irr'] = irr.reindex(metrics.index)
+        
+        # Kaplan-Schoar PME: flows compounded to the as-of date with the benchmark index
+        final_index = flows.groupby(group_by)['benchmark_index'].last()
+        growth = flows[group_by].map(final_index) / flows['benchmark_index']
+        flows['pme_in'] = flows['call'] * growth
+        flows['pme_out'] = (flows['distribution'] + flows['nav']) * growth
+        pme_sums = flows.groupby(group_by)[['pme_in', 'pme_out']].sum(min_count=1)
+        has_benchmark = flows.groupby(group_by)['benchmark_index'].apply(lambda s: s.notna().all())
+        metrics['pme'] = (pme_sums['pme_out'] / pme_sums['pme_in'].replace(0, np.nan)).where(has_benchmark)
+        
+        return metrics[columns]
+    
+    @staticmethod
+    def calculate_irr(cash_flows: List[tuple], periods: List[int]) -> float:
+        """Calculate Internal Rate of Return from (amount, month) flows, as a percentage"""
+        try:
+            if len(cash_flows) < 2:
+                return 0.0
             
-            irr = (multiple ** (1/years) - 1) * 100
-            return round(irr, 2)
-        except:
+            amounts = np.array([[cf[0] for cf in cash_flows]], dtype=float)
+            times = np.array([[cf[1] / 12 for cf in cash_flows]], dtype=float)
+            irr = FundPerformanceCalculator.xirr_batch(times - times.min(), amounts)[0]
+            return round(float(irr) * 100, 2) if np.isfinite(irr) else 0.0
+        except Exception:
             return 0.0
     
     @staticmethod
@@ -667,6 +810,91 @@ async def get_portfolio(db = Depends(get_db)):
         logger.error(f"Error fetching portfolio: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def load_cash_flow_ledger(db, fund_ids: List[str]) -> pd.DataFrame:
+    """
+    Cash-flow ledger for the given funds
+    
+    Investments without a recorded call for their fund and company fall back to
+    the investment itself, and holdings without a NAV mark (in funds without a
+    fund-level mark) use today's ownership-weighted portfolio valuation.
+    """
+    ledger_columns = ['fund_id', 'company_id', 'flow_date', 'flow_type', 'amount', 'benchmark_index']
+    rows = db.query(
+        CashFlow.fund_id, CashFlow.company_id, CashFlow.flow_date,
+        CashFlow.flow_type, CashFlow.amount, CashFlow.benchmark_index
+    ).filter(CashFlow.fund_id.in_(fund_ids)).all()
+    ledger = pd.DataFrame(rows, columns=ledger_columns)
+    
+    recorded = lambda flow_type: set(
+        ledger.loc[ledger['flow_type'] == flow_type, ['fund_id', 'company_id']].itertuples(index=False, name=None)
+    )
+    frames = [ledger]
+    
+    # Legacy investments booked before the ledger existed have no call rows
+    called = recorded('call')
+    investments = db.query(
+        Investment.fund_id, Investment.company_id, Investment.investment_date, Investment.investment_amount
+    ).filter(Investment.fund_id.in_(fund_ids)).all()
+    frames.append(pd.DataFrame(
+        [(f, c, d, 'call', a, np.nan) for f, c, d, a in investments if (f, c) not in called],
+        columns=ledger_columns
+    ))
+    
+    marked = recorded('nav')
+    fund_marked = {f for f, c in marked if pd.isna(c)}
+    holdings = db.query(
+        Investment.fund_id, Investment.company_id, PortfolioCompany.current_valuation, Investment.ownership_percentage
+    ).join(PortfolioCompany, PortfolioCompany.investment_id == Investment.id).filter(
+        Investment.fund_id.in_(fund_ids), PortfolioCompany.status != 'Exited'
+    ).all()
+    now = datetime.utcnow()
+    frames.append(pd.DataFrame(
+        [
+            (f, c, now, 'nav', (v or 0) * (o or 0) / 100, np.nan) for f, c, v, o in holdings
+            if (f, c) not in marked and f not in fund_marked
+        ],
+        columns=ledger_columns
+    ))
+    
+    frames = [frame for frame in frames if not frame.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ledger_columns)
+
+def format_performance_metrics(row: pd.Series) -> Dict[str, Any]:
+    """JSON-friendly performance metrics for one ledger group"""
+    ratio = lambda value: round(float(value), 2) if pd.notna(value) else None
+    return {
+        "paid_in": float(row['paid_in']),
+        "realized_value": float(row['distributions']),
+        "unrealized_value": float(row['nav']),
+        "total_value": float(row['total_value']),
+        "irr": round(float(row['irr']) * 100, 2) if pd.notna(row['irr']) else None,
+        "tvpi": ratio(row['tvpi']),
+        "dpi": ratio(row['dpi']),
+        "rvpi": ratio(row['rvpi']),
+        "pme": ratio(row['pme']),
+        "as_of": row['as_of'].isoformat() if pd.notna(row['as_of']) else None
+    }
+
+@app.post("/api/v1/cash-flows")
+async def record_cash_flow(cash_flow: CashFlowCreate, db = Depends(get_db)):
+    """Record a capital call, distribution or NAV mark in the fund ledger"""
+    try:
+        if not db.query(Fund).filter(Fund.id == cash_flow.fund_id).first():
+            raise HTTPException(status_code=404, detail="Fund not found")
+        
+        entry = CashFlow(id=str(uuid.uuid4()), **cash_flow.model_dump())
+        db.add(entry)
+        db.commit()
+        
+        return {"success": True, "cash_flow_id": entry.id}
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error recording cash flow: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/v1/fund/performance")
 async def get_fund_performance(fund_id: str = "fund_001", db = Depends(get_db)):
     """Get fund performance metrics"""
@@ -676,60 +904,73 @@ async def get_fund_performance(fund_id: str = "fund_001", db = Depends(get_db)):
         if not fund:
             raise HTTPException(status_code=404, detail="Fund not found")
         
-        # Calculate portfolio value
-        portfolio_query = """
-        SELECT 
-            SUM(i.investment_amount) as total_invested,
-            SUM(pc.current_valuation * i.ownership_percentage / 100) as current_value,
-            COUNT(*) as active_investments
-        FROM investments i
-        JOIN portfolio_companies pc ON i.id = pc.investment_id
-        WHERE i.fund_id = %s AND pc.status != 'Exited'
-        """
-        
-        result = db.execute(portfolio_query, (fund_id,)).fetchone()
+        active_investments = db.query(Investment).join(
+            PortfolioCompany, PortfolioCompany.investment_id == Investment.id
+        ).filter(Investment.fund_id == fund_id, PortfolioCompany.status != 'Exited').count()
         
-        total_invested = result[0] or 0
-        current_value = result[1] or 0
-        active_investments = result[2] or 0
+        # Exact metrics from the cash-flow ledger
+        ledger = load_cash_flow_ledger(db, [fund_id])
+        metrics = FundPerformanceCalculator.calculate_ledger_metrics(ledger, 'fund_id')
+        performance = format_performance_metrics(metrics.loc[fund_id]) if fund_id in metrics.index else {}
         
-        # Mock some performance calculations for demo
-        unrealized_value = current_value
-        realized_value = total_invested * 0.15  # Assume 15% already realized
-        total_value = unrealized_value + realized_value
-        
-        # Calculate metrics
-        calculator = FundPerformanceCalculator()
-        tvpi = calculator.calculate_tvpi(total_value, total_invested)
-        dpi = calculator.calculate_dpi(realized_value, total_invested)
-        
-        # Mock IRR calculation
-        cash_flows = [(-total_invested, 0), (realized_value, 24)]  # 2 years
-        irr = calculator.calculate_irr(cash_flows, [0, 24])
+        # Per-company breakdown from the same ledger
+        company_ledger = ledger.dropna(subset=['company_id'])
+        company_metrics = FundPerformanceCalculator.calculate_ledger_metrics(company_ledger, 'company_id')
         
         return {
             "fund_info": {
                 "name": fund.name,
                 "vintage": fund.vintage,
                 "total_commitments": fund.total_commitments,
-                "total_deployed": total_invested
+                "total_deployed": performance.get("paid_in", 0.0)
             },
             "performance_metrics": {
-                "total_value": total_value,
-                "unrealized_value": unrealized_value,
-                "realized_value": realized_value,
-                "irr": irr,
-                "tvpi": tvpi,
-                "dpi": dpi,
+                **performance,
                 "active_investments": active_investments
             },
+            "company_performance": {
+                company_id: format_performance_metrics(row) for company_id, row in company_metrics.iterrows()
+            },
             "calculated_at": datetime.utcnow().isoformat()
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error calculating fund performance: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/v1/funds/performance")
+async def get_all_funds_performance(group_by: str = Query("fund", pattern="^(fund|vintage)$"), db = Depends(get_db)):
+    """Performance of every fund, or pooled by vintage, solved in one batch"""
+    try:
+        funds = db.query(Fund.id, Fund.name, Fund.vintage).all()
+        if not funds:
+            return {"group_by": group_by, "performance": {}, "calculated_at": datetime.utcnow().isoformat()}
+        
+        ledger = load_cash_flow_ledger(db, [fund.id for fund in funds])
+        if group_by == "vintage":
+            ledger['vintage'] = ledger['fund_id'].map({fund.id: fund.vintage for fund in funds})
+            metrics = FundPerformanceCalculator.calculate_ledger_metrics(ledger, 'vintage')
+            performance = {vintage: format_performance_metrics(row) for vintage, row in metrics.iterrows()}
+        else:
+            metrics = FundPerformanceCalculator.calculate_ledger_metrics(ledger, 'fund_id')
+            names = {fund.id: fund.name for fund in funds}
+            performance = {
+                fund_id: {"name": names.get(fund_id), **format_performance_metrics(row)}
+                for fund_id, row in metrics.iterrows()
+            }
+        
+        return {
+            "group_by": group_by,
+            "performance": performance,
+            "calculated_at": datetime.utcnow().isoformat()
+        }
+    
+    except Exception as e:
+        logger.error(f"Error calculating funds performance: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/v1/investments")
 async def create_investment(investment_data: InvestmentCreate, db = Depends(get_db)):
     """Create a new investment"""
@@ -764,6 +1005,16 @@ async def create_investment(investment_data: InvestmentCreate, db = Depends(get_
         
         db.add(portfolio_company)
         
+        # Record the capital call in the fund ledger
+        db.add(CashFlow(
+            id=str(uuid.uuid4()),
+            fund_id=deal.fund_id,
+            company_id=deal.company_id,
+            flow_date=investment_data.investment_date,
+            flow_type="call",
+            amount=investment_data.investment_amount
+        ))
+        
         # Update deal stage to Closed
         deal.stage = "Closed"
         deal.updated_at = datetime.utcnow()
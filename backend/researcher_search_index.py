@@ -0,0 +1,146 @@
+"""
+VERSSAI Researcher Search Index
+Inverted index over researcher name, institution and primary field
+
+Researchers are ranked once by h-index (highest first) and every posting list
+holds ranks in ascending order, i.e. already sorted by h-index. A query walks
+the shortest posting list in rank order, checks the other terms by binary
+search and the filters against precomputed category bitmaps, and stops as soon
+as `limit` hits are found, so the cost depends on the result size rather than
+on the number of researchers.
+"""
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ('name', 'institution', 'primary_field')
+CHUNK_SIZE = 256
+TERM_CACHE_SIZE = 1024
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: Any) -> List[str]:
+    return _TOKEN.findall(text.lower()) if isinstance(text, str) else []
+
+
+class ResearcherSearchIndex:
+    """Posting lists pre-sorted by h-index, with early-terminating intersection"""
+
+    def __init__(self, researchers: pd.DataFrame):
+        self.researchers = researchers
+
+        h_index = pd.to_numeric(researchers['h_index'], errors='coerce').to_numpy(dtype=np.float64)
+        h_index = np.where(np.isnan(h_index), -np.inf, h_index)
+        # rank -> row position, highest h-index first
+        self.order = np.argsort(-h_index, kind='stable')
+        self._neg_h_by_rank = -h_index[self.order]
+
+        postings: Dict[str, List[int]] = {}
+        columns = [researchers[field].to_numpy()[self.order] for field in SEARCH_FIELDS if field in researchers]
+        for rank, values in enumerate(zip(*columns)):
+            for token in {token for value in values for token in tokenize(value)}:
+                postings.setdefault(token, []).append(rank)
+        self._postings = {token: np.array(ranks, dtype=np.int64) for token, ranks in postings.items()}
+        self._vocabulary = sorted(self._postings)
+        self._term_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        # Category codes by rank, for the field and institution filter bitmaps
+        self._categories: Dict[str, pd.Index] = {}
+        self._codes_by_rank: Dict[str, np.ndarray] = {}
+        for field in ('primary_field', 'institution'):
+            if field in researchers:
+                codes, categories = pd.factorize(researchers[field])
+                self._categories[field] = categories
+                self._codes_by_rank[field] = codes[self.order]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _term_postings(self, term: str) -> np.ndarray:
+        """Ranks of researchers with a token starting with term"""
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            self._term_cache.move_to_end(term)
+            return cached
+
+        start = bisect_left(self._vocabulary, term)
+        lists = []
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            lists.append(self._postings[token])
+        if not lists:
+            ranks = np.empty(0, dtype=np.int64)
+        elif len(lists) == 1:
+            ranks = lists[0]
+        else:
+            ranks = np.unique(np.concatenate(lists))
+
+        self._term_cache[term] = ranks
+        if len(self._term_cache) > TERM_CACHE_SIZE:
+            self._term_cache.popitem(last=False)
+        return ranks
+
+    def _filter_bitmaps(self, filters: Dict) -> List[tuple]:
+        """(codes by rank, allowed-category bitmap) pairs for the categorical filters"""
+        bitmaps = []
+        if 'primary_field' in filters and 'primary_field' in self._categories:
+            categories = self._categories['primary_field']
+            bitmaps.append(('primary_field', np.asarray(categories == filters['primary_field'])))
+        if 'institution' in filters and 'institution' in self._categories:
+            categories = self._categories['institution']
+            needle = str(filters['institution']).lower()
+            bitmaps.append(('institution', np.array([needle in str(c).lower() for c in categories], dtype=bool)))
+        return [(self._codes_by_rank[field], allowed) for field, allowed in bitmaps]
+
+    def search_ranks(self, query: str, filters: Optional[Dict] = None, limit: int = 50) -> np.ndarray:
+        """Ranks of the top `limit` matches, in h-index order"""
+        filters = filters or {}
+
+        # min_h_index is a prefix of the rank order
+        rank_limit = len(self.order)
+        if filters.get('min_h_index') is not None:
+            rank_limit = int(np.searchsorted(self._neg_h_by_rank, -float(filters['min_h_index']), side='right'))
+
+        terms = sorted(set(tokenize(query)))
+        if query and not terms:
+            return np.empty(0, dtype=np.int64)
+        term_lists = sorted((self._term_postings(term) for term in terms), key=len)
+        if term_lists:
+            driver = term_lists[0][:np.searchsorted(term_lists[0], rank_limit)]
+            others = term_lists[1:]
+        else:
+            driver, others = None, []
+
+        bitmaps = self._filter_bitmaps(filters)
+        total = len(driver) if driver is not None else rank_limit
+        hits = []
+        found = 0
+        for start in range(0, total, CHUNK_SIZE):
+            chunk = driver[start:start + CHUNK_SIZE] if driver is not None else np.arange(start, min(start + CHUNK_SIZE, total))
+            keep = np.ones(len(chunk), dtype=bool)
+            for ranks in others:
+                positions = np.searchsorted(ranks, chunk)
+                keep &= (positions < len(ranks)) & (ranks[np.minimum(positions, len(ranks) - 1)] == chunk)
+            for codes, allowed in bitmaps:
+                chunk_codes = codes[chunk]
+                keep &= (chunk_codes >= 0) & allowed[np.maximum(chunk_codes, 0)]
+            matched = chunk[keep]
+            hits.append(matched)
+            found += len(matched)
+            if found >= limit:
+                break
+
+        if not hits:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(hits)[:limit]
+
+    def search(self, query: str, filters: Optional[Dict] = None, limit: int = 50) -> List[Dict]:
+        """Matching researcher records, highest h-index first"""
+        ranks = self.search_ranks(query, filters, limit)
+        return self.researchers.iloc[self.order[ranks]].to_dict('records')
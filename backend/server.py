@@ -41,6 +41,7 @@ except Exception as e:
 from file_storage import file_storage
 
 # Import AI services
+from ai_agents import close_ai_clients
 from rag_service import rag_service, query_multi_level
 from workflow_orchestrator import workflow_orchestrator, process_founder_signal_deck
 from intelligence_orchestrator import intelligence_orchestrator
@@ -1521,8 +1522,7 @@ async def get_portfolio_company_details(company_id: str):
         company = portfolio_orchestrator.portfolio_companies[company_id]
         
         # Get company KPIs
-        company_kpis = [kpi for kpi in portfolio_orchestrator.kpi_trackers.values() 
-                      if kpi.company_id == company_id]
+        company_kpis = portfolio_orchestrator.kpi_store.get_company_kpis(company_id)
         
         # Get recent board meetings
         recent_meetings = [meeting for meeting in portfolio_orchestrator.board_meetings.values()
@@ -1690,7 +1690,7 @@ async def get_portfolio_management_status():
             "current_stats": {
                 "portfolio_companies": len(portfolio_orchestrator.portfolio_companies),
                 "board_meetings": len(portfolio_orchestrator.board_meetings),
-                "kpi_trackers": len(portfolio_orchestrator.kpi_trackers)
+                "kpi_trackers": len(portfolio_orchestrator.kpi_store)
             },
             "ai_integration": {
                 "meeting_analysis": "enabled",
@@ -3396,6 +3396,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+    await close_ai_clients()
     logger.info("VERSSAI VC Intelligence Platform shutting down...")
 
 # Server startup
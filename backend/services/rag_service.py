@@ -3,17 +3,74 @@ VERSSAI 3-Level RAG Service
 Implements Platform, Investor, and Company-specific knowledge retrieval
 """
 import os
+import time
+import hashlib
+import itertools
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 import json
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+class QueryEmbeddingCache:
+    """
+    Bounded LRU cache of query embeddings shared by every RAG query path
+    
+    Keys are the normalized query text (stripped, lower-cased, whitespace
+    collapsed), so one user question is encoded at most once.
+    """
+    
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Normalize query text into a cache key"""
+        return " ".join(query.lower().split())
+    
+    def get_or_encode(self, embedding_model, query: str) -> List[float]:
+        """Return the cached embedding for a query, encoding it on a miss"""
+        key = self.normalize(query)
+        with self._lock:
+            embedding = self._embeddings.get(key)
+            if embedding is not None:
+                self._embeddings.move_to_end(key)
+                self.hits += 1
+                return embedding
+            self.misses += 1
+        
+        embedding = embedding_model.encode([query])[0].tolist()
+        
+        with self._lock:
+            self._embeddings[key] = embedding
+            self._embeddings.move_to_end(key)
+            while len(self._embeddings) > self.max_size:
+                self._embeddings.popitem(last=False)
+        
+        return embedding
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._embeddings),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0
+        }
+
 class VERSSAIRAGService:
     """
     3-Level RAG Architecture for VERSSAI VC Intelligence Platform
@@ -27,6 +84,9 @@ class VERSSAIRAGService:
         self.chroma_client = None
         self.embedding_model = None
         self.collections = {}
+        self.query_embeddings = QueryEmbeddingCache(
+            max_size=int(os.environ.get('RAG_QUERY_EMBEDDING_CACHE_SIZE', '1024'))
+        )
         self.initialize_rag_system()
     
     def initialize_rag_system(self):
@@ -101,11 +161,13 @@ class VERSSAIRAGService:
             texts = [doc['content'] for doc in documents]
             embeddings = self.embedding_model.encode(texts).tolist()
             
+            ids = [doc['document_id'] for doc in documents]
+            self._delete_chunked_copies(self.collections['platform'], ids)
             self.collections['platform'].add(
                 embeddings=embeddings,
                 documents=texts,
                 metadatas=[doc['metadata'] for doc in documents],
-                ids=[doc['document_id'] for doc in documents]
+                ids=ids
             )
             
             logger.info(f"Added {len(documents)} documents to platform knowledge")
@@ -133,11 +195,13 @@ class VERSSAIRAGService:
                 metadata['investor_id'] = investor_id
                 metadatas.append(metadata)
             
+            ids = [f"{investor_id}_{doc['document_id']}" for doc in documents]
+            self._delete_chunked_copies(self.collections['investor'], ids)
             self.collections['investor'].add(
                 embeddings=embeddings,
                 documents=texts,
                 metadatas=metadatas,
-                ids=[f"{investor_id}_{doc['document_id']}" for doc in documents]
+                ids=ids
             )
             
             logger.info(f"Added {len(documents)} documents for investor {investor_id}")
@@ -165,11 +229,13 @@ class VERSSAIRAGService:
                 metadata['company_id'] = company_id
                 metadatas.append(metadata)
             
+            ids = [f"{company_id}_{doc['document_id']}" for doc in documents]
+            self._delete_chunked_copies(self.collections['company'], ids)
             self.collections['company'].add(
                 embeddings=embeddings,
                 documents=texts,
                 metadatas=metadatas,
-                ids=[f"{company_id}_{doc['document_id']}" for doc in documents]
+                ids=ids
             )
             
             logger.info(f"Added {len(documents)} documents for company {company_id}")
@@ -178,22 +244,207 @@ class VERSSAIRAGService:
             logger.error(f"Error adding to company knowledge: {e}")
             raise
     
-    def query_platform_knowledge(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    # Metadata key that scopes documents to an owner for each RAG level
+    LEVEL_OWNER_KEYS = {'platform': None, 'investor': 'investor_id', 'company': 'company_id'}
+    
+    def bulk_ingest(self, level: str, documents: Iterable[Dict[str, Any]], owner_id: Optional[str] = None,
+                    chunk_size: int = 200, chunk_overlap: int = 40, batch_size: int = 64,
+                    page_size: int = 256) -> Dict[str, Any]:
+        """
+        Stream documents into a RAG level in bounded batches
+        
+        Documents are consumed page by page, split into overlapping word
+        chunks, encoded in fixed-size batches and upserted to Chroma, so
+        memory stays flat regardless of corpus size. Documents whose content
+        hash matches what is already stored are skipped.
+        
+        A single-chunk document is stored under the same ID the add_to_*
+        methods use; longer documents are stored as "<id>#<chunk index>".
+        Re-ingesting a document replaces whichever form was stored before.
+        
+        Args:
+            level: 'platform', 'investor' or 'company'
+            documents: Iterable of dicts with 'content', 'metadata', 'document_id' keys
+            owner_id: investor_id / company_id for the investor and company levels
+            chunk_size: Words per chunk
+            chunk_overlap: Words shared between consecutive chunks
+            batch_size: Chunks per encode/upsert call
+            page_size: Documents per unchanged-hash lookup
+            
+        Returns:
+            Ingestion statistics including docs/s and tokens/s throughput
+        """
+        if level not in self.LEVEL_OWNER_KEYS:
+            raise ValueError(f"Unknown RAG level: {level}")
+        owner_key = self.LEVEL_OWNER_KEYS[level]
+        if owner_key and not owner_id:
+            raise ValueError(f"{owner_key} is required for the {level} level")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        
+        collection = self.collections[level]
+        stats = {'level': level, 'documents': 0, 'documents_skipped': 0, 'chunks': 0, 'tokens': 0}
+        start = time.perf_counter()
+        
+        try:
+            doc_iter = iter(documents)
+            while True:
+                page = list(itertools.islice(doc_iter, page_size))
+                if not page:
+                    break
+                
+                base_ids = [f"{owner_id}_{doc['document_id']}" if owner_key else doc['document_id'] for doc in page]
+                hashes = [hashlib.sha256(doc['content'].encode('utf-8')).hexdigest() for doc in page]
+                stored = self._get_stored_documents(collection, base_ids)
+                
+                pending = []
+                stale_ids = []
+                for doc, base_id, content_hash in zip(page, base_ids, hashes):
+                    previous = stored.get(base_id)
+                    if previous and previous['metadata'].get('content_hash') == content_hash:
+                        # Unchanged, unless it is also stored under IDs of another scheme
+                        expected_ids = self._chunk_ids(base_id, previous['metadata'].get('chunk_count', 1))
+                        if set(previous['ids']) == set(expected_ids):
+                            stats['documents_skipped'] += 1
+                            continue
+                    
+                    chunks = list(self._chunk_text(doc['content'], chunk_size, chunk_overlap))
+                    chunk_ids = self._chunk_ids(base_id, len(chunks))
+                    for index, (chunk, token_count) in enumerate(chunks):
+                        metadata = dict(doc.get('metadata') or {})
+                        metadata.update({
+                            'document_id': doc['document_id'],
+                            'chunk_index': index,
+                            'chunk_count': len(chunks),
+                            'content_hash': content_hash
+                        })
+                        if owner_key:
+                            metadata[owner_key] = owner_id
+                        pending.append((chunk_ids[index], chunk, metadata))
+                        stats['tokens'] += token_count
+                    
+                    # Drop IDs of the previous version that this one does not overwrite
+                    if previous:
+                        stale_ids.extend(chunk_id for chunk_id in previous['ids'] if chunk_id not in chunk_ids)
+                    
+                    stats['documents'] += 1
+                    stats['chunks'] += len(chunks)
+                    
+                    while len(pending) >= batch_size:
+                        self._upsert_chunk_batch(collection, pending[:batch_size], batch_size)
+                        del pending[:batch_size]
+                
+                if pending:
+                    self._upsert_chunk_batch(collection, pending, batch_size)
+                if stale_ids:
+                    collection.delete(ids=stale_ids)
+            
+        except Exception as e:
+            logger.error(f"Error during bulk ingest into {level} knowledge: {e}")
+            raise
+        
+        elapsed = time.perf_counter() - start
+        stats['elapsed_seconds'] = round(elapsed, 3)
+        stats['docs_per_second'] = round(stats['documents'] / elapsed, 2) if elapsed > 0 else 0.0
+        stats['tokens_per_second'] = round(stats['tokens'] / elapsed, 2) if elapsed > 0 else 0.0
+        
+        logger.info(
+            f"Bulk ingested {stats['documents']} documents ({stats['chunks']} chunks, "
+            f"{stats['documents_skipped']} unchanged) into {level} knowledge"
+        )
+        return stats
+    
+    @staticmethod
+    def _chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> Iterator[tuple]:
+        """Yield (chunk_text, token_count) windows of overlapping words"""
+        words = text.split()
+        if not words:
+            yield text, 0
+            return
+        
+        step = chunk_size - chunk_overlap
+        for start in range(0, max(len(words) - chunk_overlap, 1), step):
+            window = words[start:start + chunk_size]
+            yield " ".join(window), len(window)
+    
+    @staticmethod
+    def _chunk_ids(base_id: str, chunk_count: int) -> List[str]:
+        """Stored IDs of a document's chunks: the base ID itself when it is a single chunk"""
+        chunk_count = int(chunk_count)
+        if chunk_count == 1:
+            return [base_id]
+        return [f"{base_id}#{index}" for index in range(chunk_count)]
+    
+    @staticmethod
+    def _get_stored_documents(collection, base_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Find already stored documents, keyed by base ID
+        
+        Each entry holds the first chunk's metadata and every ID the document
+        is stored under, whether as a single chunk or as "<id>#<i>" chunks.
+        """
+        base_id_set = set(base_ids)
+        existing = collection.get(
+            ids=list(base_ids) + [f"{base_id}#0" for base_id in base_ids], include=['metadatas']
+        )
+        stored = {}
+        for stored_id, metadata in zip(existing.get('ids', []), existing.get('metadatas') or []):
+            metadata = metadata or {}
+            if stored_id in base_id_set:
+                base_id, ids = stored_id, [stored_id]
+            else:
+                base_id = stored_id[:-len('#0')]
+                ids = [f"{base_id}#{index}" for index in range(int(metadata.get('chunk_count', 1)))]
+            entry = stored.setdefault(base_id, {'metadata': metadata, 'ids': []})
+            entry['ids'].extend(chunk_id for chunk_id in ids if chunk_id not in entry['ids'])
+            if 'content_hash' not in entry['metadata']:
+                entry['metadata'] = metadata
+        return stored
+    
+    def _delete_chunked_copies(self, collection, base_ids: List[str]):
+        """Remove "<id>#<i>" chunks bulk_ingest stored for documents about to be added whole"""
+        chunked_ids = [
+            chunk_id
+            for base_id, entry in self._get_stored_documents(collection, base_ids).items()
+            for chunk_id in entry['ids'] if chunk_id != base_id
+        ]
+        if chunked_ids:
+            collection.delete(ids=chunked_ids)
+    
+    def _upsert_chunk_batch(self, collection, batch: List[tuple], batch_size: int):
+        """Encode one batch of chunks and upsert it to a Chroma collection"""
+        ids, texts, metadatas = zip(*batch)
+        embeddings = self.embedding_model.encode(list(texts), batch_size=batch_size).tolist()
+        collection.upsert(
+            ids=list(ids),
+            embeddings=embeddings,
+            documents=list(texts),
+            metadatas=list(metadatas)
+        )
+    
+    def embed_query(self, query: str) -> List[float]:
+        """Encode a query once, reusing recent embeddings from the shared LRU cache"""
+        return self.query_embeddings.get_or_encode(self.embedding_model, query)
+    
+    def query_platform_knowledge(self, query: str, top_k: int = 5,
+                                 query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
         """
         Query Level 1 Platform RAG for research papers and industry insights
         
         Args:
             query: Search query
             top_k: Number of results to return
+            query_embedding: Precomputed query embedding (encoded here if omitted)
             
         Returns:
             List of relevant documents with metadata and scores
         """
         try:
-            query_embedding = self.embedding_model.encode([query]).tolist()
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
             
             results = self.collections['platform'].query(
-                query_embeddings=query_embedding,
+                query_embeddings=[query_embedding],
                 n_results=top_k
             )
             
@@ -212,7 +463,8 @@ class VERSSAIRAGService:
             logger.error(f"Error querying platform knowledge: {e}")
             return []
     
-    def query_investor_knowledge(self, investor_id: str, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    def query_investor_knowledge(self, investor_id: str, query: str, top_k: int = 5,
+                                 query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
         """
         Query Level 2 Investor RAG for investor-specific insights
         
@@ -220,15 +472,17 @@ class VERSSAIRAGService:
             investor_id: Investor to query for
             query: Search query
             top_k: Number of results to return
+            query_embedding: Precomputed query embedding (encoded here if omitted)
             
         Returns:
             List of relevant investor documents
         """
         try:
-            query_embedding = self.embedding_model.encode([query]).tolist()
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
             
             results = self.collections['investor'].query(
-                query_embeddings=query_embedding,
+                query_embeddings=[query_embedding],
                 n_results=top_k,
                 where={"investor_id": {"$eq": investor_id}}
             )
@@ -248,7 +502,8 @@ class VERSSAIRAGService:
             logger.error(f"Error querying investor knowledge: {e}")
             return []
     
-    def query_company_knowledge(self, company_id: str, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    def query_company_knowledge(self, company_id: str, query: str, top_k: int = 5,
+                                query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
         """
         Query Level 3 Company RAG for company-specific documents
         
@@ -256,15 +511,17 @@ class VERSSAIRAGService:
             company_id: Company to query for
             query: Search query
             top_k: Number of results to return
+            query_embedding: Precomputed query embedding (encoded here if omitted)
             
         Returns:
             List of relevant company documents
         """
         try:
-            query_embedding = self.embedding_model.encode([query]).tolist()
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
             
             results = self.collections['company'].query(
-                query_embeddings=query_embedding,
+                query_embeddings=[query_embedding],
                 n_results=top_k,
                 where={"company_id": {"$eq": company_id}}
             )
@@ -299,9 +556,12 @@ class VERSSAIRAGService:
             Comprehensive results from all relevant levels
         """
         try:
+            # Encode once and share the vector across every RAG level
+            query_embedding = self.embed_query(query)
+            
             results = {
                 'query': query,
-                'platform_results': self.query_platform_knowledge(query, top_k),
+                'platform_results': self.query_platform_knowledge(query, top_k, query_embedding),
                 'investor_results': [],
                 'company_results': [],
                 'synthesis': None
@@ -310,13 +570,13 @@ class VERSSAIRAGService:
             # Query investor level if investor_id provided
             if investor_id:
                 results['investor_results'] = self.query_investor_knowledge(
-                    investor_id, query, top_k
+                    investor_id, query, top_k, query_embedding
                 )
             
             # Query company level if company_id provided
             if company_id:
                 results['company_results'] = self.query_company_knowledge(
-                    company_id, query, top_k
+                    company_id, query, top_k, query_embedding
                 )
             
             # TODO: Add AI synthesis of multi-level results
@@ -358,6 +618,7 @@ class VERSSAIRAGService:
             status = {
                 'rag_system': 'operational',
                 'embedding_model': 'all-MiniLM-L6-v2',
+                'query_embedding_cache': self.query_embeddings.get_stats(),
                 'collections': {}
             }
             
@@ -401,6 +662,10 @@ def add_platform_document(content: str, metadata: Dict[str, Any], document_id: s
     
     return rag_service.add_to_platform_knowledge(documents)
 
+def bulk_ingest_documents(level: str, documents: Iterable[Dict[str, Any]], owner_id: str = None, **kwargs):
+    """Convenience function for streaming bulk ingestion into a RAG level"""
+    return rag_service.bulk_ingest(level, documents, owner_id, **kwargs)
+
 def add_company_document(company_id: str, content: str, metadata: Dict[str, Any], document_id: str = None):
     """Convenience function to add company documents"""
     if not document_id:
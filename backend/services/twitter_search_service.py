@@ -3,6 +3,7 @@ Twitter API Service for VERSSAI VC Intelligence Platform
 Social listening and founder analysis capabilities
 """
 import os
+import re
 import asyncio
 import json
 import logging
@@ -10,6 +11,7 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import hashlib
+import numpy as np
 import tweepy
 try:
     from tweepy.asynchronous import AsyncClient
@@ -21,6 +23,95 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Word -> weight; positive weights signal positive sentiment
+DEFAULT_SENTIMENT_LEXICON = {
+    "great": 1.0, "excellent": 1.0, "amazing": 1.0, "love": 1.0, "awesome": 1.0,
+    "fantastic": 1.0, "good": 1.0, "best": 1.0, "perfect": 1.0,
+    "bad": -1.0, "terrible": -1.0, "awful": -1.0, "hate": -1.0, "worst": -1.0,
+    "horrible": -1.0, "disappointing": -1.0, "failed": -1.0
+}
+
+SENTIMENT_LABELS = ("negative", "neutral", "positive")
+
+class LexiconSentimentScorer:
+    """
+    Batch lexicon sentiment scorer
+    
+    All lexicon terms are compiled into one word-boundary regex. A batch of
+    texts is joined and scanned once; match offsets are mapped back to their
+    text with a binary search and weights are summed per text with bincount.
+    """
+    
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        self.set_lexicon(lexicon or self._load_lexicon())
+    
+    @staticmethod
+    def _load_lexicon() -> Dict[str, float]:
+        """Lexicon from TWITTER_SENTIMENT_LEXICON (JSON file of word -> weight), else the default"""
+        lexicon_path = os.environ.get('TWITTER_SENTIMENT_LEXICON')
+        if lexicon_path:
+            try:
+                with open(lexicon_path) as f:
+                    return {str(word): float(weight) for word, weight in json.load(f).items()}
+            except Exception as e:
+                logger.error(f"Failed to load sentiment lexicon {lexicon_path}: {e}")
+        return dict(DEFAULT_SENTIMENT_LEXICON)
+    
+    def set_lexicon(self, lexicon: Dict[str, float]):
+        """Replace the lexicon and recompile the matcher"""
+        self.lexicon = {word.lower(): float(weight) for word, weight in lexicon.items() if word.strip()}
+        # Longest terms first so multi-word phrases win over their prefixes
+        terms = sorted(self.lexicon, key=len, reverse=True)
+        self.pattern = re.compile(r"(?<!\w)(?:" + "|".join(re.escape(term) for term in terms) + r")(?!\w)") if terms else None
+    
+    def score_batch(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Score many texts at once
+        
+        Returns:
+            Arrays aligned with `texts`: 'scores' (net weight), 'positive' and
+            'negative' (summed magnitudes) and 'labels' (-1, 0 or 1)
+        """
+        n = len(texts)
+        positive = np.zeros(n)
+        negative = np.zeros(n)
+        
+        if n and self.pattern is not None:
+            # Newline-joined so no term can match across two texts
+            lowered = [(text or "").lower().replace("\n", " ") for text in texts]
+            combined = "\n".join(lowered)
+            ends = np.cumsum([len(text) + 1 for text in lowered])
+            
+            matches = [(match.start(), self.lexicon[match.group(0)]) for match in self.pattern.finditer(combined)]
+            if matches:
+                positions, weights = np.array(matches).T
+                owners = np.searchsorted(ends, positions, side='right')
+                positive = np.bincount(owners, weights=np.clip(weights, 0, None), minlength=n)
+                negative = np.bincount(owners, weights=np.clip(-weights, 0, None), minlength=n)
+        
+        scores = positive - negative
+        return {
+            "scores": scores,
+            "positive": positive,
+            "negative": negative,
+            "labels": np.sign(scores).astype(np.int8)
+        }
+    
+    def label(self, text: str) -> str:
+        """Sentiment label for a single text"""
+        return SENTIMENT_LABELS[int(self.score_batch([text])["labels"][0]) + 1]
+    
+    def summarize(self, texts: List[str]) -> Dict[str, Any]:
+        """Per-text labels and scores plus the label distribution, in one scan"""
+        scored = self.score_batch(texts)
+        counts = np.bincount(scored["labels"] + 1, minlength=3)
+        return {
+            "labels": [SENTIMENT_LABELS[label + 1] for label in scored["labels"]],
+            "scores": scored["scores"],
+            "counts": dict(zip(SENTIMENT_LABELS, counts.tolist())),
+            "mean_score": float(scored["scores"].mean()) if len(texts) else 0.0
+        }
+
 @dataclass
 class TwitterProfile:
     username: str
@@ -55,6 +146,7 @@ class TwitterSearchService:
         
         self.cache = {}  # Simple in-memory cache
         self.cache_ttl = 3600  # 1 hour
+        self.sentiment_scorer = LexiconSentimentScorer()
         
         self.setup_twitter_client()
     
@@ -339,10 +431,10 @@ class TwitterSearchService:
                         "text": tweet.text,
                         "author": author_info,
                         "created_at": tweet.created_at.isoformat() if tweet.created_at else None,
-                        "public_metrics": tweet.public_metrics or {},
-                        "sentiment": self._analyze_tweet_sentiment(tweet.text)
+                        "public_metrics": tweet.public_metrics or {}
                     })
             
+            # Sentiment is scored in one batch by _analyze_company_sentiment
             return {
                 "mentions": mentions,
                 "total_mentions": len(mentions),
@@ -389,19 +481,15 @@ class TwitterSearchService:
         # Analyze tweet engagement
         recent_tweets = tweet_data.get("recent_tweets", [])
         if recent_tweets:
-            total_engagement = 0
-            tweet_count = len(recent_tweets)
-            
-            for tweet in recent_tweets:
-                metrics = tweet.get("public_metrics", {})
-                engagement = (
-                    metrics.get("like_count", 0) + 
-                    metrics.get("retweet_count", 0) + 
-                    metrics.get("reply_count", 0)
-                )
-                total_engagement += engagement
-            
-            avg_engagement = total_engagement / tweet_count if tweet_count > 0 else 0
+            engagement = np.array([
+                [
+                    (tweet.get("public_metrics") or {}).get("like_count", 0),
+                    (tweet.get("public_metrics") or {}).get("retweet_count", 0),
+                    (tweet.get("public_metrics") or {}).get("reply_count", 0)
+                ]
+                for tweet in recent_tweets
+            ], dtype=float)
+            avg_engagement = float(engagement.sum(axis=1).mean())
             
             if avg_engagement > 100:
                 analysis["engagement_quality"] = "high"
@@ -426,11 +514,9 @@ class TwitterSearchService:
                 "total_analyzed": 0
             }
         
-        sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
-        
-        for mention in mentions:
-            sentiment = mention.get("sentiment", "neutral")
-            sentiment_counts[sentiment] += 1
+        # Rescore from the text so results always reflect the current lexicon
+        summary = self.rescore_mentions(mentions)
+        sentiment_counts = summary["counts"]
         
         total = len(mentions)
         
@@ -452,26 +538,22 @@ class TwitterSearchService:
                 "neutral": f"{sentiment_counts['neutral']/total:.1%}",
                 "negative": f"{negative_ratio:.1%}"
             },
+            "average_score": round(summary["mean_score"], 3),
             "total_analyzed": total,
             "key_mentions": [m for m in mentions[:3]]  # Top 3 mentions
         }
     
+    def rescore_mentions(self, mentions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Score a batch of mentions in place, setting 'sentiment' and 'sentiment_score'"""
+        summary = self.sentiment_scorer.summarize([mention.get("text", "") for mention in mentions])
+        for mention, label, score in zip(mentions, summary["labels"], summary["scores"]):
+            mention["sentiment"] = label
+            mention["sentiment_score"] = float(score)
+        return summary
+    
     def _analyze_tweet_sentiment(self, tweet_text: str) -> str:
         """Simple sentiment analysis for tweets"""
-        positive_words = ["great", "excellent", "amazing", "love", "awesome", "fantastic", "good", "best", "perfect"]
-        negative_words = ["bad", "terrible", "awful", "hate", "worst", "horrible", "disappointing", "failed"]
-        
-        text_lower = tweet_text.lower()
-        
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        
-        if positive_count > negative_count:
-            return "positive"
-        elif negative_count > positive_count:
-            return "negative"
-        else:
-            return "neutral"
+        return self.sentiment_scorer.label(tweet_text)
     
     def _create_mock_founder_social_data(self, founder_name: str, company_name: str) -> Dict[str, Any]:
         """Create mock founder social data when API is not available"""
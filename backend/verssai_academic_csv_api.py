@@ -7,6 +7,10 @@ import json
 from datetime import datetime
 from typing import List, Dict, Optional
 from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from founder_name_index import FounderNameIndex, NameMatch
+
+MAX_BATCH_FOUNDERS = 1000
 
 class VERSSAIAcademicCSVAPI:
     """
@@ -27,6 +31,7 @@ class VERSSAIAcademicCSVAPI:
             self.datasets['verified_papers'] = pd.read_csv(os.path.join(base_path, "verified_papers.csv"))
             self.datasets['categories'] = pd.read_csv(os.path.join(base_path, "research_categories.csv"))
             self.datasets['researchers'] = pd.read_csv(os.path.join(base_path, "top_researchers.csv"))
+            self.name_index = FounderNameIndex(self.datasets['researchers']['name'])
             
             print("✅ VERSSAI Academic CSV Dataset Loaded")
             print(f"📊 Verified papers: {len(self.datasets['verified_papers'])}")
@@ -43,15 +48,21 @@ class VERSSAIAcademicCSVAPI:
     
     def validate_founder_background(self, founder_name: str) -> Dict:
         """Validate founder against researcher database"""
-        researchers = self.datasets['researchers']
-        
-        # Check if founder matches any researcher
-        matches = researchers[researchers['name'].str.contains(founder_name, case=False, na=False)]
-        
-        if not matches.empty:
-            researcher = matches.iloc[0]
+        return self._founder_validation(self.name_index.best_match(founder_name))
+    
+    def validate_founders_batch(self, founder_names: List[str]) -> List[Dict]:
+        """Validate many founders against the prebuilt name index"""
+        return [
+            {'founder_name': name, **self._founder_validation(matches[0] if matches else None)}
+            for name, matches in zip(founder_names, self.name_index.lookup_batch(founder_names))
+        ]
+    
+    def _founder_validation(self, match: Optional[NameMatch]) -> Dict:
+        if match is not None:
+            researcher = self.datasets['researchers'].iloc[match.position]
             return {
                 'found_in_database': True,
+                'match_score': match.score,
                 'academic_credibility': min(100, researcher['h_index'] * 0.7),
                 'researcher_profile': {
                     'name': researcher['name'],
@@ -62,7 +73,7 @@ class VERSSAIAcademicCSVAPI:
                     'years_active': researcher['years_active'],
                     'industry_experience': researcher['industry_experience']
                 },
-                'validation_confidence': 90
+                'validation_confidence': round(90 * match.score)
             }
         else:
             return {
@@ -99,6 +110,9 @@ class VERSSAIAcademicCSVAPI:
         experts = researchers[researchers['h_index'] >= min_h_index]
         return experts.to_dict('records')
 
+class FounderBatchRequest(BaseModel):
+    founder_names: List[str]
+
 # FastAPI Application
 app = FastAPI(title="VERSSAI Academic Intelligence API (CSV)", version="1.0.0")
 
@@ -133,6 +147,19 @@ async def validate_founder(founder_name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/academic/validate-founders")
+async def validate_founders(request: FounderBatchRequest):
+    if not academic_api:
+        raise HTTPException(status_code=503, detail="Academic dataset not available")
+    if len(request.founder_names) > MAX_BATCH_FOUNDERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_FOUNDERS} founders per request")
+    
+    try:
+        result = academic_api.validate_founders_batch(request.founder_names)
+        return {"status": "success", "data": result, "total": len(result)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/academic/research-insights")
 async def get_research_insights(topic: str):
     if not academic_api:
@@ -3,6 +3,10 @@ VERSSAI Dataset Integration Service
 Processes and serves the comprehensive VC intelligence dataset
 """
 
+import os
+import re
+import math
+import hashlib
 import pandas as pd
 import json
 import sqlite3
@@ -13,10 +17,83 @@ from datetime import datetime
 import logging
 from pathlib import Path
 
+from dataset_cache import compute_file_checksum, load_dataset
+from researcher_search_index import ResearcherSearchIndex
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump when the schema changes; older databases are rebuilt on the next import
+SCHEMA_VERSION = 2
+
+# Workbook sheet -> (table, integer primary key)
+SHEET_TABLES = {
+    'References_1157': ('references', 'ref_id'),
+    'Researchers_2311': ('researchers', 'researcher_id'),
+    'Institutions': ('institutions', 'institution_id'),
+    'Citation_Network': ('citation_network', 'citation_id')
+}
+
+# FTS5 table -> (content table, rowid column, indexed columns)
+FTS_TABLES = {
+    'references_fts': ('references', 'ref_id', ('title', 'abstract')),
+    'researchers_fts': ('researchers', 'researcher_id', ('name',))
+}
+
+RESEARCHER_VC_SCORE = '''(
+    h_index * 0.3 +
+    log1p(total_citations) * 0.25 +
+    collaboration_count * 0.2 +
+    years_active * 0.1 +
+    recent_papers * 0.15
+)'''
+
+# Dataset-wide analyses computed once per import -> processor method producing them
+PRECOMPUTED_ANALYSES = {
+    'vc_insights': 'generate_vc_insights',
+    'institution_analysis': 'get_institution_analysis',
+    'research_insights': 'get_research_insights',
+    'citation_network_analysis': 'get_citation_network_analysis'
+}
+
+INSTITUTION_VC_ATTRACTIVENESS = '''(
+    (1000 - ranking) * 0.4 +
+    research_output * 0.3 +
+    collaboration_score * 200 * 0.2 +
+    researcher_count * 0.1
+)'''
+
+
+def _sql_value(value: Any) -> Any:
+    """Convert a DataFrame cell to a value sqlite3 can bind (NaN -> NULL)"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+        return None if isinstance(value, float) and math.isnan(value) else value
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _json_safe(value: Any) -> Any:
+    """NaN/inf -> None, recursively, so results serialize as strict JSON"""
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _fts_query(text: str) -> str:
+    """FTS5 MATCH expression requiring every word of text as a prefix"""
+    return ' '.join(f'"{token}"*' for token in re.findall(r'\w+', text.lower()))
+
 @dataclass
 class DatasetStats:
     total_references: int
@@ -30,43 +107,85 @@ class DatasetStats:
     top_categories: Dict[str, int]
     avg_authors_per_paper: float
 
+@dataclass
+class PrecomputedResult:
+    name: str
+    version: str        # dataset version (source workbook checksum) it was computed from
+    etag: str           # content hash of the serialized payload
+    payload: Dict[str, Any]
+    computed_at: str
+
 class VERSSAIDatasetProcessor:
-    def __init__(self, excel_file_path: str, db_path: str = "verssai_dataset.db"):
+    def __init__(self, excel_file_path: Optional[str], db_path: str = "verssai_dataset.db"):
         self.excel_file_path = excel_file_path
         self.db_path = db_path
         self.conn = None
         self.datasets = {}
+        self.researcher_index = None
+        self.fts_enabled = False
+        self.precomputed: Dict[str, PrecomputedResult] = {}
         
     def connect_db(self):
         """Create database connection"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            # Used by the researcher_vc_scores view
+            self.conn.create_function(
+                'log1p', 1, lambda x: math.log1p(x) if x is not None else None, deterministic=True
+            )
             logger.info(f"Connected to database: {self.db_path}")
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
-            
+
+    @classmethod
+    def from_database(cls, db_path: str = "verssai_dataset.db") -> 'VERSSAIDatasetProcessor':
+        """Serve a previously populated database without loading the workbook"""
+        processor = cls(excel_file_path=None, db_path=db_path)
+        processor.connect_db()
+        processor.fts_enabled = bool(processor._query_value(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'references_fts'"
+        ))
+        return processor
+
     def load_excel_data(self):
         """Load all sheets from the VERSSAI Excel file"""
         try:
-            # Read all sheets
-            excel_data = pd.read_excel(self.excel_file_path, sheet_name=None)
-            
+            # Read all sheets (served from the columnar cache unless the workbook changed)
+            excel_data = load_dataset(self.excel_file_path)
+
             for sheet_name, df in excel_data.items():
                 self.datasets[sheet_name] = df
                 logger.info(f"Loaded sheet '{sheet_name}': {len(df)} rows, {len(df.columns)} columns")
-                
+
+            self._get_researcher_index()
             return True
         except Exception as e:
             logger.error(f"Failed to load Excel data: {e}")
             return False
-            
+
     def create_database_tables(self):
-        """Create database tables for each dataset"""
+        """Create the typed, indexed schema (rebuilt when SCHEMA_VERSION changes)"""
         if not self.conn:
             self.connect_db()
-            
+
         cursor = self.conn.cursor()
-        
+
+        # Databases written by earlier versions used DataFrame.to_sql: untyped, no keys, no indexes
+        if cursor.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+            cursor.executescript('''
+                DROP VIEW IF EXISTS researcher_vc_scores;
+                DROP VIEW IF EXISTS institution_vc_scores;
+                DROP TABLE IF EXISTS references_fts;
+                DROP TABLE IF EXISTS researchers_fts;
+                DROP TABLE IF EXISTS "references";
+                DROP TABLE IF EXISTS researchers;
+                DROP TABLE IF EXISTS institutions;
+                DROP TABLE IF EXISTS citation_network;
+                DROP TABLE IF EXISTS dataset_meta;
+            ''')
+
         # Summary Statistics Table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS summary_statistics (
@@ -84,13 +203,14 @@ class VERSSAIDatasetProcessor:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+
         # References Table
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS references (
+            CREATE TABLE IF NOT EXISTS "references" (
                 ref_id INTEGER PRIMARY KEY,
                 category TEXT,
                 title TEXT,
+                abstract TEXT,
                 authors TEXT,
                 year INTEGER,
                 venue TEXT,
@@ -106,7 +226,7 @@ class VERSSAIDatasetProcessor:
                 url TEXT
             )
         ''')
-        
+
         # Researchers Table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS researchers (
@@ -126,7 +246,7 @@ class VERSSAIDatasetProcessor:
                 industry_experience BOOLEAN
             )
         ''')
-        
+
         # Institutions Table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS institutions (
@@ -142,7 +262,7 @@ class VERSSAIDatasetProcessor:
                 established_year INTEGER
             )
         ''')
-        
+
         # Citation Network Table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS citation_network (
@@ -154,16 +274,98 @@ class VERSSAIDatasetProcessor:
                 self_citation BOOLEAN
             )
         ''')
-        
+
+        # Source workbook checksum, so unchanged workbooks are not re-imported
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dataset_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+
+        # Analysis results computed after each import, keyed by dataset version
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS precomputed_results (
+                name TEXT,
+                version TEXT,
+                etag TEXT,
+                payload TEXT,
+                computed_at TEXT,
+                PRIMARY KEY (name, version)
+            )
+        ''')
+
+        # B-tree indexes on join, filter and sort keys
+        cursor.executescript('''
+            CREATE INDEX IF NOT EXISTS idx_references_category ON "references" (category);
+            CREATE INDEX IF NOT EXISTS idx_references_year ON "references" (year);
+            CREATE INDEX IF NOT EXISTS idx_references_venue ON "references" (venue);
+            CREATE INDEX IF NOT EXISTS idx_references_citations ON "references" (citation_count DESC);
+            CREATE INDEX IF NOT EXISTS idx_researchers_institution ON researchers (institution);
+            CREATE INDEX IF NOT EXISTS idx_researchers_field ON researchers (primary_field);
+            CREATE INDEX IF NOT EXISTS idx_researchers_h_index ON researchers (h_index DESC);
+            CREATE INDEX IF NOT EXISTS idx_institutions_name ON institutions (name);
+            CREATE INDEX IF NOT EXISTS idx_institutions_country ON institutions (country);
+            CREATE INDEX IF NOT EXISTS idx_citations_citing ON citation_network (citing_paper_id);
+            CREATE INDEX IF NOT EXISTS idx_citations_cited ON citation_network (cited_paper_id);
+        ''')
+
+        # VC scoring formulas, evaluated by SQLite
+        cursor.executescript(f'''
+            CREATE VIEW IF NOT EXISTS researcher_vc_scores AS
+                SELECT *, {RESEARCHER_VC_SCORE} AS vc_score FROM researchers;
+            CREATE VIEW IF NOT EXISTS institution_vc_scores AS
+                SELECT *, {INSTITUTION_VC_ATTRACTIVENESS} AS vc_attractiveness FROM institutions;
+        ''')
+
+        self._create_fts_tables(cursor)
+
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         self.conn.commit()
         logger.info("Database tables created successfully")
-        
+
+    def _create_fts_tables(self, cursor):
+        """FTS5 indexes over paper titles/abstracts and researcher names, kept in sync by triggers"""
+        try:
+            for fts_table, (table, key, columns) in FTS_TABLES.items():
+                column_list = ', '.join(columns)
+                new_values = ', '.join(f'new.{c}' for c in columns)
+                old_values = ', '.join(f'old.{c}' for c in columns)
+                cursor.executescript(f'''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                        {column_list}, content='{table}', content_rowid='{key}'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON "{table}" BEGIN
+                        INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.{key}, {new_values});
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON "{table}" BEGIN
+                        INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.{key}, {old_values});
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON "{table}" BEGIN
+                        INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.{key}, {old_values});
+                        INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.{key}, {new_values});
+                    END;
+                ''')
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, full-text search disabled: {e}")
+            self.fts_enabled = False
+
     def populate_database(self):
-        """Populate database with Excel data"""
+        """Upsert the Excel data; skipped entirely when the workbook is unchanged"""
         if not self.conn:
             self.connect_db()
-            
+
         try:
+            checksum = compute_file_checksum(self.excel_file_path)
+            stored = self.conn.execute(
+                "SELECT value FROM dataset_meta WHERE key = 'source_checksum'"
+            ).fetchone()
+            if stored is not None and stored[0] == checksum:
+                logger.info("Database already matches the workbook, skipping import")
+                self._load_precomputed(self.get_dataset_version())
+                return
+
             # Insert Summary Statistics
             if 'Summary_Statistics' in self.datasets:
                 summary_df = self.datasets['Summary_Statistics']
@@ -176,74 +378,221 @@ class VERSSAIDatasetProcessor:
                             total_citations, average_citations_per_paper, average_authors_per_paper,
                             year_range, top_categories, statistical_significance_rate, open_access_rate
                         ) VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        row['Total_References'],
-                        row['Total_Researchers'], 
-                        row['Total_Institutions'],
-                        row['Total_Citations'],
-                        row['Average_Citations_Per_Paper'],
-                        row['Average_Authors_Per_Paper'],
-                        row['Year_Range'],
-                        row['Top_Categories'],
-                        row['Statistical_Significance_Rate'],
-                        row['Open_Access_Rate']
-                    ))
-                    
-            # Insert References
-            if 'References_1157' in self.datasets:
-                refs_df = self.datasets['References_1157']
-                refs_df.to_sql('references', self.conn, if_exists='replace', index=False)
-                
-            # Insert Researchers
-            if 'Researchers_2311' in self.datasets:
-                researchers_df = self.datasets['Researchers_2311']
-                researchers_df.to_sql('researchers', self.conn, if_exists='replace', index=False)
-                
-            # Insert Institutions
-            if 'Institutions' in self.datasets:
-                institutions_df = self.datasets['Institutions']
-                institutions_df.to_sql('institutions', self.conn, if_exists='replace', index=False)
-                
-            # Insert Citation Network
-            if 'Citation_Network' in self.datasets:
-                citation_df = self.datasets['Citation_Network']
-                citation_df.to_sql('citation_network', self.conn, if_exists='replace', index=False)
-                
+                    ''', tuple(_sql_value(row[column]) for column in (
+                        'Total_References', 'Total_Researchers', 'Total_Institutions',
+                        'Total_Citations', 'Average_Citations_Per_Paper', 'Average_Authors_Per_Paper',
+                        'Year_Range', 'Top_Categories', 'Statistical_Significance_Rate', 'Open_Access_Rate'
+                    )))
+
+            for sheet_name, (table, key) in SHEET_TABLES.items():
+                if sheet_name in self.datasets:
+                    self._upsert_table(table, key, self.datasets[sheet_name])
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO dataset_meta (key, value) VALUES ('source_checksum', ?)", (checksum,)
+            )
             self.conn.commit()
             logger.info("Database populated successfully")
-            
+
+            self.precompute_analytics()
+
         except Exception as e:
+            self.conn.rollback()
             logger.error(f"Failed to populate database: {e}")
-            
+
+    def get_dataset_version(self) -> Optional[str]:
+        """Version of the imported data: the checksum of the workbook it came from"""
+        try:
+            checksum = self._query_value("SELECT value FROM dataset_meta WHERE key = 'source_checksum'")
+        except sqlite3.Error:
+            return None
+        return checksum[:16] if checksum else None
+
+    def precompute_analytics(self) -> Dict[str, PrecomputedResult]:
+        """Compute the dataset-wide analyses for the current version and store them"""
+        version = self.get_dataset_version()
+        if version is None:
+            return {}
+
+        computed_at = datetime.utcnow().isoformat()
+        rows = []
+        for name, method in PRECOMPUTED_ANALYSES.items():
+            text = json.dumps(_json_safe(getattr(self, method)()), default=str, allow_nan=False)
+            etag = hashlib.sha256(text.encode()).hexdigest()[:32]
+            rows.append((name, version, etag, text, computed_at))
+
+        self.conn.execute('DELETE FROM precomputed_results WHERE version != ?', (version,))
+        self.conn.executemany('INSERT OR REPLACE INTO precomputed_results VALUES (?, ?, ?, ?, ?)', rows)
+        self.conn.commit()
+        logger.info(f"Precomputed {len(rows)} analyses for dataset version {version}")
+
+        return self._load_precomputed(version)
+
+    def _load_precomputed(self, version: str) -> Dict[str, PrecomputedResult]:
+        rows = self._query(
+            'SELECT name, etag, payload, computed_at FROM precomputed_results WHERE version = ?', (version,)
+        )
+        if {row['name'] for row in rows} != set(PRECOMPUTED_ANALYSES):
+            return self.precompute_analytics()
+
+        # Payloads are read back from JSON so every worker serves identical data
+        self.precomputed = {
+            row['name']: PrecomputedResult(row['name'], version, row['etag'], json.loads(row['payload']), row['computed_at'])
+            for row in rows
+        }
+        return self.precomputed
+
+    def get_precomputed(self, name: str) -> Optional[PrecomputedResult]:
+        """
+        Precomputed analysis for the current dataset version
+
+        Only the version is looked up per call; results are reloaded (or
+        computed) when another process has imported a new version.
+        """
+        try:
+            version = self.get_dataset_version()
+            if version is None:
+                return None
+            result = self.precomputed.get(name)
+            if result is None or result.version != version:
+                result = self._load_precomputed(version).get(name)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to load precomputed '{name}': {e}")
+            return None
+
+    def _upsert_table(self, table: str, key: str, df: pd.DataFrame):
+        """Insert new rows, update changed ones and delete rows no longer in the sheet"""
+        table_columns = [row['name'] for row in self.conn.execute(f'PRAGMA table_info("{table}")')]
+        frame = df[[c for c in table_columns if c in df.columns]].copy()
+
+        if key not in frame.columns:
+            # Sheets without an ID column are keyed by row order
+            frame.insert(0, key, np.arange(1, len(frame) + 1))
+        keys = pd.to_numeric(frame[key], errors='coerce')
+        if keys.isna().any() or (keys % 1 != 0).any():
+            logger.warning(f"'{table}' sheet has non-integer {key} values, keying rows by position")
+            keys = pd.Series(np.arange(1, len(frame) + 1), index=frame.index)
+        frame[key] = keys.astype(np.int64)
+        frame = frame.drop_duplicates(subset=[key], keep='last')
+
+        columns = list(frame.columns)
+        updates = [c for c in columns if c != key]
+        column_list = ', '.join(columns)
+        rows = [tuple(_sql_value(v) for v in row) for row in frame.itertuples(index=False, name=None)]
+
+        on_conflict = 'DO NOTHING'
+        if updates:
+            on_conflict = (
+                f"DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in updates)} "
+                f"WHERE {' OR '.join(f'{c} IS NOT excluded.{c}' for c in updates)}"
+            )
+
+        before = self.conn.total_changes
+        self.conn.executemany(
+            f'INSERT INTO "{table}" ({column_list}) VALUES ({", ".join("?" * len(columns))}) '
+            f'ON CONFLICT({key}) {on_conflict}',
+            rows
+        )
+        written = self.conn.total_changes - before
+
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS _sheet_keys (key INTEGER PRIMARY KEY)')
+        self.conn.execute('DELETE FROM _sheet_keys')
+        self.conn.executemany('INSERT INTO _sheet_keys (key) VALUES (?)', ((k,) for k in frame[key].tolist()))
+        deleted = self.conn.execute(
+            f'DELETE FROM "{table}" WHERE {key} NOT IN (SELECT key FROM _sheet_keys)'
+        ).rowcount
+
+        logger.info(f"Upserted '{table}': {len(rows)} rows, {written} written, {deleted} deleted")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict]:
+        if not self.conn:
+            self.connect_db()
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def _query_value(self, sql: str, params: tuple = ()) -> Any:
+        if not self.conn:
+            self.connect_db()
+        row = self.conn.execute(sql, params).fetchone()
+        return row[0] if row is not None else None
+
+    def _value_counts(self, table: str, column: str, where: str = '', params: tuple = (),
+                      limit: Optional[int] = None) -> Dict:
+        """SQL equivalent of Series.value_counts().to_dict()"""
+        condition = f'{column} IS NOT NULL' + (f' AND {where}' if where else '')
+        sql = f'SELECT {column} AS value, COUNT(*) AS n FROM "{table}" WHERE {condition} GROUP BY {column} ORDER BY n DESC'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return {row['value']: row['n'] for row in self._query(sql, params)}
+
+    def _group_mean(self, table: str, group: str, value: str, where: str = '',
+                    params: tuple = (), limit: Optional[int] = None) -> Dict:
+        """SQL equivalent of groupby(group)[value].mean().sort_values(ascending=False)"""
+        condition = f'{group} IS NOT NULL' + (f' AND {where}' if where else '')
+        sql = (f'SELECT {group} AS grp, AVG({value}) AS mean FROM "{table}" WHERE {condition} '
+               f'GROUP BY {group} ORDER BY mean DESC')
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return {row['grp']: row['mean'] for row in self._query(sql, params)}
+
+    def _correlation(self, table: str, x: str, y: str) -> Dict:
+        """SQL equivalent of df[[x, y]].corr()[x].to_dict() (Pearson, pairwise complete)"""
+        row = self._query(f'''
+            SELECT COUNT(*) AS n, SUM({x}) AS sx, SUM({y}) AS sy,
+                   SUM({x} * {x}) AS sxx, SUM({y} * {y}) AS syy, SUM({x} * {y}) AS sxy
+            FROM "{table}" WHERE {x} IS NOT NULL AND {y} IS NOT NULL
+        ''')[0]
+        n = row['n']
+        if n < 2:
+            return {x: float('nan'), y: float('nan')}
+        var_x = row['sxx'] - row['sx'] ** 2 / n
+        var_y = row['syy'] - row['sy'] ** 2 / n
+        covariance = row['sxy'] - row['sx'] * row['sy'] / n
+        r = covariance / math.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else float('nan')
+        return {x: 1.0 if var_x > 0 else float('nan'), y: r}
+
+    def _summary_row(self) -> Optional[Dict]:
+        """Summary statistics from the loaded sheet, else from the database"""
+        if 'Summary_Statistics' in self.datasets and len(self.datasets['Summary_Statistics']) > 0:
+            return self.datasets['Summary_Statistics'].iloc[0].to_dict()
+        rows = self._query('''
+            SELECT total_references AS Total_References, total_researchers AS Total_Researchers,
+                   total_institutions AS Total_Institutions, total_citations AS Total_Citations,
+                   average_citations_per_paper AS Average_Citations_Per_Paper,
+                   average_authors_per_paper AS Average_Authors_Per_Paper,
+                   year_range AS Year_Range, top_categories AS Top_Categories,
+                   statistical_significance_rate AS Statistical_Significance_Rate,
+                   open_access_rate AS Open_Access_Rate
+            FROM summary_statistics WHERE id = 1
+        ''')
+        return rows[0] if rows else None
+
     def get_dataset_stats(self) -> DatasetStats:
         """Get comprehensive dataset statistics"""
         try:
-            if 'Summary_Statistics' in self.datasets:
-                summary_df = self.datasets['Summary_Statistics']
-                if len(summary_df) > 0:
-                    row = summary_df.iloc[0]
-                    
-                    # Parse top categories
-                    top_categories = {}
-                    try:
-                        if isinstance(row['Top_Categories'], str):
-                            top_categories = eval(row['Top_Categories'])
-                    except:
-                        top_categories = {'AI_ML_Methods': 387, 'VC_Decision_Making': 298, 'Startup_Assessment': 245}
-                    
-                    return DatasetStats(
-                        total_references=int(row['Total_References']),
-                        total_researchers=int(row['Total_Researchers']),
-                        total_institutions=int(row['Total_Institutions']),
-                        total_citations=int(row['Total_Citations']),
-                        avg_citations_per_paper=float(row['Average_Citations_Per_Paper']),
-                        statistical_significance_rate=float(row['Statistical_Significance_Rate']),
-                        open_access_rate=float(row['Open_Access_Rate']),
-                        year_range=str(row['Year_Range']),
-                        top_categories=top_categories,
-                        avg_authors_per_paper=float(row['Average_Authors_Per_Paper'])
-                    )
-            
+            row = self._summary_row()
+            if row is not None:
+                # Parse top categories
+                top_categories = {}
+                try:
+                    if isinstance(row['Top_Categories'], str):
+                        top_categories = eval(row['Top_Categories'])
+                except:
+                    top_categories = {'AI_ML_Methods': 387, 'VC_Decision_Making': 298, 'Startup_Assessment': 245}
+
+                return DatasetStats(
+                    total_references=int(row['Total_References']),
+                    total_researchers=int(row['Total_Researchers']),
+                    total_institutions=int(row['Total_Institutions']),
+                    total_citations=int(row['Total_Citations']),
+                    avg_citations_per_paper=float(row['Average_Citations_Per_Paper']),
+                    statistical_significance_rate=float(row['Statistical_Significance_Rate']),
+                    open_access_rate=float(row['Open_Access_Rate']),
+                    year_range=str(row['Year_Range']),
+                    top_categories=top_categories,
+                    avg_authors_per_paper=float(row['Average_Authors_Per_Paper'])
+                )
+
             # Fallback to default values
             return DatasetStats(
                 total_references=1157,
@@ -257,128 +606,168 @@ class VERSSAIDatasetProcessor:
                 top_categories={'AI_ML_Methods': 387, 'VC_Decision_Making': 298, 'Startup_Assessment': 245},
                 avg_authors_per_paper=2.57
             )
-            
+
         except Exception as e:
             logger.error(f"Failed to get dataset stats: {e}")
             return None
-            
-    def search_researchers(self, query: str, filters: Dict = None) -> List[Dict]:
-        """Search researchers by name, institution, or field"""
+
+    def _get_researcher_index(self) -> Optional[ResearcherSearchIndex]:
+        """Inverted index over the researchers sheet (or table), rebuilt if the sheet is replaced"""
+        df = self.datasets.get('Researchers_2311')
+        if df is None:
+            if self.researcher_index is not None:
+                return self.researcher_index
+            if self.conn is None or not self._query_value('SELECT COUNT(*) FROM researchers'):
+                return None
+            df = pd.read_sql('SELECT * FROM researchers ORDER BY researcher_id', self.conn)
+        if self.researcher_index is None or self.researcher_index.researchers is not df:
+            self.researcher_index = ResearcherSearchIndex(df)
+            logger.info(f"Built researcher search index: {len(self.researcher_index)} researchers")
+        return self.researcher_index
+
+    def search_researchers(self, query: str, filters: Dict = None, limit: int = 50) -> List[Dict]:
+        """Search researchers by name, institution, or field (top results by h-index)"""
         try:
-            if 'Researchers_2311' not in self.datasets:
+            index = self._get_researcher_index()
+            if index is None:
                 return []
-                
-            df = self.datasets['Researchers_2311']
-            
-            # Apply text search
-            if query:
-                mask = (
-                    df['name'].str.contains(query, case=False, na=False) |
-                    df['institution'].str.contains(query, case=False, na=False) |
-                    df['primary_field'].str.contains(query, case=False, na=False)
-                )
-                df = df[mask]
-            
-            # Apply filters
-            if filters:
-                if 'min_h_index' in filters:
-                    df = df[df['h_index'] >= filters['min_h_index']]
-                if 'primary_field' in filters:
-                    df = df[df['primary_field'] == filters['primary_field']]
-                if 'institution' in filters:
-                    df = df[df['institution'].str.contains(filters['institution'], case=False, na=False)]
-            
-            # Sort by h-index descending
-            df = df.sort_values('h_index', ascending=False)
-            
-            # Convert to dict and return top 50
-            results = df.head(50).to_dict('records')
-            return results
-            
+
+            return index.search(query, filters, limit)
+
         except Exception as e:
             logger.error(f"Failed to search researchers: {e}")
             return []
-            
+
+    def search_papers(self, query: str, limit: int = 20) -> List[Dict]:
+        """Full-text search over paper titles and abstracts, best matches first"""
+        try:
+            if not self.fts_enabled:
+                return []
+            return self._query('''
+                SELECT r.ref_id, r.title, r.authors, r.year, r.venue, r.category, r.citation_count,
+                       bm25(references_fts) AS relevance
+                FROM references_fts
+                JOIN "references" r ON r.ref_id = references_fts.rowid
+                WHERE references_fts MATCH ?
+                ORDER BY relevance
+                LIMIT ?
+            ''', (_fts_query(query), limit))
+        except Exception as e:
+            logger.error(f"Failed to search papers: {e}")
+            return []
+
+    def search_researcher_names(self, query: str, limit: int = 20) -> List[Dict]:
+        """Full-text search over researcher names"""
+        try:
+            if not self.fts_enabled:
+                return []
+            return self._query('''
+                SELECT r.researcher_id, r.name, r.institution, r.primary_field, r.h_index
+                FROM researchers_fts
+                JOIN researchers r ON r.researcher_id = researchers_fts.rowid
+                WHERE researchers_fts MATCH ?
+                ORDER BY bm25(researchers_fts), r.h_index DESC
+                LIMIT ?
+            ''', (_fts_query(query), limit))
+        except Exception as e:
+            logger.error(f"Failed to search researcher names: {e}")
+            return []
+
     def get_institution_analysis(self) -> Dict:
         """Get institution performance analysis"""
         try:
-            if 'Institutions' not in self.datasets:
+            total = self._query_value('SELECT COUNT(*) FROM institutions')
+            if not total:
                 return {}
-                
-            df = self.datasets['Institutions']
-            
+
             analysis = {
-                'total_institutions': len(df),
-                'countries': df['country'].value_counts().to_dict(),
-                'avg_ranking': df['ranking'].mean(),
-                'top_institutions': df.nlargest(10, 'research_output')[
-                    ['name', 'country', 'ranking', 'research_output', 'collaboration_score']
-                ].to_dict('records'),
-                'specializations': df['specialization'].value_counts().to_dict(),
-                'funding_distribution': df['funding_level'].value_counts().to_dict()
+                'total_institutions': total,
+                'countries': self._value_counts('institutions', 'country'),
+                'avg_ranking': self._query_value('SELECT AVG(ranking) FROM institutions'),
+                'top_institutions': self._query('''
+                    SELECT name, country, ranking, research_output, collaboration_score
+                    FROM institutions WHERE research_output IS NOT NULL
+                    ORDER BY research_output DESC LIMIT 10
+                '''),
+                'specializations': self._value_counts('institutions', 'specialization'),
+                'funding_distribution': self._value_counts('institutions', 'funding_level')
             }
-            
+
             return analysis
-            
+
         except Exception as e:
             logger.error(f"Failed to get institution analysis: {e}")
             return {}
-            
+
     def get_research_insights(self, category: str = None) -> Dict:
         """Get research insights and trends"""
         try:
-            if 'References_1157' not in self.datasets:
+            if not self._query_value('SELECT COUNT(*) FROM "references"'):
                 return {}
-                
-            df = self.datasets['References_1157']
-            
-            if category:
-                df = df[df['category'] == category]
-            
+
+            where, params = ('category = ?', (category,)) if category else ('', ())
+            condition = f'WHERE {where}' if where else ''
+            totals = self._query(f'''
+                SELECT COUNT(*) AS total_papers, AVG(citation_count) AS avg_citations,
+                       AVG(statistical_significance) AS significance_rate
+                FROM "references" {condition}
+            ''', params)[0]
+
             insights = {
-                'total_papers': len(df),
-                'avg_citations': df['citation_count'].mean(),
-                'year_distribution': df['year'].value_counts().sort_index().to_dict(),
-                'venue_distribution': df['venue'].value_counts().head(10).to_dict(),
-                'methodology_distribution': df['methodology'].value_counts().to_dict(),
-                'top_cited_papers': df.nlargest(10, 'citation_count')[
-                    ['title', 'authors', 'year', 'citation_count', 'venue']
-                ].to_dict('records'),
-                'institution_tier_distribution': df['institution_tier'].value_counts().to_dict(),
-                'statistical_significance_rate': df['statistical_significance'].mean()
+                'total_papers': totals['total_papers'],
+                'avg_citations': totals['avg_citations'],
+                'year_distribution': {
+                    row['year']: row['n'] for row in self._query(f'''
+                        SELECT year, COUNT(*) AS n FROM "references"
+                        WHERE year IS NOT NULL {'AND ' + where if where else ''}
+                        GROUP BY year ORDER BY year
+                    ''', params)
+                },
+                'venue_distribution': self._value_counts('references', 'venue', where, params, limit=10),
+                'methodology_distribution': self._value_counts('references', 'methodology', where, params),
+                'top_cited_papers': self._query(f'''
+                    SELECT title, authors, year, citation_count, venue FROM "references"
+                    WHERE citation_count IS NOT NULL {'AND ' + where if where else ''}
+                    ORDER BY citation_count DESC LIMIT 10
+                ''', params),
+                'institution_tier_distribution': self._value_counts('references', 'institution_tier', where, params),
+                'statistical_significance_rate': totals['significance_rate']
             }
-            
+
             return insights
-            
+
         except Exception as e:
             logger.error(f"Failed to get research insights: {e}")
             return {}
-            
+
     def get_citation_network_analysis(self) -> Dict:
         """Analyze citation network patterns"""
         try:
-            if 'Citation_Network' not in self.datasets:
+            totals = self._query('''
+                SELECT COUNT(*) AS total, COUNT(DISTINCT citing_paper_id) AS citing,
+                       COUNT(DISTINCT cited_paper_id) AS cited, AVG(self_citation) AS self_rate
+                FROM citation_network
+            ''')[0]
+            if not totals['total']:
                 return {}
-                
-            df = self.datasets['Citation_Network']
-            
+
             analysis = {
-                'total_citations': len(df),
-                'unique_citing_papers': df['citing_paper_id'].nunique(),
-                'unique_cited_papers': df['cited_paper_id'].nunique(),
-                'self_citation_rate': df['self_citation'].mean(),
-                'citation_contexts': df['citation_context'].value_counts().to_dict(),
-                'citation_sentiments': df['citation_sentiment'].value_counts().to_dict(),
-                'most_cited_papers': df['cited_paper_id'].value_counts().head(10).to_dict(),
-                'most_citing_papers': df['citing_paper_id'].value_counts().head(10).to_dict()
+                'total_citations': totals['total'],
+                'unique_citing_papers': totals['citing'],
+                'unique_cited_papers': totals['cited'],
+                'self_citation_rate': totals['self_rate'],
+                'citation_contexts': self._value_counts('citation_network', 'citation_context'),
+                'citation_sentiments': self._value_counts('citation_network', 'citation_sentiment'),
+                'most_cited_papers': self._value_counts('citation_network', 'cited_paper_id', limit=10),
+                'most_citing_papers': self._value_counts('citation_network', 'citing_paper_id', limit=10)
             }
-            
+
             return analysis
-            
+
         except Exception as e:
             logger.error(f"Failed to analyze citation network: {e}")
             return {}
-            
+
     def generate_vc_insights(self) -> Dict:
         """Generate VC-specific insights from the dataset"""
         try:
@@ -389,113 +778,111 @@ class VERSSAIDatasetProcessor:
                 'collaboration_networks': self._analyze_collaboration_patterns(),
                 'funding_indicators': self._analyze_funding_indicators()
             }
-            
+
             return insights
-            
+
         except Exception as e:
             logger.error(f"Failed to generate VC insights: {e}")
             return {}
-            
+
     def _analyze_researcher_potential(self) -> Dict:
         """Analyze researcher potential for VC investment"""
-        if 'Researchers_2311' not in self.datasets:
+        if not self._query_value('SELECT COUNT(*) FROM researchers'):
             return {}
-            
-        df = self.datasets['Researchers_2311']
-        
-        # Score researchers based on multiple factors
-        df['vc_score'] = (
-            df['h_index'] * 0.3 +
-            np.log1p(df['total_citations']) * 0.25 +
-            df['collaboration_count'] * 0.2 +
-            df['years_active'] * 0.1 +
-            df['recent_papers'] * 0.15
-        )
-        
-        top_researchers = df.nlargest(20, 'vc_score')[
-            ['name', 'institution', 'h_index', 'total_citations', 'primary_field', 'industry_experience', 'vc_score']
-        ].to_dict('records')
-        
+
+        # Researchers are scored by the researcher_vc_scores view
+        top_researchers = self._query('''
+            SELECT name, institution, h_index, total_citations, primary_field, industry_experience, vc_score
+            FROM researcher_vc_scores WHERE vc_score IS NOT NULL
+            ORDER BY vc_score DESC LIMIT 20
+        ''')
+
         return {
             'top_potential_researchers': top_researchers,
-            'field_distribution': df.groupby('primary_field')['vc_score'].mean().sort_values(ascending=False).to_dict(),
-            'industry_experience_impact': df.groupby('industry_experience')['vc_score'].mean().to_dict()
+            'field_distribution': self._group_mean('researcher_vc_scores', 'primary_field', 'vc_score'),
+            'industry_experience_impact': {
+                bool(group): mean for group, mean in self._group_mean('researcher_vc_scores', 'industry_experience', 'vc_score').items()
+            }
         }
-        
+
     def _analyze_institution_performance(self) -> Dict:
         """Analyze institution performance for VC context"""
-        if 'Institutions' not in self.datasets:
+        if not self._query_value('SELECT COUNT(*) FROM institutions'):
             return {}
-            
-        df = self.datasets['Institutions']
-        
-        # Calculate VC attractiveness score
-        df['vc_attractiveness'] = (
-            (1000 - df['ranking']) * 0.4 +  # Lower ranking is better
-            df['research_output'] * 0.3 +
-            df['collaboration_score'] * 200 * 0.2 +
-            df['researcher_count'] * 0.1
-        )
-        
+
+        # VC attractiveness comes from the institution_vc_scores view
         return {
-            'top_institutions': df.nlargest(10, 'vc_attractiveness')[
-                ['name', 'country', 'ranking', 'specialization', 'vc_attractiveness']
-            ].to_dict('records'),
-            'specialization_performance': df.groupby('specialization')['vc_attractiveness'].mean().sort_values(ascending=False).to_dict(),
-            'country_performance': df.groupby('country')['vc_attractiveness'].mean().sort_values(ascending=False).to_dict()
+            'top_institutions': self._query('''
+                SELECT name, country, ranking, specialization, vc_attractiveness
+                FROM institution_vc_scores WHERE vc_attractiveness IS NOT NULL
+                ORDER BY vc_attractiveness DESC LIMIT 10
+            '''),
+            'specialization_performance': self._group_mean('institution_vc_scores', 'specialization', 'vc_attractiveness'),
+            'country_performance': self._group_mean('institution_vc_scores', 'country', 'vc_attractiveness')
         }
-        
+
     def _analyze_research_trends(self) -> Dict:
         """Analyze research trends for VC investment"""
-        if 'References_1157' not in self.datasets:
+        if not self._query_value('SELECT COUNT(*) FROM "references"'):
             return {}
-            
-        df = self.datasets['References_1157']
-        
+
         # Calculate trend momentum
-        recent_years = df[df['year'] >= 2020]
-        
+        yearly_counts = self._query(
+            'SELECT year, COUNT(*) AS n FROM "references" WHERE year IS NOT NULL GROUP BY year ORDER BY year'
+        )
+        yearly_growth = {}
+        previous = None
+        for row in yearly_counts:
+            yearly_growth[row['year']] = (row['n'] - previous) / previous if previous else 0.0
+            previous = row['n']
+
         return {
-            'hot_categories': recent_years.groupby('category')['citation_count'].mean().sort_values(ascending=False).to_dict(),
-            'emerging_methodologies': recent_years['methodology'].value_counts().head(10).to_dict(),
-            'high_impact_venues': df.groupby('venue')['citation_count'].mean().sort_values(ascending=False).head(10).to_dict(),
-            'yearly_growth': df.groupby('year').size().pct_change().fillna(0).to_dict()
+            'hot_categories': self._group_mean('references', 'category', 'citation_count', 'year >= 2020'),
+            'emerging_methodologies': self._value_counts('references', 'methodology', 'year >= 2020', limit=10),
+            'high_impact_venues': self._group_mean('references', 'venue', 'citation_count', limit=10),
+            'yearly_growth': yearly_growth
         }
-        
+
     def _analyze_collaboration_patterns(self) -> Dict:
         """Analyze collaboration patterns"""
-        if 'Researchers_2311' not in self.datasets:
+        if not self._query_value('SELECT COUNT(*) FROM researchers'):
             return {}
-            
-        df = self.datasets['Researchers_2311']
-        
+
         return {
-            'avg_collaborations_by_field': df.groupby('primary_field')['collaboration_count'].mean().sort_values(ascending=False).to_dict(),
-            'collaboration_vs_impact': df[['collaboration_count', 'h_index']].corr()['collaboration_count'].to_dict(),
-            'top_collaborators': df.nlargest(20, 'collaboration_count')[
-                ['name', 'institution', 'collaboration_count', 'h_index']
-            ].to_dict('records')
+            'avg_collaborations_by_field': self._group_mean('researchers', 'primary_field', 'collaboration_count'),
+            'collaboration_vs_impact': self._correlation('researchers', 'collaboration_count', 'h_index'),
+            'top_collaborators': self._query('''
+                SELECT name, institution, collaboration_count, h_index FROM researchers
+                WHERE collaboration_count IS NOT NULL
+                ORDER BY collaboration_count DESC LIMIT 20
+            ''')
         }
-        
+
     def _analyze_funding_indicators(self) -> Dict:
         """Analyze funding-related indicators"""
-        if 'Researchers_2311' not in self.datasets:
+        if not self._query_value('SELECT COUNT(*) FROM researchers'):
             return {}
-            
-        df = self.datasets['Researchers_2311']
-        
+
         return {
-            'avg_funding_by_field': df.groupby('primary_field')['funding_received'].mean().sort_values(ascending=False).to_dict(),
-            'funding_vs_output': df[['funding_received', 'recent_papers']].corr()['funding_received'].to_dict(),
-            'high_funded_researchers': df.nlargest(20, 'funding_received')[
-                ['name', 'institution', 'funding_received', 'recent_papers', 'h_index']
-            ].to_dict('records')
+            'avg_funding_by_field': self._group_mean('researchers', 'primary_field', 'funding_received'),
+            'funding_vs_output': self._correlation('researchers', 'funding_received', 'recent_papers'),
+            'high_funded_researchers': self._query('''
+                SELECT name, institution, funding_received, recent_papers, h_index FROM researchers
+                WHERE funding_received IS NOT NULL
+                ORDER BY funding_received DESC LIMIT 20
+            ''')
         }
 
 # Initialize the processor
-def initialize_verssai_dataset(excel_path: str = None) -> VERSSAIDatasetProcessor:
-    """Initialize the VERSSAI dataset processor"""
-    if excel_path is None:
+def initialize_verssai_dataset(excel_path: str = None, db_path: str = "verssai_dataset.db") -> VERSSAIDatasetProcessor:
+    """
+    Initialize the VERSSAI dataset processor
+
+    With VERSSAI_DATASET_DB_ONLY set, or when no workbook is found, the processor
+    serves an already populated database without loading the workbook into memory.
+    """
+    db_only = os.getenv("VERSSAI_DATASET_DB_ONLY", "").lower() in ("1", "true", "yes")
+    if excel_path is None and not db_only:
         # Try to find the Excel file in common locations
         possible_paths = [
             "VERSSAI_Massive_Dataset_Complete.xlsx",
@@ -509,11 +896,10 @@ def initialize_verssai_dataset(excel_path: str = None) -> VERSSAIDatasetProcesso
                 excel_path = path
                 break
                 
-    if excel_path is None:
-        logger.error("VERSSAI dataset Excel file not found")
-        return None
+    if db_only or excel_path is None:
+        return _initialize_from_database(db_path)
         
-    processor = VERSSAIDatasetProcessor(excel_path)
+    processor = VERSSAIDatasetProcessor(excel_path, db_path)
     
     # Load and process data
     if processor.load_excel_data():
@@ -525,6 +911,20 @@ def initialize_verssai_dataset(excel_path: str = None) -> VERSSAIDatasetProcesso
         logger.error("Failed to initialize VERSSAI dataset")
         return None
 
+def _initialize_from_database(db_path: str) -> Optional[VERSSAIDatasetProcessor]:
+    if not Path(db_path).exists():
+        logger.error("VERSSAI dataset Excel file not found")
+        return None
+
+    processor = VERSSAIDatasetProcessor.from_database(db_path)
+    if processor.conn is None or processor._query_value('PRAGMA user_version') < SCHEMA_VERSION:
+        logger.error(f"Database {db_path} is missing or predates schema version {SCHEMA_VERSION}, import the workbook first")
+        return None
+
+    processor._load_precomputed(processor.get_dataset_version())
+    logger.info(f"VERSSAI dataset served from database {db_path}")
+    return processor
+
 if __name__ == "__main__":
     # Test the processor
     processor = initialize_verssai_dataset()
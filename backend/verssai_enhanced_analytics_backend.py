@@ -7,10 +7,14 @@ Advanced VC analytics, portfolio management, and AI-powered insights
 import asyncio
 import json
 import logging
+import heapq
 import os
+import queue
 import sqlite3
+import threading
 import time
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import aiohttp
@@ -52,6 +56,7 @@ app.add_middleware(
 class Config:
     DATABASE_PATH = './verssai_analytics.db'
     PORTFOLIO_DB_PATH = './portfolio_data.db'
+    DB_POOL_SIZE = int(os.getenv('ANALYTICS_DB_POOL_SIZE', '8'))
     MARKET_DATA_API_KEY = os.getenv('MARKET_DATA_API_KEY', 'demo_key')
     
     # AI Model Configuration
@@ -103,12 +108,116 @@ class AnalyticsRequest(BaseModel):
 active_connections: Dict[str, WebSocket] = {}
 real_time_data: Dict[str, Any] = {}
 
+class SQLiteConnectionPool:
+    """Long-lived SQLite connections in WAL mode, shared across requests"""
+    
+    def __init__(self, db_path: str, size: int = 8, timeout: float = 30.0):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.timeout)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success and rolls back on error"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._idle.get(timeout=self.timeout)
+        
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._idle.put(conn)
+
+
+class PortfolioAggregates:
+    """Portfolio, sector and stage totals maintained incrementally as companies change"""
+    
+    def __init__(self):
+        self.companies: Dict[str, Dict[str, Any]] = {}
+        self.summary = self._empty_totals()
+        self.sectors: Dict[str, Dict[str, float]] = {}
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.version = 0
+    
+    @staticmethod
+    def _empty_totals() -> Dict[str, float]:
+        return {'valuation': 0.0, 'invested': 0.0, 'count': 0, 'risk_sum': 0.0, 'risk_count': 0}
+    
+    @staticmethod
+    def _contribute(totals: Dict[str, float], company: Dict[str, Any], sign: int):
+        totals['valuation'] += sign * (company['current_valuation'] or 0.0)
+        totals['invested'] += sign * (company['investment_amount'] or 0.0)
+        totals['count'] += sign
+        if company['risk_score'] is not None:
+            totals['risk_sum'] += sign * company['risk_score']
+            totals['risk_count'] += sign
+    
+    def _apply(self, company: Dict[str, Any], sign: int):
+        self._contribute(self.summary, company, sign)
+        for groups, key in ((self.sectors, company['sector']), (self.stages, company['stage'])):
+            totals = groups.setdefault(key, self._empty_totals())
+            self._contribute(totals, company, sign)
+            if totals['count'] <= 0:
+                del groups[key]
+    
+    def load(self, companies: List[Dict[str, Any]]):
+        """Rebuild every aggregate from a full table scan"""
+        self.companies = {}
+        self.summary = self._empty_totals()
+        self.sectors = {}
+        self.stages = {}
+        for company in companies:
+            self.upsert(company)
+        self.version += 1
+    
+    def upsert(self, company: Dict[str, Any]):
+        """Apply an inserted or updated company: subtract its old contribution, add the new one"""
+        previous = self.companies.get(company['id'])
+        if previous is not None:
+            self._apply(previous, -1)
+        self._apply(company, 1)
+        self.companies[company['id']] = company
+        self.version += 1
+    
+    def remove(self, company_id: str):
+        previous = self.companies.pop(company_id, None)
+        if previous is not None:
+            self._apply(previous, -1)
+            self.version += 1
+    
+    @staticmethod
+    def avg_risk(totals: Dict[str, float]) -> Optional[float]:
+        return totals['risk_sum'] / totals['risk_count'] if totals['risk_count'] else None
+    
+    def top_companies(self, n: int = 10) -> List[Dict[str, Any]]:
+        return heapq.nlargest(n, self.companies.values(), key=lambda c: c['current_valuation'] or 0.0)
+
+
 class EnhancedAnalyticsEngine:
     """Advanced analytics engine for VC intelligence"""
     
     def __init__(self):
         self.db_path = config.DATABASE_PATH
         self.portfolio_db_path = config.PORTFOLIO_DB_PATH
+        self.pool = SQLiteConnectionPool(self.db_path, config.DB_POOL_SIZE)
+        self.aggregates = PortfolioAggregates()
+        self._analytics: Optional[Dict[str, Any]] = None
+        self._analytics_version = -1
         self.init_databases()
         self.ai_models = {}
         self.market_data_cache = {}
@@ -116,363 +225,378 @@ class EnhancedAnalyticsEngine:
     def init_databases(self):
         """Initialize analytics and portfolio databases"""
         # Analytics Database
-        conn = sqlite3.connect(self.db_path)
-        conn.executescript('''
-            CREATE TABLE IF NOT EXISTS portfolio_companies (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                stage TEXT,
-                investment_amount REAL,
-                current_valuation REAL,
-                sector TEXT,
-                founded_date TEXT,
-                last_funding_date TEXT,
-                performance_data TEXT,
-                risk_score REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            
-            CREATE TABLE IF NOT EXISTS market_analysis (
-                id TEXT PRIMARY KEY,
-                sector TEXT,
-                analysis_date TEXT,
-                growth_rate REAL,
-                deal_count INTEGER,
-                avg_valuation REAL,
-                sentiment TEXT,
-                trends TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            
-            CREATE TABLE IF NOT EXISTS ai_insights (
-                id TEXT PRIMARY KEY,
-                type TEXT,
-                priority TEXT,
-                title TEXT,
-                description TEXT,
-                confidence REAL,
-                action_items TEXT,
-                timeline TEXT,
-                impact TEXT,
-                tags TEXT,
-                status TEXT DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            
-            CREATE TABLE IF NOT EXISTS performance_metrics (
-                id TEXT PRIMARY KEY,
-                company_id TEXT,
-                metric_name TEXT,
-                metric_value REAL,
-                metric_date TEXT,
-                benchmark_value REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (company_id) REFERENCES portfolio_companies (id)
-            );
-            
-            CREATE TABLE IF NOT EXISTS deal_pipeline (
-                id TEXT PRIMARY KEY,
-                company_name TEXT,
-                stage TEXT,
-                deal_size REAL,
-                probability REAL,
-                close_date TEXT,
-                sector TEXT,
-                source TEXT,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        ''')
-        conn.commit()
-        conn.close()
+        with self.pool.connection() as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS portfolio_companies (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    stage TEXT,
+                    investment_amount REAL,
+                    current_valuation REAL,
+                    sector TEXT,
+                    founded_date TEXT,
+                    last_funding_date TEXT,
+                    performance_data TEXT,
+                    risk_score REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                
+                CREATE TABLE IF NOT EXISTS market_analysis (
+                    id TEXT PRIMARY KEY,
+                    sector TEXT,
+                    analysis_date TEXT,
+                    growth_rate REAL,
+                    deal_count INTEGER,
+                    avg_valuation REAL,
+                    sentiment TEXT,
+                    trends TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                
+                CREATE TABLE IF NOT EXISTS ai_insights (
+                    id TEXT PRIMARY KEY,
+                    type TEXT,
+                    priority TEXT,
+                    title TEXT,
+                    description TEXT,
+                    confidence REAL,
+                    action_items TEXT,
+                    timeline TEXT,
+                    impact TEXT,
+                    tags TEXT,
+                    status TEXT DEFAULT 'active',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                
+                CREATE TABLE IF NOT EXISTS performance_metrics (
+                    id TEXT PRIMARY KEY,
+                    company_id TEXT,
+                    metric_name TEXT,
+                    metric_value REAL,
+                    metric_date TEXT,
+                    benchmark_value REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (company_id) REFERENCES portfolio_companies (id)
+                );
+                
+                CREATE TABLE IF NOT EXISTS deal_pipeline (
+                    id TEXT PRIMARY KEY,
+                    company_name TEXT,
+                    stage TEXT,
+                    deal_size REAL,
+                    probability REAL,
+                    close_date TEXT,
+                    sector TEXT,
+                    source TEXT,
+                    notes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            ''')
         
         # Populate with sample data if empty
         self.populate_sample_data()
+        self.load_portfolio_aggregates()
     
     def populate_sample_data(self):
         """Populate database with realistic VC portfolio data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if data already exists
-        cursor.execute("SELECT COUNT(*) FROM portfolio_companies")
-        if cursor.fetchone()[0] > 0:
-            conn.close()
-            return
-        
-        # Sample portfolio companies
-        sample_companies = [
-            {
-                'id': 'comp_001',
-                'name': 'DataFoundry AI',
-                'stage': 'Series A',
-                'investment_amount': 5.0,
-                'current_valuation': 45.0,
-                'sector': 'AI/ML',
-                'founded_date': '2022-03-15',
-                'last_funding_date': '2024-01-20',
-                'performance_data': json.dumps({
-                    'arr': 8.5, 'growth_rate': 150, 'burn_rate': 0.8, 
-                    'runway_months': 24, 'team_size': 42
-                }),
-                'risk_score': 0.25
-            },
-            {
-                'id': 'comp_002', 
-                'name': 'MedAI Corp',
-                'stage': 'Series B',
-                'investment_amount': 12.0,
-                'current_valuation': 120.0,
-                'sector': 'HealthTech',
-                'founded_date': '2021-08-10',
-                'last_funding_date': '2024-03-05',
-                'performance_data': json.dumps({
-                    'arr': 25.3, 'growth_rate': 89, 'burn_rate': 1.8,
-                    'runway_months': 28, 'team_size': 87
-                }),
-                'risk_score': 0.15
-            },
-            {
-                'id': 'comp_003',
-                'name': 'FinSecure',
-                'stage': 'Seed',
-                'investment_amount': 2.5,
-                'current_valuation': 15.0,
-                'sector': 'FinTech',
-                'founded_date': '2023-01-12',
-                'last_funding_date': '2023-08-30',
-                'performance_data': json.dumps({
-                    'arr': 1.2, 'growth_rate': 245, 'burn_rate': 0.3,
-                    'runway_months': 18, 'team_size': 23
-                }),
-                'risk_score': 0.45
-            },
-            {
-                'id': 'comp_004',
-                'name': 'CleanEnergy Systems',
-                'stage': 'Series A',
-                'investment_amount': 8.0,
-                'current_valuation': 65.0,
-                'sector': 'CleanTech',
-                'founded_date': '2021-11-03',
-                'last_funding_date': '2023-12-15',
-                'performance_data': json.dumps({
-                    'arr': 12.8, 'growth_rate': 123, 'burn_rate': 1.1,
-                    'runway_months': 22, 'team_size': 58
-                }),
-                'risk_score': 0.30
-            },
-            {
-                'id': 'comp_005',
-                'name': 'EduTech Pro',
-                'stage': 'Pre-Seed',
-                'investment_amount': 0.75,
-                'current_valuation': 4.5,
-                'sector': 'EdTech',
-                'founded_date': '2024-02-20',
-                'last_funding_date': '2024-06-10',
-                'performance_data': json.dumps({
-                    'arr': 0.4, 'growth_rate': 189, 'burn_rate': 0.15,
-                    'runway_months': 15, 'team_size': 12
-                }),
-                'risk_score': 0.55
-            }
-        ]
-        
-        for company in sample_companies:
-            cursor.execute('''
-                INSERT INTO portfolio_companies 
-                (id, name, stage, investment_amount, current_valuation, sector, 
-                 founded_date, last_funding_date, performance_data, risk_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                company['id'], company['name'], company['stage'],
-                company['investment_amount'], company['current_valuation'],
-                company['sector'], company['founded_date'], 
-                company['last_funding_date'], company['performance_data'],
-                company['risk_score']
-            ))
-        
-        # Sample market analysis data
-        sample_market_data = [
-            {
-                'id': 'market_001',
-                'sector': 'AI/ML',
-                'analysis_date': '2024-08-01',
-                'growth_rate': 34.5,
-                'deal_count': 156,
-                'avg_valuation': 12.4,
-                'sentiment': 'bullish',
-                'trends': json.dumps(['Infrastructure AI', 'LLM Applications', 'Edge Computing'])
-            },
-            {
-                'id': 'market_002',
-                'sector': 'FinTech',
-                'analysis_date': '2024-08-01',
-                'growth_rate': 18.2,
-                'deal_count': 89,
-                'avg_valuation': 8.7,
-                'sentiment': 'positive',
-                'trends': json.dumps(['Embedded Finance', 'RegTech', 'Digital Banking'])
-            },
-            {
-                'id': 'market_003',
-                'sector': 'HealthTech',
-                'analysis_date': '2024-08-01',
-                'growth_rate': 28.1,
-                'deal_count': 67,
-                'avg_valuation': 15.2,
-                'sentiment': 'bullish',
-                'trends': json.dumps(['Digital Therapeutics', 'AI Diagnostics', 'Telehealth'])
-            }
-        ]
-        
-        for market in sample_market_data:
-            cursor.execute('''
-                INSERT INTO market_analysis 
-                (id, sector, analysis_date, growth_rate, deal_count, 
-                 avg_valuation, sentiment, trends)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                market['id'], market['sector'], market['analysis_date'],
-                market['growth_rate'], market['deal_count'],
-                market['avg_valuation'], market['sentiment'], market['trends']
-            ))
-        
-        # Sample AI insights
-        sample_insights = [
-            {
-                'id': 'insight_001',
-                'type': 'opportunity',
-                'priority': 'high',
-                'title': 'High-Potential AI Infrastructure Deal',
-                'description': 'DataFoundry AI shows exceptional growth metrics and strong market fit. Similar companies in our portfolio achieved 3.2x returns.',
-                'confidence': 0.94,
-                'action_items': json.dumps(['Schedule technical due diligence', 'Prepare term sheet', 'Connect with other investors']),
-                'timeline': '2 weeks',
-                'impact': 'High',
-                'tags': json.dumps(['AI Infrastructure', 'Enterprise', 'Growth Stage'])
-            },
-            {
-                'id': 'insight_002',
-                'type': 'risk',
-                'priority': 'medium',
-                'title': 'Portfolio Concentration Risk',
-                'description': 'AI/ML startups represent 38% of portfolio value. Consider diversification strategies.',
-                'confidence': 0.87,
-                'action_items': json.dumps(['Review allocation strategy', 'Identify diversification opportunities', 'Assess market correlation']),
-                'timeline': '1 month',
-                'impact': 'Medium',
-                'tags': json.dumps(['Risk Management', 'Diversification', 'Portfolio Strategy'])
-            }
-        ]
-        
-        for insight in sample_insights:
-            cursor.execute('''
-                INSERT INTO ai_insights 
-                (id, type, priority, title, description, confidence, 
-                 action_items, timeline, impact, tags)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                insight['id'], insight['type'], insight['priority'],
-                insight['title'], insight['description'], insight['confidence'],
-                insight['action_items'], insight['timeline'], 
-                insight['impact'], insight['tags']
-            ))
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Check if data already exists
+            cursor.execute("SELECT COUNT(*) FROM portfolio_companies")
+            if cursor.fetchone()[0] > 0:
+                return
+            
+            # Sample portfolio companies
+            sample_companies = [
+                {
+                    'id': 'comp_001',
+                    'name': 'DataFoundry AI',
+                    'stage': 'Series A',
+                    'investment_amount': 5.0,
+                    'current_valuation': 45.0,
+                    'sector': 'AI/ML',
+                    'founded_date': '2022-03-15',
+                    'last_funding_date': '2024-01-20',
+                    'performance_data': json.dumps({
+                        'arr': 8.5, 'growth_rate': 150, 'burn_rate': 0.8, 
+                        'runway_months': 24, 'team_size': 42
+                    }),
+                    'risk_score': 0.25
+                },
+                {
+                    'id': 'comp_002', 
+                    'name': 'MedAI Corp',
+                    'stage': 'Series B',
+                    'investment_amount': 12.0,
+                    'current_valuation': 120.0,
+                    'sector': 'HealthTech',
+                    'founded_date': '2021-08-10',
+                    'last_funding_date': '2024-03-05',
+                    'performance_data': json.dumps({
+                        'arr': 25.3, 'growth_rate': 89, 'burn_rate': 1.8,
+                        'runway_months': 28, 'team_size': 87
+                    }),
+                    'risk_score': 0.15
+                },
+                {
+                    'id': 'comp_003',
+                    'name': 'FinSecure',
+                    'stage': 'Seed',
+                    'investment_amount': 2.5,
+                    'current_valuation': 15.0,
+                    'sector': 'FinTech',
+                    'founded_date': '2023-01-12',
+                    'last_funding_date': '2023-08-30',
+                    'performance_data': json.dumps({
+                        'arr': 1.2, 'growth_rate': 245, 'burn_rate': 0.3,
+                        'runway_months': 18, 'team_size': 23
+                    }),
+                    'risk_score': 0.45
+                },
+                {
+                    'id': 'comp_004',
+                    'name': 'CleanEnergy Systems',
+                    'stage': 'Series A',
+                    'investment_amount': 8.0,
+                    'current_valuation': 65.0,
+                    'sector': 'CleanTech',
+                    'founded_date': '2021-11-03',
+                    'last_funding_date': '2023-12-15',
+                    'performance_data': json.dumps({
+                        'arr': 12.8, 'growth_rate': 123, 'burn_rate': 1.1,
+                        'runway_months': 22, 'team_size': 58
+                    }),
+                    'risk_score': 0.30
+                },
+                {
+                    'id': 'comp_005',
+                    'name': 'EduTech Pro',
+                    'stage': 'Pre-Seed',
+                    'investment_amount': 0.75,
+                    'current_valuation': 4.5,
+                    'sector': 'EdTech',
+                    'founded_date': '2024-02-20',
+                    'last_funding_date': '2024-06-10',
+                    'performance_data': json.dumps({
+                        'arr': 0.4, 'growth_rate': 189, 'burn_rate': 0.15,
+                        'runway_months': 15, 'team_size': 12
+                    }),
+                    'risk_score': 0.55
+                }
+            ]
+            
+            for company in sample_companies:
+                cursor.execute('''
+                    INSERT INTO portfolio_companies 
+                    (id, name, stage, investment_amount, current_valuation, sector, 
+                     founded_date, last_funding_date, performance_data, risk_score)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    company['id'], company['name'], company['stage'],
+                    company['investment_amount'], company['current_valuation'],
+                    company['sector'], company['founded_date'], 
+                    company['last_funding_date'], company['performance_data'],
+                    company['risk_score']
+                ))
+            
+            # Sample market analysis data
+            sample_market_data = [
+                {
+                    'id': 'market_001',
+                    'sector': 'AI/ML',
+                    'analysis_date': '2024-08-01',
+                    'growth_rate': 34.5,
+                    'deal_count': 156,
+                    'avg_valuation': 12.4,
+                    'sentiment': 'bullish',
+                    'trends': json.dumps(['Infrastructure AI', 'LLM Applications', 'Edge Computing'])
+                },
+                {
+                    'id': 'market_002',
+                    'sector': 'FinTech',
+                    'analysis_date': '2024-08-01',
+                    'growth_rate': 18.2,
+                    'deal_count': 89,
+                    'avg_valuation': 8.7,
+                    'sentiment': 'positive',
+                    'trends': json.dumps(['Embedded Finance', 'RegTech', 'Digital Banking'])
+                },
+                {
+                    'id': 'market_003',
+                    'sector': 'HealthTech',
+                    'analysis_date': '2024-08-01',
+                    'growth_rate': 28.1,
+                    'deal_count': 67,
+                    'avg_valuation': 15.2,
+                    'sentiment': 'bullish',
+                    'trends': json.dumps(['Digital Therapeutics', 'AI Diagnostics', 'Telehealth'])
+                }
+            ]
+            
+            for market in sample_market_data:
+                cursor.execute('''
+                    INSERT INTO market_analysis 
+                    (id, sector, analysis_date, growth_rate, deal_count, 
+                     avg_valuation, sentiment, trends)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    market['id'], market['sector'], market['analysis_date'],
+                    market['growth_rate'], market['deal_count'],
+                    market['avg_valuation'], market['sentiment'], market['trends']
+                ))
+            
+            # Sample AI insights
+            sample_insights = [
+                {
+                    'id': 'insight_001',
+                    'type': 'opportunity',
+                    'priority': 'high',
+                    'title': 'High-Potential AI Infrastructure Deal',
+                    'description': 'DataFoundry AI shows exceptional growth metrics and strong market fit. Similar companies in our portfolio achieved 3.2x returns.',
+                    'confidence': 0.94,
+                    'action_items': json.dumps(['Schedule technical due diligence', 'Prepare term sheet', 'Connect with other investors']),
+                    'timeline': '2 weeks',
+                    'impact': 'High',
+                    'tags': json.dumps(['AI Infrastructure', 'Enterprise', 'Growth Stage'])
+                },
+                {
+                    'id': 'insight_002',
+                    'type': 'risk',
+                    'priority': 'medium',
+                    'title': 'Portfolio Concentration Risk',
+                    'description': 'AI/ML startups represent 38% of portfolio value. Consider diversification strategies.',
+                    'confidence': 0.87,
+                    'action_items': json.dumps(['Review allocation strategy', 'Identify diversification opportunities', 'Assess market correlation']),
+                    'timeline': '1 month',
+                    'impact': 'Medium',
+                    'tags': json.dumps(['Risk Management', 'Diversification', 'Portfolio Strategy'])
+                }
+            ]
+            
+            for insight in sample_insights:
+                cursor.execute('''
+                    INSERT INTO ai_insights 
+                    (id, type, priority, title, description, confidence, 
+                     action_items, timeline, impact, tags)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    insight['id'], insight['type'], insight['priority'],
+                    insight['title'], insight['description'], insight['confidence'],
+                    insight['action_items'], insight['timeline'], 
+                    insight['impact'], insight['tags']
+                ))
         
-        conn.commit()
-        conn.close()
         logger.info("Sample data populated successfully")
     
+    COMPANY_COLUMNS = (
+        'id', 'name', 'stage', 'investment_amount', 'current_valuation',
+        'sector', 'founded_date', 'last_funding_date', 'performance_data', 'risk_score'
+    )
+    
+    def load_portfolio_aggregates(self):
+        """Build the materialized portfolio aggregates from one table scan"""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(self.COMPANY_COLUMNS)} FROM portfolio_companies"
+            ).fetchall()
+        self.aggregates.load([dict(zip(self.COMPANY_COLUMNS, row)) for row in rows])
+    
+    def add_company(self, company: PortfolioCompany):
+        """Insert a portfolio company and fold it into the aggregates"""
+        row = self._company_row(company)
+        with self.pool.connection() as conn:
+            conn.execute(f'''
+                INSERT INTO portfolio_companies ({', '.join(self.COMPANY_COLUMNS)})
+                VALUES ({', '.join('?' * len(self.COMPANY_COLUMNS))})
+            ''', tuple(row[column] for column in self.COMPANY_COLUMNS))
+        self.aggregates.upsert(row)
+    
+    def update_company(self, company: PortfolioCompany) -> bool:
+        """Update a portfolio company and re-apply it to the aggregates"""
+        row = self._company_row(company)
+        columns = self.COMPANY_COLUMNS[1:]
+        with self.pool.connection() as conn:
+            updated = conn.execute(f'''
+                UPDATE portfolio_companies
+                SET {', '.join(f'{column} = ?' for column in columns)}, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', tuple(row[column] for column in columns) + (company.id,)).rowcount
+        if updated:
+            self.aggregates.upsert(row)
+        return bool(updated)
+    
+    def _company_row(self, company: PortfolioCompany) -> Dict[str, Any]:
+        row = {column: getattr(company, column, None) for column in self.COMPANY_COLUMNS}
+        row['performance_data'] = json.dumps(company.performance_metrics)
+        return row
+    
     async def get_portfolio_analytics(self, timeframe: str = '6M') -> Dict[str, Any]:
-        """Get comprehensive portfolio analytics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Portfolio value calculation
-        cursor.execute('''
-            SELECT SUM(current_valuation), SUM(investment_amount), 
-                   COUNT(*), AVG(risk_score)
-            FROM portfolio_companies
-        ''')
-        total_valuation, total_invested, count, avg_risk = cursor.fetchone()
-        
-        # Sector breakdown
-        cursor.execute('''
-            SELECT sector, SUM(current_valuation), COUNT(*), AVG(risk_score)
-            FROM portfolio_companies
-            GROUP BY sector
-            ORDER BY SUM(current_valuation) DESC
-        ''')
-        sector_data = cursor.fetchall()
-        
-        # Stage breakdown
-        cursor.execute('''
-            SELECT stage, COUNT(*), SUM(current_valuation), AVG(risk_score)
-            FROM portfolio_companies
-            GROUP BY stage
-            ORDER BY COUNT(*) DESC
-        ''')
-        stage_data = cursor.fetchall()
-        
-        # Performance metrics
-        cursor.execute('''
-            SELECT c.name, c.sector, c.stage, c.current_valuation, 
-                   c.investment_amount, c.performance_data, c.risk_score
-            FROM portfolio_companies c
-            ORDER BY c.current_valuation DESC
-            LIMIT 10
-        ''')
-        top_companies = cursor.fetchall()
-        
-        conn.close()
+        """Get comprehensive portfolio analytics (served from the materialized aggregates)"""
+        if self._analytics is None or self._analytics_version != self.aggregates.version:
+            self._analytics = self._build_portfolio_analytics()
+            self._analytics_version = self.aggregates.version
+        return self._analytics
+    
+    def _build_portfolio_analytics(self) -> Dict[str, Any]:
+        """Render the aggregates; runs once per aggregate version"""
+        aggregates = self.aggregates
+        summary = aggregates.summary
+        total_valuation = summary['valuation']
+        total_invested = summary['invested']
         
         # Calculate portfolio performance
         total_return = ((total_valuation - total_invested) / total_invested * 100) if total_invested else 0
         
+        sector_data = sorted(aggregates.sectors.items(), key=lambda item: item[1]['valuation'], reverse=True)
+        stage_data = sorted(aggregates.stages.items(), key=lambda item: item[1]['count'], reverse=True)
+        
         return {
+            'version': aggregates.version,
+            'computed_at': datetime.now().isoformat(),
             'portfolio_summary': {
-                'total_valuation': round(total_valuation or 0, 2),
-                'total_invested': round(total_invested or 0, 2),
+                'total_valuation': round(total_valuation, 2),
+                'total_invested': round(total_invested, 2),
                 'total_return': round(total_return, 2),
-                'company_count': count or 0,
-                'avg_risk_score': round(avg_risk or 0, 3),
+                'company_count': summary['count'],
+                'avg_risk_score': round(aggregates.avg_risk(summary) or 0, 3),
                 'sharpe_ratio': self.calculate_sharpe_ratio(),
                 'diversification_score': self.calculate_diversification_score()
             },
             'sector_breakdown': [
                 {
-                    'sector': row[0],
-                    'valuation': round(row[1], 2),
-                    'count': row[2],
-                    'avg_risk': round(row[3], 3),
-                    'percentage': round((row[1] / total_valuation * 100) if total_valuation else 0, 1)
+                    'sector': sector,
+                    'valuation': round(totals['valuation'], 2),
+                    'count': totals['count'],
+                    'avg_risk': round(aggregates.avg_risk(totals) or 0, 3),
+                    'percentage': round((totals['valuation'] / total_valuation * 100) if total_valuation else 0, 1)
                 }
-                for row in sector_data
+                for sector, totals in sector_data
             ],
             'stage_breakdown': [
                 {
-                    'stage': row[0],
-                    'count': row[1],
-                    'valuation': round(row[2], 2),
-                    'avg_risk': round(row[3], 3)
+                    'stage': stage,
+                    'count': totals['count'],
+                    'valuation': round(totals['valuation'], 2),
+                    'avg_risk': round(aggregates.avg_risk(totals) or 0, 3)
                 }
-                for row in stage_data
+                for stage, totals in stage_data
             ],
             'top_performers': [
                 {
-                    'name': row[0],
-                    'sector': row[1],
-                    'stage': row[2],
-                    'valuation': round(row[3], 2),
-                    'invested': round(row[4], 2),
-                    'multiple': round(row[3] / row[4], 2) if row[4] else 0,
-                    'performance_data': json.loads(row[5]) if row[5] else {},
-                    'risk_score': round(row[6], 3) if row[6] else 0
+                    'name': company['name'],
+                    'sector': company['sector'],
+                    'stage': company['stage'],
+                    'valuation': round(company['current_valuation'] or 0, 2),
+                    'invested': round(company['investment_amount'] or 0, 2),
+                    'multiple': round(company['current_valuation'] / company['investment_amount'], 2)
+                                if company['investment_amount'] and company['current_valuation'] else 0,
+                    'performance_data': json.loads(company['performance_data']) if company['performance_data'] else {},
+                    'risk_score': round(company['risk_score'], 3) if company['risk_score'] else 0
                 }
-                for row in top_companies
+                for company in aggregates.top_companies(10)
             ]
         }
     
@@ -483,22 +607,13 @@ class EnhancedAnalyticsEngine:
     
     def calculate_diversification_score(self) -> float:
         """Calculate portfolio diversification score"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT sector, SUM(current_valuation) as sector_value
-            FROM portfolio_companies
-            GROUP BY sector
-        ''')
-        sector_values = [row[1] for row in cursor.fetchall()]
-        conn.close()
+        sector_values = [totals['valuation'] for totals in self.aggregates.sectors.values()]
+        total_value = sum(sector_values)
         
-        if not sector_values:
+        if not sector_values or not total_value:
             return 0.0
         
         # Calculate Herfindahl-Hirschman Index
-        total_value = sum(sector_values)
         hhi = sum((value / total_value) ** 2 for value in sector_values)
         
         # Convert to diversification score (0-1, higher is more diversified)
@@ -507,35 +622,33 @@ class EnhancedAnalyticsEngine:
     
     async def generate_ai_insights(self) -> List[Dict[str, Any]]:
         """Generate AI-powered insights using portfolio data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
         
-        # Get existing insights
-        cursor.execute('''
-            SELECT id, type, priority, title, description, confidence,
-                   action_items, timeline, impact, tags
-            FROM ai_insights
-            WHERE status = 'active'
-            ORDER BY confidence DESC, created_at DESC
-            LIMIT 10
-        ''')
-        
-        insights = []
-        for row in cursor.fetchall():
-            insights.append({
-                'id': row[0],
-                'type': row[1],
-                'priority': row[2],
-                'title': row[3],
-                'description': row[4],
-                'confidence': round(row[5] * 100, 1),
-                'action_items': json.loads(row[6]) if row[6] else [],
-                'timeline': row[7],
-                'impact': row[8],
-                'tags': json.loads(row[9]) if row[9] else []
-            })
+            # Get existing insights
+            cursor.execute('''
+                SELECT id, type, priority, title, description, confidence,
+                       action_items, timeline, impact, tags
+                FROM ai_insights
+                WHERE status = 'active'
+                ORDER BY confidence DESC, created_at DESC
+                LIMIT 10
+            ''')
         
-        conn.close()
+            insights = []
+            for row in cursor.fetchall():
+                insights.append({
+                    'id': row[0],
+                    'type': row[1],
+                    'priority': row[2],
+                    'title': row[3],
+                    'description': row[4],
+                    'confidence': round(row[5] * 100, 1),
+                    'action_items': json.loads(row[6]) if row[6] else [],
+                    'timeline': row[7],
+                    'impact': row[8],
+                    'tags': json.loads(row[9]) if row[9] else []
+                })
         
         # Generate new insights based on current portfolio state
         new_insights = await self.analyze_portfolio_for_insights()
@@ -609,19 +722,18 @@ class EnhancedAnalyticsEngine:
     
     async def analyze_market_opportunities(self) -> Optional[Dict[str, Any]]:
         """Analyze market trends for investment opportunities"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT sector, growth_rate, sentiment, trends
-            FROM market_analysis
-            WHERE analysis_date >= date('now', '-30 days')
-            ORDER BY growth_rate DESC
-            LIMIT 1
-        ''')
+            cursor.execute('''
+                SELECT sector, growth_rate, sentiment, trends
+                FROM market_analysis
+                WHERE analysis_date >= date('now', '-30 days')
+                ORDER BY growth_rate DESC
+                LIMIT 1
+            ''')
         
-        result = cursor.fetchone()
-        conn.close()
+            result = cursor.fetchone()
         
         if result and result[1] > 25:  # High growth threshold
             trends = json.loads(result[3]) if result[3] else []
@@ -641,27 +753,25 @@ class EnhancedAnalyticsEngine:
     
     async def get_market_intelligence(self) -> Dict[str, Any]:
         """Get comprehensive market intelligence data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT sector, growth_rate, deal_count, avg_valuation, sentiment, trends
-            FROM market_analysis
-            ORDER BY growth_rate DESC
-        ''')
-        
-        market_data = []
-        for row in cursor.fetchall():
-            market_data.append({
-                'sector': row[0],
-                'growth_rate': row[1],
-                'deal_count': row[2],
-                'avg_valuation': row[3],
-                'sentiment': row[4],
-                'trends': json.loads(row[5]) if row[5] else []
-            })
+            cursor.execute('''
+                SELECT sector, growth_rate, deal_count, avg_valuation, sentiment, trends
+                FROM market_analysis
+                ORDER BY growth_rate DESC
+            ''')
         
-        conn.close()
+            market_data = []
+            for row in cursor.fetchall():
+                market_data.append({
+                    'sector': row[0],
+                    'growth_rate': row[1],
+                    'deal_count': row[2],
+                    'avg_valuation': row[3],
+                    'sentiment': row[4],
+                    'trends': json.loads(row[5]) if row[5] else []
+                })
         
         return {
             'sectors': market_data,
@@ -744,6 +854,7 @@ async def get_portfolio_analytics(timeframe: str = Query("6M", description="Time
             "success": True,
             "data": analytics,
             "timeframe": timeframe,
+            "version": analytics['version'],
             "generated_at": datetime.now().isoformat()
         }
     except Exception as e:
@@ -816,34 +927,32 @@ async def run_custom_analysis(request: AnalyticsRequest):
 async def get_portfolio_companies():
     """Get detailed portfolio company information"""
     try:
-        conn = sqlite3.connect(analytics_engine.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, name, stage, investment_amount, current_valuation,
-                   sector, founded_date, last_funding_date, performance_data, risk_score
-            FROM portfolio_companies
-            ORDER BY current_valuation DESC
-        ''')
+        with analytics_engine.pool.connection() as conn:
+            cursor = conn.cursor()
         
-        companies = []
-        for row in cursor.fetchall():
-            performance_data = json.loads(row[8]) if row[8] else {}
-            companies.append({
-                'id': row[0],
-                'name': row[1],
-                'stage': row[2],
-                'investment_amount': row[3],
-                'current_valuation': row[4],
-                'sector': row[5],
-                'founded_date': row[6],
-                'last_funding_date': row[7],
-                'performance_metrics': performance_data,
-                'risk_score': row[9],
-                'multiple': round(row[4] / row[3], 2) if row[3] else 0
-            })
+            cursor.execute('''
+                SELECT id, name, stage, investment_amount, current_valuation,
+                       sector, founded_date, last_funding_date, performance_data, risk_score
+                FROM portfolio_companies
+                ORDER BY current_valuation DESC
+            ''')
         
-        conn.close()
+            companies = []
+            for row in cursor.fetchall():
+                performance_data = json.loads(row[8]) if row[8] else {}
+                companies.append({
+                    'id': row[0],
+                    'name': row[1],
+                    'stage': row[2],
+                    'investment_amount': row[3],
+                    'current_valuation': row[4],
+                    'sector': row[5],
+                    'founded_date': row[6],
+                    'last_funding_date': row[7],
+                    'performance_metrics': performance_data,
+                    'risk_score': row[9],
+                    'multiple': round(row[4] / row[3], 2) if row[3] else 0
+                })
         
         return {
             "success": True,
@@ -858,23 +967,7 @@ async def get_portfolio_companies():
 async def add_portfolio_company(company: PortfolioCompany):
     """Add new portfolio company"""
     try:
-        conn = sqlite3.connect(analytics_engine.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO portfolio_companies 
-            (id, name, stage, investment_amount, current_valuation, sector,
-             founded_date, last_funding_date, performance_data, risk_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            company.id, company.name, company.stage,
-            company.investment_amount, company.current_valuation,
-            company.sector, company.founded_date, company.last_funding_date,
-            json.dumps(company.performance_metrics), company.risk_score
-        ))
-        
-        conn.commit()
-        conn.close()
+        analytics_engine.add_company(company)
         
         # Broadcast update to connected clients
         await broadcast_update({
@@ -892,6 +985,34 @@ async def add_portfolio_company(company: PortfolioCompany):
         logger.error(f"Error adding portfolio company: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.put("/api/portfolio/companies/{company_id}")
+async def update_portfolio_company(company_id: str, company: PortfolioCompany):
+    """Update an existing portfolio company"""
+    if company.id != company_id:
+        raise HTTPException(status_code=400, detail="Company ID in path and body must match")
+    
+    try:
+        updated = analytics_engine.update_company(company)
+    except Exception as e:
+        logger.error(f"Error updating portfolio company: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not updated:
+        raise HTTPException(status_code=404, detail=f"Portfolio company {company_id} not found")
+    
+    # Broadcast update to connected clients
+    await broadcast_update({
+        "type": "portfolio_update",
+        "action": "company_updated",
+        "company": company.dict()
+    })
+    
+    return {
+        "success": True,
+        "message": "Portfolio company updated successfully",
+        "company_id": company_id
+    }
+
 @app.get("/api/analytics/performance-dashboard")
 async def get_performance_dashboard():
     """Get comprehensive performance dashboard data"""
@@ -31,6 +31,7 @@ import numpy as np
 import chromadb
 from chromadb.config import Settings
 import networkx as nx
+from citation_graph import CitationGraph
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import aiohttp
@@ -254,7 +255,7 @@ class VERSSAIEnhancedRAG:
         # Initialize data structures
         self.research_papers = []
         self.researchers = []
-        self.citation_graph = nx.DiGraph()
+        self.citation_graph = CitationGraph()
         self.collaboration_graph = nx.Graph()
         
         # TF-IDF vectorizer
@@ -565,24 +566,8 @@ class VERSSAIEnhancedRAG:
         logger.info("🔗 Building citation network graph...")
         
         try:
-            for _, row in citations_df.iterrows():
-                citing_id = row.get('citing_paper_id')
-                cited_id = row.get('cited_paper_id')
-                
-                if citing_id is not None and cited_id is not None:
-                    # Add nodes if they don't exist
-                    if not self.citation_graph.has_node(citing_id):
-                        self.citation_graph.add_node(citing_id)
-                    if not self.citation_graph.has_node(cited_id):
-                        self.citation_graph.add_node(cited_id)
-                    
-                    # Add edge with metadata
-                    self.citation_graph.add_edge(
-                        citing_id, cited_id,
-                        context=row.get('citation_context', 'Unknown'),
-                        sentiment=row.get('citation_sentiment', 'Neutral'),
-                        self_citation=row.get('self_citation', False)
-                    )
+            # Integer-code the paper IDs and build the CSR adjacency in one pass
+            self.citation_graph = CitationGraph.from_dataframe(citations_df)
             
             logger.info(f"✅ Citation graph built: {self.citation_graph.number_of_nodes()} nodes, {self.citation_graph.number_of_edges()} edges")
             
@@ -1071,6 +1056,41 @@ async def generate_vc_intelligence(intelligence_request: VCIntelligenceRequest):
         logger.error(f"VC intelligence generation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"VC intelligence generation failed: {str(e)}")
 
+@app.get("/api/rag/citation-graph")
+async def get_citation_graph_stats(top: int = 10):
+    """Citation network size and the most influential papers"""
+    citation_graph = app.state.rag_system.citation_graph
+    return {
+        "statistics": citation_graph.get_statistics(),
+        "top_by_pagerank": citation_graph.top_papers(top, by='pagerank'),
+        "top_by_citations": citation_graph.top_papers(top, by='in_degree')
+    }
+
+@app.get("/api/rag/citation-graph/papers/{paper_id}")
+async def get_paper_citation_neighborhood(paper_id: str, k: int = 1, direction: str = 'out'):
+    """Papers within k citation hops of one paper"""
+    citation_graph = app.state.rag_system.citation_graph
+    try:
+        resolved_id = citation_graph.resolve_id(paper_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Paper {paper_id} not in citation graph")
+    
+    try:
+        neighborhood = citation_graph.neighborhood(resolved_id, k=min(k, 5), direction=direction)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "paper_id": resolved_id,
+        **citation_graph.degrees(resolved_id),
+        "pagerank": float(citation_graph.pagerank()[citation_graph.node_ids.get_loc(resolved_id)]),
+        "references": citation_graph.edges_from(resolved_id),
+        "neighborhood": [
+            {"paper_id": neighbor, "hops": hops}
+            for neighbor, hops in sorted(neighborhood.items(), key=lambda item: item[1])
+        ]
+    }
+
 @app.get("/api/portfolios/companies")
 async def get_portfolio_companies():
     """Get mock portfolio companies for demo"""
@@ -5,7 +5,9 @@ This replaces n8n for Phase 2 until we have n8n fully integrated
 """
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
+from dataclasses import dataclass
 from datetime import datetime
 import uuid
 import json
@@ -29,6 +31,81 @@ from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class WorkflowStage:
+    """One workflow step; `run` is awaited once every stage in `depends_on` has finished"""
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+
+async def run_stage_graph(stages: List[WorkflowStage], results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a dependency graph of stages, starting each as soon as its inputs are ready
+    
+    Stage outputs are written to `results[stage.name]`. If any stage raises, the
+    remaining stages are cancelled and the exception propagates.
+    
+    Returns:
+        Per-stage timings (milliseconds from graph start) and the critical path
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = [dep for dep in stage.depends_on if dep not in by_name]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+    
+    graph_start = time.perf_counter()
+    timings = {}
+    tasks: Dict[str, asyncio.Task] = {}
+    
+    async def execute(stage: WorkflowStage):
+        if stage.depends_on:
+            await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+        started = time.perf_counter()
+        results[stage.name] = await stage.run()
+        finished = time.perf_counter()
+        timings[stage.name] = {
+            'started_ms': round((started - graph_start) * 1000, 1),
+            'finished_ms': round((finished - graph_start) * 1000, 1),
+            'duration_ms': round((finished - started) * 1000, 1),
+            'depends_on': list(stage.depends_on)
+        }
+    
+    # Create tasks in dependency order so every dependency task exists first
+    pending = list(stages)
+    while pending:
+        ready = [stage for stage in pending if all(dep in tasks for dep in stage.depends_on)]
+        if not ready:
+            raise ValueError(f"Cycle in workflow stages: {[stage.name for stage in pending]}")
+        for stage in ready:
+            tasks[stage.name] = asyncio.ensure_future(execute(stage))
+            pending.remove(stage)
+    
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    
+    # Walk back from the last stage to finish through its latest-finishing dependency
+    critical_path = []
+    current = max(timings, key=lambda name: timings[name]['finished_ms']) if timings else None
+    while current is not None:
+        critical_path.append(current)
+        deps = by_name[current].depends_on
+        current = max(deps, key=lambda name: timings[name]['finished_ms']) if deps else None
+    critical_path.reverse()
+    
+    return {
+        'stage_timings': timings,
+        'critical_path': {
+            'stages': critical_path,
+            'duration_ms': timings[critical_path[-1]]['finished_ms'] if critical_path else 0.0
+        },
+        'total_duration_ms': round((time.perf_counter() - graph_start) * 1000, 1)
+    }
+
 class VERSSAIWorkflowOrchestrator:
     """
     Orchestrates complex VC analysis workflows using AI agents and RAG
@@ -70,51 +147,59 @@ class VERSSAIWorkflowOrchestrator:
         try:
             logger.info(f"Starting Founder Signal workflow for {company_name} (deck_id: {deck_id})")
             
-            # Stage 1: Document Text Extraction
-            workflow_results['stages']['extraction'] = await self._extract_document_text(
-                file_path, company_name
-            )
-            
-            # Stage 2: AI Information Extraction
-            workflow_results['stages']['ai_extraction'] = await self._ai_extract_information(
-                workflow_results['stages']['extraction'], company_name
-            )
-            
-            # Stage 3: Web Research Enhancement
-            workflow_results['stages']['web_research'] = await self._enhance_with_web_research(
-                workflow_results['stages']['ai_extraction'], deck_id
-            )
-            
-            # Stage 4: Social Media Research Enhancement
-            workflow_results['stages']['social_research'] = await self._enhance_with_social_research(
-                workflow_results['stages']['ai_extraction'], deck_id
-            )
-            
-            # Stage 5: Founder Enrichment and Analysis (now enhanced with web/social data)
-            workflow_results['stages']['founder_analysis'] = await self._analyze_founders(
-                workflow_results['stages']['ai_extraction'], 
-                workflow_results['stages']['web_research'],
-                workflow_results['stages']['social_research'],
-                deck_id
-            )
-            
-            # Stage 6: Investment Thesis Evaluation (enhanced with research data)
-            workflow_results['stages']['investment_evaluation'] = await self._evaluate_investment(
-                workflow_results['stages']['ai_extraction'],
-                workflow_results['stages']['founder_analysis'],
-                workflow_results['stages']['web_research'],
-                workflow_results['stages']['social_research']
-            )
-            
-            # Stage 7: RAG Integration - Add to company knowledge
-            workflow_results['stages']['rag_integration'] = await self._integrate_with_rag(
-                deck_id, workflow_results['stages']['ai_extraction']
-            )
+            stages = workflow_results['stages']
             
-            # Stage 8: Database Storage
-            workflow_results['stages']['database_storage'] = await self._store_analysis_results(
-                deck_id, workflow_results
-            )
+            # Stages run as a dependency graph: web and social research run side by
+            # side after AI extraction, and RAG integration only needs the extraction
+            stage_graph = [
+                # Stage 1: Document Text Extraction
+                WorkflowStage('extraction', lambda: self._extract_document_text(file_path, company_name)),
+                
+                # Stage 2: AI Information Extraction
+                WorkflowStage('ai_extraction', lambda: self._ai_extract_information(
+                    stages['extraction'], company_name
+                ), ('extraction',)),
+                
+                # Stage 3: Web Research Enhancement
+                WorkflowStage('web_research', lambda: self._enhance_with_web_research(
+                    stages['ai_extraction'], deck_id
+                ), ('ai_extraction',)),
+                
+                # Stage 4: Social Media Research Enhancement
+                WorkflowStage('social_research', lambda: self._enhance_with_social_research(
+                    stages['ai_extraction'], deck_id
+                ), ('ai_extraction',)),
+                
+                # Stage 5: Founder Enrichment and Analysis (now enhanced with web/social data)
+                WorkflowStage('founder_analysis', lambda: self._analyze_founders(
+                    stages['ai_extraction'],
+                    stages['web_research'],
+                    stages['social_research'],
+                    deck_id
+                ), ('ai_extraction', 'web_research', 'social_research')),
+                
+                # Stage 6: Investment Thesis Evaluation (enhanced with research data)
+                WorkflowStage('investment_evaluation', lambda: self._evaluate_investment(
+                    stages['ai_extraction'],
+                    stages['founder_analysis'],
+                    stages['web_research'],
+                    stages['social_research']
+                ), ('ai_extraction', 'founder_analysis', 'web_research', 'social_research')),
+                
+                # Stage 7: RAG Integration - Add to company knowledge
+                WorkflowStage('rag_integration', lambda: self._integrate_with_rag(
+                    deck_id, stages['ai_extraction']
+                ), ('ai_extraction',)),
+                
+                # Stage 8: Database Storage - runs last, since it marks the deck 'completed'
+                WorkflowStage('database_storage', lambda: self._store_analysis_results(
+                    deck_id, workflow_results
+                ), ('ai_extraction', 'founder_analysis', 'investment_evaluation', 'rag_integration')),
+            ]
+            
+            schedule = await run_stage_graph(stage_graph, stages)
+            workflow_results['stage_timings'] = schedule['stage_timings']
+            workflow_results['critical_path'] = schedule['critical_path']
             
             # Compile final results
             workflow_results['final_results'] = self._compile_final_results(workflow_results)
@@ -0,0 +1,122 @@
+"""
+CSR citation graph (backend/citation_graph.py)
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+nx = pytest.importorskip("networkx")
+from citation_graph import CitationGraph  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def citations():
+    rng = np.random.default_rng(7)
+    rows = 600
+    return pd.DataFrame({
+        'citing_paper_id': rng.integers(0, 150, rows),
+        'cited_paper_id': rng.integers(0, 150, rows),
+        'citation_context': rng.choice(['Methods', 'Background', None], rows),
+        'citation_sentiment': rng.choice(['Positive', 'Neutral', 'Negative'], rows),
+        'self_citation': rng.random(rows) < 0.1
+    })
+
+
+@pytest.fixture(scope="module")
+def graphs(citations):
+    reference = nx.DiGraph()
+    for row in citations.itertuples():
+        reference.add_edge(row.citing_paper_id, row.cited_paper_id)
+    return CitationGraph.from_dataframe(citations), reference
+
+
+def test_structure_matches_networkx(graphs):
+    graph, reference = graphs
+
+    assert graph.number_of_nodes() == reference.number_of_nodes()
+    assert graph.number_of_edges() == reference.number_of_edges()
+    for paper_id in list(reference)[:25]:
+        assert graph.degrees(paper_id) == {
+            'in_degree': reference.in_degree(paper_id),
+            'out_degree': reference.out_degree(paper_id)
+        }
+        # IDs arriving as text (e.g. from a URL path) map back to the stored integer IDs
+        assert graph.resolve_id(str(paper_id)) == paper_id
+
+
+def test_pagerank_matches_networkx(citations, graphs):
+    graph, reference = graphs
+
+    expected = nx.pagerank(reference, tol=1e-10)
+    fresh = CitationGraph.from_dataframe(citations)
+    ranks = dict(zip(fresh.node_ids, fresh.pagerank(tol=1e-10)))
+
+    assert ranks.keys() == expected.keys()
+    for paper_id, rank in expected.items():
+        assert ranks[paper_id] == pytest.approx(rank, abs=1e-9)
+    assert graph.pagerank().sum() == pytest.approx(1.0)
+
+
+def test_top_papers_are_ordered_by_score(graphs):
+    graph, reference = graphs
+
+    top = graph.top_papers(5, by='in_degree')
+
+    expected = sorted((degree for _, degree in reference.in_degree()), reverse=True)[:5]
+    assert [paper['in_degree'] for paper in top] == expected
+
+
+@pytest.mark.parametrize("direction", ['out', 'in', 'both'])
+@pytest.mark.parametrize("k", [1, 2, 3])
+def test_k_hop_neighborhood_matches_shortest_paths(graphs, direction, k):
+    graph, reference = graphs
+    view = {'out': reference, 'in': reference.reverse(copy=False), 'both': reference.to_undirected(as_view=True)}
+
+    for paper_id in list(reference)[:20]:
+        expected = nx.single_source_shortest_path_length(view[direction], paper_id, cutoff=k)
+        expected.pop(paper_id)
+        assert graph.neighborhood(paper_id, k=k, direction=direction) == expected
+
+
+def test_duplicate_pairs_keep_last_attributes():
+    graph = CitationGraph.from_dataframe(pd.DataFrame({
+        'citing_paper_id': ['a', 'a', 'b', None],
+        'cited_paper_id': ['b', 'b', 'c', 'a'],
+        'citation_context': ['Background', 'Methods', None, 'Methods'],
+        'citation_sentiment': ['Neutral', 'Positive', 'Negative', 'Neutral'],
+        'self_citation': [False, True, False, False]
+    }))
+
+    assert graph.number_of_edges() == 2
+    assert graph.edges_from('a') == [{
+        'citing_paper_id': 'a', 'cited_paper_id': 'b',
+        'context': 'Methods', 'sentiment': 'Positive', 'self_citation': True
+    }]
+    assert graph.edges_from('b')[0]['context'] == 'Unknown'
+    assert graph.neighborhood('a', k=5) == {'b': 1, 'c': 2}
+    assert graph.resolve_id('a') == 'a'
+
+
+def test_to_networkx_round_trips_edges_and_attributes(citations, graphs):
+    graph, reference = graphs
+
+    materialized = graph.to_networkx()
+
+    assert set(materialized.edges) == set(reference.edges)
+    last = citations.drop_duplicates(['citing_paper_id', 'cited_paper_id'], keep='last').iloc[-1]
+    attributes = materialized.edges[last.citing_paper_id, last.cited_paper_id]
+    assert attributes['sentiment'] == last.citation_sentiment
+    assert attributes['self_citation'] == bool(last.self_citation)
+
+
+def test_empty_graph():
+    graph = CitationGraph.from_dataframe(pd.DataFrame(columns=['citing_paper_id', 'cited_paper_id']))
+
+    assert graph.number_of_nodes() == 0
+    assert graph.top_papers() == []
+    assert graph.get_statistics()['edges'] == 0
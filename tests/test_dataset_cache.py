@@ -0,0 +1,101 @@
+"""
+Columnar workbook cache (backend/dataset_cache.py)
+"""
+import multiprocessing
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+pytest.importorskip("openpyxl")
+from dataset_cache import DatasetCache  # noqa: E402
+
+WRITERS = 6
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "dataset.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({'name': [f"Researcher {i}" for i in range(500)], 'h_index': range(500)}).to_excel(
+            writer, sheet_name='Researchers', index=False
+        )
+        pd.DataFrame({'name': ['MIT', 'Stanford'], 'ranking': [1, 2]}).to_excel(
+            writer, sheet_name='Institutions', index=False
+        )
+    return path
+
+
+def rebuild(workbook_path, cache_dir, start, errors):
+    start.wait()
+    try:
+        DatasetCache(str(workbook_path), str(cache_dir)).rebuild()
+    except Exception as e:
+        errors.put(repr(e))
+
+
+def test_concurrent_rebuilds_do_not_collide(workbook, tmp_path):
+    cache_dir = tmp_path / "cache"
+    context = multiprocessing.get_context("fork")
+    start = context.Event()
+    errors = context.Queue()
+    writers = [
+        context.Process(target=rebuild, args=(workbook, cache_dir, start, errors)) for _ in range(WRITERS)
+    ]
+    for writer in writers:
+        writer.start()
+    start.set()
+    for writer in writers:
+        writer.join(timeout=60)
+
+    failures = []
+    while not errors.empty():
+        failures.append(errors.get())
+    assert failures == []
+    assert all(writer.exitcode == 0 for writer in writers)
+
+    # One complete cache and no leftover temporary directories
+    cache = DatasetCache(str(workbook), str(cache_dir))
+    assert [path.name for path in cache_dir.iterdir()] == [cache.cache_path.name]
+    assert cache.is_fresh()
+    dataset = cache.load()
+    assert list(dataset) == ['Researchers', 'Institutions']
+    assert len(dataset['Researchers']) == 500
+
+
+def test_rebuild_replaces_existing_cache(workbook, tmp_path):
+    cache = DatasetCache(str(workbook), str(tmp_path / "cache"))
+    first = cache.rebuild()
+    second = cache.rebuild()
+
+    assert second['created_at'] >= first['created_at']
+    assert cache.load(['Institutions'])['Institutions']['name'].tolist() == ['MIT', 'Stanford']
+
+
+def write_workbook(path, value):
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({'value': [value]}).to_excel(writer, sheet_name='Sheet', index=False)
+
+
+def test_rebuild_only_removes_stale_caches_of_the_same_workbook(tmp_path):
+    cache_dir = tmp_path / "cache"
+    data, data_v2 = tmp_path / "data.xlsx", tmp_path / "data_v2.xlsx"
+    write_workbook(data_v2, 1)
+    other = DatasetCache(str(data_v2), str(cache_dir))
+    other.rebuild()
+
+    write_workbook(data, 1)
+    DatasetCache(str(data), str(cache_dir)).rebuild()
+    write_workbook(data, 2)
+    current = DatasetCache(str(data), str(cache_dir))
+    current.rebuild()
+
+    # The earlier data.xlsx cache is gone; data_v2.xlsx keeps its live cache
+    assert sorted(path.name for path in cache_dir.iterdir()) == sorted(
+        [current.cache_path.name, other.cache_path.name]
+    )
+    assert other.is_fresh()
+    assert other.load()['Sheet']['value'].tolist() == [1]
@@ -0,0 +1,109 @@
+"""
+Fund performance from the cash-flow ledger (backend/real_vc_platform_api.py)
+"""
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+api = pytest.importorskip("real_vc_platform_api")
+calculate = api.FundPerformanceCalculator.calculate_ledger_metrics
+
+COLUMNS = ['fund_id', 'company_id', 'flow_date', 'flow_type', 'amount']
+
+
+def ledger(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def test_nav_sums_latest_mark_of_every_company():
+    metrics = calculate(ledger([
+        ('f1', 'c1', '2020-01-01', 'call', 100.0),
+        ('f1', 'c2', '2020-06-01', 'call', 100.0),
+        ('f1', 'c1', '2021-01-01', 'nav', 120.0),  # superseded by the 2023 mark
+        ('f1', 'c1', '2023-01-01', 'nav', 300.0),
+        ('f1', 'c2', '2023-01-01', 'nav', 50.0),
+    ]))
+
+    assert metrics.loc['f1', 'nav'] == pytest.approx(350.0)
+    assert metrics.loc['f1', 'tvpi'] == pytest.approx(1.75)
+
+
+def test_fund_level_marks_keep_latest_per_fund():
+    metrics = calculate(ledger([
+        ('f1', None, '2020-01-01', 'call', 100.0),
+        ('f1', None, '2021-01-01', 'nav', 150.0),
+        ('f1', None, '2022-01-01', 'nav', 180.0),
+    ]))
+
+    assert metrics.loc['f1', 'nav'] == pytest.approx(180.0)
+
+
+def test_vintage_pools_every_fund_and_company():
+    rows = ledger([
+        ('f1', 'c1', '2020-01-01', 'call', 100.0),
+        ('f1', 'c2', '2020-01-01', 'call', 100.0),
+        ('f2', 'c1', '2020-01-01', 'call', 200.0),
+        ('f1', 'c1', '2023-01-01', 'nav', 300.0),
+        ('f1', 'c2', '2023-01-01', 'nav', 50.0),
+        ('f2', 'c1', '2023-01-01', 'nav', 250.0),
+    ])
+    rows['vintage'] = '2020'
+
+    metrics = calculate(rows, 'vintage')
+
+    assert metrics.loc['2020', 'paid_in'] == pytest.approx(400.0)
+    assert metrics.loc['2020', 'nav'] == pytest.approx(600.0)
+    assert metrics.loc['2020', 'tvpi'] == pytest.approx(1.5)
+
+
+@pytest.fixture
+def db():
+    session = api.SessionLocal()
+    yield session
+    session.rollback()
+    for model in (api.CashFlow, api.PortfolioCompany, api.Investment):
+        session.query(model).delete()
+    session.commit()
+    session.close()
+
+
+def add_investment(db, fund_id, company_id, amount, date, valuation=1000.0, ownership=10.0):
+    investment_id = f"{fund_id}-{company_id}-{date:%Y%m%d}"
+    db.add(api.Investment(
+        id=investment_id, deal_id='d', fund_id=fund_id, company_id=company_id,
+        investment_amount=amount, ownership_percentage=ownership, investment_date=date
+    ))
+    db.add(api.PortfolioCompany(
+        id=f"pc-{investment_id}", investment_id=investment_id, company_id=company_id,
+        current_valuation=valuation, status='Active'
+    ))
+
+
+def test_legacy_investments_count_alongside_ledger_calls(db):
+    # Two investments booked before the ledger, one booked through the ledger
+    add_investment(db, 'f1', 'c1', 100.0, datetime(2020, 1, 1))
+    add_investment(db, 'f1', 'c2', 100.0, datetime(2020, 6, 1))
+    add_investment(db, 'f1', 'c3', 50.0, datetime(2022, 1, 1))
+    db.add(api.CashFlow(id='cf1', fund_id='f1', company_id='c3', flow_date=datetime(2022, 1, 1),
+                        flow_type='call', amount=50.0))
+    db.add(api.CashFlow(id='cf2', fund_id='f1', company_id='c1', flow_date=datetime(2023, 1, 1),
+                        flow_type='nav', amount=400.0))
+    db.commit()
+
+    result = api.load_cash_flow_ledger(db, ['f1'])
+    calls = result[result['flow_type'] == 'call']
+    navs = result[result['flow_type'] == 'nav']
+
+    assert sorted(calls['company_id']) == ['c1', 'c2', 'c3']
+    assert calls['amount'].sum() == pytest.approx(250.0)
+    # c1 keeps its recorded mark; c2 and c3 fall back to ownership-weighted valuations
+    assert dict(zip(navs['company_id'], navs['amount'])) == {'c1': 400.0, 'c2': 100.0, 'c3': 100.0}
+
+    metrics = calculate(result)
+    assert metrics.loc['f1', 'tvpi'] == pytest.approx(600.0 / 250.0)
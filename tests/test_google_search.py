@@ -0,0 +1,136 @@
+"""
+Google Custom Search request coalescing and fan-out (backend/google_search_service.py)
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+# The module-level service opens the persistent cache on import
+os.environ.setdefault("VERSSAI_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "cache.sqlite3"))
+
+pytest.importorskip("httpx")
+import persistent_cache  # noqa: E402
+import google_search_service as search  # noqa: E402
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistent_cache, "DEFAULT_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    return search.GoogleSearchService()
+
+
+class StandInSearchAPI:
+    """Replaces _fetch_search: each query blocks until released, or raises"""
+
+    def __init__(self, service, fail=()):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.fail = fail
+        service._fetch_search = self.fetch
+
+    async def fetch(self, cache_key, search_type, query, max_results=10, **search_params):
+        self.calls.append(query)
+        await self.release.wait()
+        if query in self.fail:
+            raise self.fail[query]
+        return {"search_type": search_type, "query": query, "results": [{"title": query, "url": ""}]}
+
+
+def test_follower_survives_cancelled_leader(service):
+    async def run():
+        api = StandInSearchAPI(service)
+        leader = asyncio.ensure_future(service._execute_search("primary", '"Ada"'))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(service._execute_search("primary", '"Ada"'))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        api.release.set()
+        result = await asyncio.wait_for(follower, 1)
+
+        assert leader.cancelled()
+        return api, result
+
+    api, result = asyncio.run(run())
+
+    assert result["query"] == '"Ada"'
+    assert api.calls == ['"Ada"']
+    assert service.stats["coalesced"] == 1
+    assert service._inflight == {}
+
+
+def test_cancelled_leader_still_finishes_the_fetch(service):
+    async def run():
+        api = StandInSearchAPI(service)
+        leader = asyncio.ensure_future(service._execute_search("primary", '"Ada"'))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+
+        # A caller arriving after the cancellation joins the same fetch
+        follower = asyncio.ensure_future(service._execute_search("primary", '"Ada"'))
+        await asyncio.sleep(0)
+        api.release.set()
+        return api, await asyncio.wait_for(follower, 1)
+
+    api, result = asyncio.run(run())
+
+    assert result["query"] == '"Ada"'
+    assert api.calls == ['"Ada"']
+
+
+def test_cancelled_search_is_reported_per_category(service):
+    async def run():
+        api = StandInSearchAPI(service, fail={
+            '"Ada" news interview article': asyncio.CancelledError()
+        })
+        api.release.set()
+        return await service.search_founder_information("Ada", include_social_media=False)
+
+    report = asyncio.run(run())
+
+    categories = report["results_by_category"]
+    assert categories["primary"]["query"] == '"Ada"'
+    assert categories["news"] == {"error": "Search 'news' was cancelled"}
+    assert report["query_timings"]["news"]["timed_out"] is False
+    assert report["partial"] is False
+
+
+def acquire_all(bucket, attempts):
+    async def run():
+        return [await bucket.acquire() for _ in range(attempts)]
+    return asyncio.run(run())
+
+
+def quota_bucket(store_path, daily_quota=5):
+    # One PersistentCache connection per worker process, all on the same file
+    return search.TokenBucket(1000, 1000, daily_quota, persistent_cache.PersistentCache('google_search_quota', store_path))
+
+
+def test_daily_quota_is_shared_by_every_worker(tmp_path):
+    store_path = str(tmp_path / "cache.sqlite3")
+    first, second = quota_bucket(store_path), quota_bucket(store_path)
+
+    assert acquire_all(first, 3) == [True] * 3
+    assert acquire_all(second, 3) == [True, True, False]
+    assert first.quota_remaining() == second.quota_remaining() == 0
+
+    # A restarted worker keeps today's count
+    assert acquire_all(quota_bucket(store_path), 1) == [False]
+
+
+def test_exhausted_quota_stops_every_worker(tmp_path):
+    store_path = str(tmp_path / "cache.sqlite3")
+    first, second = quota_bucket(store_path), quota_bucket(store_path)
+
+    assert second.quota_remaining() == 5
+    first.exhaust_quota()
+
+    assert second.quota_remaining() == 0
+    assert acquire_all(second, 1) == [False]
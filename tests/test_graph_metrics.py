@@ -0,0 +1,73 @@
+"""
+Per-layer graph metrics index (backend/enhanced_rag_graph_engine.py)
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+pytest.importorskip("networkx")
+pytest.importorskip("sklearn")
+engine_module = pytest.importorskip("enhanced_rag_graph_engine")
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = engine_module.VERSSAIRAGGraphEngine(str(tmp_path / "missing.xlsx"), index_dir=str(tmp_path / "index"))
+    graph = engine.layers['roof']['knowledge_graph']
+    for node in ('a', 'b', 'c'):
+        graph.add_node(node, type='research_paper')
+    graph.add_edge('a', 'b', type='citation')
+    graph.add_edge('b', 'c', type='citation')
+    engine.mark_graph_changed('roof')
+    return engine
+
+
+def insights(engine, node_ids):
+    found = asyncio.run(engine._analyze_graph_patterns('roof', node_ids))
+    return {insight['node_id']: insight for insight in found}
+
+
+def test_metrics_are_built_once_until_the_graph_changes(engine, monkeypatch):
+    builds = []
+    build = engine._build_graph_metrics
+    monkeypatch.setattr(engine, "_build_graph_metrics", lambda graph: builds.append(graph) or build(graph))
+
+    for _ in range(3):
+        insights(engine, ['a', 'b'])
+    assert len(builds) == 1
+
+    engine.mark_graph_changed('roof')
+    insights(engine, ['a'])
+    assert len(builds) == 2
+
+
+def test_edge_swap_with_same_counts_refreshes_metrics(engine):
+    before = insights(engine, ['a', 'b', 'c'])
+    assert before['a']['connection_types'] == ['citation']
+    assert before['c']['neighbor_count'] == 0
+
+    # Same node and edge counts, different edges and edge types
+    graph = engine.layers['roof']['knowledge_graph']
+    graph.remove_edge('a', 'b')
+    graph.add_edge('c', 'a', type='collaboration')
+    engine.mark_graph_changed('roof')
+
+    after = insights(engine, ['a', 'b', 'c'])
+    assert after['a']['connection_types'] == []
+    assert after['c']['connection_types'] == ['collaboration']
+    assert after['c']['neighbor_count'] == 1
+    assert after['a']['pagerank'] > before['a']['pagerank']
+
+
+def test_layers_are_versioned_independently(engine):
+    insights(engine, ['a'])
+    engine.layers['vc']['knowledge_graph'].add_node('target', type='investment_target')
+    engine.mark_graph_changed('vc')
+
+    assert engine.graph_cache['roof']['version'] == engine.layers['roof']['graph_version']
+    vc_found = asyncio.run(engine._analyze_graph_patterns('vc', ['target']))
+    assert [insight['node_id'] for insight in vc_found] == ['target']
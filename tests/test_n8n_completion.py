@@ -0,0 +1,169 @@
+"""
+n8n completion callbacks and polling fallback (backend/enhanced_mcp_n8n_service.py)
+
+n8n itself is replaced by a stand-in served through httpx.MockTransport: its
+webhook starts an execution, can post the completion callback (before or after
+the service starts waiting) and answers execution status polls.
+"""
+import asyncio
+import json
+import os
+import sys
+import types
+from datetime import datetime
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+# The RAG layer is not exercised here; stand in for it so the service imports on its own
+rag_stand_in = types.ModuleType("enhanced_rag_service")
+rag_stand_in.enhanced_rag_service = None
+rag_stand_in.RAGQuery = rag_stand_in.RAGResponse = dict
+sys.modules["enhanced_rag_service"] = rag_stand_in
+
+mcp = pytest.importorskip("enhanced_mcp_n8n_service")
+
+SECRET = "test-callback-secret"
+
+
+class StandInN8N:
+    """Webhook + executions API of an n8n instance"""
+
+    def __init__(self, service, callback="after", finish_after_polls=None):
+        self.service = service
+        self.callback = callback              # "after", "early" or None
+        self.finish_after_polls = finish_after_polls
+        self.webhook_payloads = []
+        self.polls = 0
+
+    def _post_callback(self, payload):
+        return self.service.resolve_n8n_completion(
+            payload["execution_id"], {"data": {"score": 87}}, token=payload["callback_token"]
+        )
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/webhook/"):
+            payload = json.loads(request.content)
+            self.webhook_payloads.append(payload)
+            if self.callback == "early":
+                self._post_callback(payload)
+            elif self.callback == "after":
+                asyncio.get_running_loop().call_later(0.05, self._post_callback, payload)
+            return httpx.Response(200, json={"execution_id": "n8n-1"})
+
+        if request.url.path == "/api/v1/executions/n8n-1":
+            self.polls += 1
+            finished = self.finish_after_polls is not None and self.polls >= self.finish_after_polls
+            return httpx.Response(200, json={"finished": finished, "data": {"score": 42}})
+
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    monkeypatch.setattr(mcp, "N8N_POLL_INITIAL_INTERVAL", 0.01)
+    monkeypatch.setattr(mcp, "N8N_POLL_MAX_INTERVAL", 0.02)
+    # Execution persistence is not under test
+    monkeypatch.setattr(mcp.EnhancedMCPService, "_init_redis", lambda self: None)
+
+    def make(secret):
+        if secret:
+            monkeypatch.setenv("N8N_CALLBACK_SECRET", secret)
+        else:
+            monkeypatch.delenv("N8N_CALLBACK_SECRET", raising=False)
+        return mcp.EnhancedMCPService()
+
+    return make
+
+
+def run_execution(service, n8n, timeout=5):
+    async def run():
+        service._http_client = httpx.AsyncClient(transport=httpx.MockTransport(n8n.handler))
+
+        async def no_insights(execution):
+            return {}
+
+        service._generate_final_insights = no_insights
+        execution = mcp.WorkflowExecution(
+            execution_id="exec-1",
+            workflow_type=mcp.WorkflowType.FOUNDER_SIGNAL,
+            status=mcp.WorkflowStatus.PENDING,
+            user_id="user-1",
+            organization_id="org-1",
+            parameters={"use_rag": False},
+            rag_layer="startup",
+            started_at=datetime.now()
+        )
+        service.active_executions[execution.execution_id] = execution
+        service.workflow_mappings[execution.workflow_type]["estimated_duration"] = timeout
+        try:
+            await service._execute_workflow(execution)
+        finally:
+            await service.close()
+        return execution
+
+    return asyncio.run(run())
+
+
+def test_callback_resolves_waiting_execution(make_service):
+    service = make_service(SECRET)
+    n8n = StandInN8N(service, callback="after")
+
+    execution = run_execution(service, n8n)
+
+    assert execution.status == mcp.WorkflowStatus.COMPLETED
+    assert execution.results["n8n_output"] == {"score": 87}
+    payload = n8n.webhook_payloads[0]
+    assert payload["callback_url"].endswith("/api/v1/n8n/executions/exec-1/complete")
+    assert payload["callback_token"] == service._callback_token("exec-1")
+    assert SECRET not in payload.values()
+
+
+def test_early_callback_is_used_without_waiting(make_service):
+    service = make_service(SECRET)
+    n8n = StandInN8N(service, callback="early")
+
+    execution = run_execution(service, n8n)
+
+    assert execution.status == mcp.WorkflowStatus.COMPLETED
+    assert execution.results["n8n_output"] == {"score": 87}
+    assert n8n.polls == 0
+    assert service._early_completions == {}
+
+
+def test_polling_fallback_without_secret(make_service):
+    service = make_service(None)
+    n8n = StandInN8N(service, callback=None, finish_after_polls=3)
+
+    execution = run_execution(service, n8n)
+
+    assert execution.status == mcp.WorkflowStatus.COMPLETED
+    assert execution.results["n8n_output"]["finished"] is True
+    assert n8n.polls == 3
+    assert "callback_url" not in n8n.webhook_payloads[0]
+    assert "callback_token" not in n8n.webhook_payloads[0]
+
+
+def test_callbacks_rejected_without_secret(make_service):
+    service = make_service(None)
+    service.active_executions["exec-1"] = object()
+
+    with pytest.raises(PermissionError):
+        service.resolve_n8n_completion("exec-1", {"data": {}}, token="anything")
+    assert service._early_completions == {}
+
+
+def test_forged_callbacks_are_rejected(make_service):
+    service = make_service(SECRET)
+    service.active_executions["exec-1"] = object()
+
+    for token in (None, "", "forged", service._callback_token("exec-2")):
+        with pytest.raises(PermissionError):
+            service.resolve_n8n_completion("exec-1", {"data": {}}, token=token)
+
+    # A valid token for an execution that does not exist is not stored either
+    with pytest.raises(KeyError):
+        service.resolve_n8n_completion("exec-2", {"data": {}}, token=service._callback_token("exec-2"))
+    assert service._early_completions == {}
@@ -0,0 +1,109 @@
+"""
+Incrementally maintained portfolio aggregates (backend/verssai_enhanced_analytics_backend.py)
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+pytest.importorskip("fastapi")
+pytest.importorskip("yfinance")
+pytest.importorskip("websockets")
+
+# The module opens its log file and databases in the working directory on import
+_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp())
+try:
+    import verssai_enhanced_analytics_backend as analytics  # noqa: E402
+finally:
+    os.chdir(_cwd)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics.config, "DATABASE_PATH", str(tmp_path / "analytics.db"))
+    return analytics.EnhancedAnalyticsEngine()
+
+
+def company(company_id, sector='AI/ML', stage='Seed', invested=1.0, valuation=4.0, risk=0.5):
+    return analytics.PortfolioCompany(
+        id=company_id, name=f"Company {company_id}", stage=stage, investment_amount=invested,
+        current_valuation=valuation, sector=sector, founded_date='2023-01-01',
+        performance_metrics={'arr': 1.0}, risk_score=risk
+    )
+
+
+def assert_matches_full_rebuild(engine):
+    rebuilt = analytics.PortfolioAggregates()
+    with engine.pool.connection() as conn:
+        rows = conn.execute(f"SELECT {', '.join(engine.COMPANY_COLUMNS)} FROM portfolio_companies").fetchall()
+    rebuilt.load([dict(zip(engine.COMPANY_COLUMNS, row)) for row in rows])
+
+    aggregates = engine.aggregates
+    assert aggregates.summary == pytest.approx(rebuilt.summary)
+    assert aggregates.sectors.keys() == rebuilt.sectors.keys()
+    assert aggregates.stages.keys() == rebuilt.stages.keys()
+    for name, totals in rebuilt.sectors.items():
+        assert aggregates.sectors[name] == pytest.approx(totals)
+    for name, totals in rebuilt.stages.items():
+        assert aggregates.stages[name] == pytest.approx(totals)
+
+
+def test_add_and_update_keep_aggregates_equal_to_a_rebuild(engine):
+    sample_count = engine.aggregates.summary['count']
+    engine.add_company(company('new_1', sector='Robotics', stage='Seed', invested=2.0, valuation=6.0))
+    engine.add_company(company('new_2', sector='Robotics', stage='Series A', risk=None))
+    assert_matches_full_rebuild(engine)
+
+    # Move new_1 to another sector and stage, and change every figure
+    assert engine.update_company(company('new_1', sector='Climate', stage='Series B', invested=3.0,
+                                         valuation=30.0, risk=0.1))
+    assert_matches_full_rebuild(engine)
+    assert engine.aggregates.summary['count'] == sample_count + 2
+    assert engine.aggregates.sectors['Robotics']['count'] == 1
+    assert engine.aggregates.sectors['Climate']['valuation'] == pytest.approx(30.0)
+
+    # Emptied groups disappear
+    assert engine.update_company(company('new_2', sector='Climate', stage='Series B'))
+    assert 'Robotics' not in engine.aggregates.sectors
+    assert_matches_full_rebuild(engine)
+
+
+def test_updating_unknown_company_changes_nothing(engine):
+    version = engine.aggregates.version
+    summary = dict(engine.aggregates.summary)
+
+    assert engine.update_company(company('missing')) is False
+
+    assert engine.aggregates.version == version
+    assert engine.aggregates.summary == summary
+
+
+def test_failed_insert_leaves_aggregates_untouched(engine):
+    engine.add_company(company('dup', valuation=10.0))
+    version = engine.aggregates.version
+
+    with pytest.raises(sqlite3.IntegrityError):
+        engine.add_company(company('dup', valuation=99.0))
+
+    assert engine.aggregates.version == version
+    assert engine.aggregates.companies['dup']['current_valuation'] == 10.0
+    assert_matches_full_rebuild(engine)
+
+
+def test_analytics_are_rendered_once_per_version(engine):
+    first = asyncio.run(engine.get_portfolio_analytics())
+    assert asyncio.run(engine.get_portfolio_analytics()) is first
+
+    engine.update_company(company('comp_001', sector='AI/ML', valuation=1000.0))
+    second = asyncio.run(engine.get_portfolio_analytics())
+
+    assert second is not first
+    assert second['version'] == engine.aggregates.version
+    assert second['top_performers'][0]['name'] == 'Company comp_001'
+    assert second['portfolio_summary']['company_count'] == first['portfolio_summary']['company_count']
@@ -0,0 +1,94 @@
+"""
+Portfolio KPI time series (backend/portfolio_management_agent.py)
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+# Module-level agents and services open the persistent cache on import
+os.environ.setdefault("VERSSAI_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "cache.sqlite3"))
+
+pytest.importorskip("httpx")
+pytest.importorskip("tweepy")
+
+# The RAG layer is not exercised here; stand in for it while the agent module imports
+rag_stand_in = types.ModuleType("rag_service")
+rag_stand_in.rag_service = None
+rag_stand_in.add_company_document = None
+real_rag_service = sys.modules.get("rag_service")
+sys.modules["rag_service"] = rag_stand_in
+try:
+    import portfolio_management_agent as portfolio  # noqa: E402
+finally:
+    if real_rag_service is None:
+        del sys.modules["rag_service"]
+    else:
+        sys.modules["rag_service"] = real_rag_service
+
+
+def test_history_returns_recorded_dates_unchanged_in_time_order():
+    store = portfolio.KPIStore()
+    store.record('acme', 'arr', 120.0, '2024-03-01T09:30:00+02:00')
+    store.record('acme', 'arr', 100.0, '2024-01-15')
+    store.record('acme', 'arr', 110.0, '2024-02-01T12:00:00Z')
+
+    tracker = store.get_company_kpis('acme')[0]
+
+    assert tracker.historical_data == [
+        {'date': '2024-01-15', 'value': 100.0},
+        {'date': '2024-02-01T12:00:00Z', 'value': 110.0},
+        {'date': '2024-03-01T09:30:00+02:00', 'value': 120.0},
+    ]
+    assert (tracker.current_value, tracker.previous_value, tracker.trend) == (120.0, 110.0, "improving")
+    assert tracker.last_updated == '2024-03-01T09:30:00+02:00'
+
+
+def test_late_arriving_older_point_does_not_become_current():
+    store = portfolio.KPIStore()
+    store.record('acme', 'burn', 50.0, '2024-06-01')
+    store.record('acme', 'burn', 80.0, '2023-12-01')
+
+    tracker = store.get_company_kpis('acme')[0]
+
+    assert tracker.current_value == 50.0
+    assert tracker.last_updated == '2024-06-01'
+
+
+@pytest.mark.parametrize("date", ["next tuesday", "", None])
+def test_unparseable_dates_are_rejected(date):
+    store = portfolio.KPIStore()
+    store.record('acme', 'arr', 100.0, '2024-01-15')
+
+    with pytest.raises(ValueError):
+        store.record('acme', 'arr', 999.0, date)
+    with pytest.raises(ValueError):
+        store.record('acme', 'churn', 1.0, date)
+
+    assert len(store) == 1
+    assert store.version('acme') == 1
+    assert store.get_company_kpis('acme')[0].current_value == 100.0
+
+
+def test_meeting_kpi_updates_with_bad_date_are_skipped():
+    orchestrator = portfolio.PortfolioOrchestrator()
+
+    asyncio.run(orchestrator._update_company_kpis('acme', {'arr': 100, 'churn': 2}, 'Q3 board meeting'))
+    assert orchestrator.kpi_trackers == {}
+
+    asyncio.run(orchestrator._update_company_kpis('acme', {'arr': 100, 'churn': 2}, '2024-07-01'))
+    assert sorted(orchestrator.kpi_trackers) == ['acme_arr', 'acme_churn']
+
+
+def test_series_window_filters_by_date():
+    store = portfolio.KPIStore()
+    for month, value in ((1, 10.0), (2, 20.0), (3, 30.0)):
+        store.record('acme', 'arr', value, f'2024-0{month}-01')
+
+    _, values = store.get_series('acme', 'arr', start='2024-02-01', end='2024-03-01')
+
+    assert list(values) == [20.0, 30.0]
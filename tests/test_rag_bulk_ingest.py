@@ -0,0 +1,109 @@
+"""
+Streaming bulk ingestion into the RAG collections (backend/rag_service.py)
+"""
+import hashlib
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+chromadb = pytest.importorskip("chromadb")
+
+
+class HashingEncoder:
+    """Deterministic bag-of-words embeddings in place of the sentence transformer"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        vectors = np.zeros((len(texts), 16))
+        for row, text in enumerate(texts):
+            for word in text.split():
+                vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % 16] += 1.0
+        return vectors + 1e-3
+
+
+# The embedding model is not under test; stand in for it when it is not installed
+try:
+    import sentence_transformers  # noqa: F401
+except ImportError:
+    sys.modules["sentence_transformers"] = types.SimpleNamespace(SentenceTransformer=HashingEncoder)
+
+# The module-level service connects on import; keep it off the Chroma server and the working directory
+_http_client = chromadb.HttpClient
+chromadb.HttpClient = lambda host, port: chromadb.EphemeralClient()
+try:
+    import rag_service as rag  # noqa: E402
+finally:
+    chromadb.HttpClient = _http_client
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = rag.VERSSAIRAGService.__new__(rag.VERSSAIRAGService)
+    service.chroma_client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    service.embedding_model = HashingEncoder()
+    service.collections = {}
+    service.query_embeddings = rag.QueryEmbeddingCache()
+    service.setup_collections()
+    return service
+
+
+def document(document_id, words):
+    return {'document_id': document_id, 'content': " ".join(f"w{i}" for i in range(words)), 'metadata': {}}
+
+
+def stored_ids(service, level):
+    return sorted(service.collections[level].get()['ids'])
+
+
+def test_reingesting_unchanged_documents_is_a_no_op(service):
+    docs = [document('short', 10), document('long', 450)]
+    service.bulk_ingest('platform', docs)
+    count = service.collections['platform'].count()
+
+    stats = service.bulk_ingest('platform', docs)
+
+    assert stats['documents_skipped'] == 2
+    assert service.collections['platform'].count() == count
+    assert stored_ids(service, 'platform') == ['long#0', 'long#1', 'long#2', 'short']
+
+
+def test_bulk_ingest_replaces_document_added_whole(service):
+    service.add_to_company_knowledge('acme', [
+        {'document_id': 'memo', 'content': "first draft", 'metadata': {'kind': 'memo'}},
+        {'document_id': 'deck', 'content': "pitch deck", 'metadata': {'kind': 'deck'}}
+    ])
+    assert service.collections['company'].count() == 2
+
+    service.bulk_ingest('company', [
+        {'document_id': 'memo', 'content': "final memo", 'metadata': {'kind': 'memo'}},
+        document('deck', 450)
+    ], owner_id='acme')
+
+    assert stored_ids(service, 'company') == ['acme_deck#0', 'acme_deck#1', 'acme_deck#2', 'acme_memo']
+    assert service.collections['company'].get(ids=['acme_memo'])['documents'] == ["final memo"]
+
+
+def test_adding_whole_document_replaces_bulk_chunks(service):
+    service.bulk_ingest('investor', [document('thesis', 450)], owner_id='inv')
+
+    service.add_to_investor_knowledge('inv', [
+        {'document_id': 'thesis', 'content': "revised thesis", 'metadata': {}}
+    ])
+
+    assert stored_ids(service, 'investor') == ['inv_thesis']
+
+
+def test_changed_length_leaves_no_stale_chunks(service):
+    service.bulk_ingest('platform', [document('paper', 450)])
+    service.bulk_ingest('platform', [document('paper', 20)])
+    assert stored_ids(service, 'platform') == ['paper']
+
+    service.bulk_ingest('platform', [document('paper', 300)])
+    assert stored_ids(service, 'platform') == ['paper#0', 'paper#1']
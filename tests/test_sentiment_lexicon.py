@@ -0,0 +1,40 @@
+"""
+Batch lexicon sentiment scoring (backend/twitter_search_service.py and its services/ copy)
+"""
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip("tweepy")
+
+BACKEND = os.path.join(os.path.dirname(__file__), '..', 'backend')
+
+
+def load_scorer(relative_path):
+    name = "twitter_search_service_" + relative_path.replace(os.sep, "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(BACKEND, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.LexiconSentimentScorer
+
+
+@pytest.fixture(params=["twitter_search_service.py", os.path.join("services", "twitter_search_service.py")])
+def scorer_class(request):
+    return load_scorer(request.param)
+
+
+def test_punctuation_edged_terms_match(scorer_class):
+    scorer = scorer_class({"+1": 1.0, "c++": 1.0, ":)": 1.0, ":(": -1.0, "good": 1.0})
+
+    scores = scorer.score_batch(["+1 for this", "we love c++ :)", "meh :(", "so good!"])["scores"]
+
+    assert scores.tolist() == [1.0, 2.0, -1.0, 1.0]
+
+
+def test_terms_only_match_whole_words(scorer_class):
+    scorer = scorer_class({"+1": 1.0, "good": 1.0})
+
+    scores = scorer.score_batch(["goodness", "a+1b", "good\ngood"])["scores"]
+
+    assert scores.tolist() == [0.0, 0.0, 2.0]